@@ -6,11 +6,14 @@ import sys
 import time
 from importlib import metadata
 from typing import Optional
+from urllib.parse import urlparse
 
 import click
+import toml
 from prometheus_client import start_http_server
 
 from reconcile.status import ExitCodes
+from reconcile.utils import gql
 from reconcile.utils.metrics import (
     execution_counter,
     run_status,
@@ -41,6 +44,7 @@ LOG_FILE = os.environ.get("LOG_FILE")
 LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO")
 SLEEP_DURATION_SECS = os.environ.get("SLEEP_DURATION_SECS", 600)
 SLEEP_ON_ERROR = os.environ.get("SLEEP_ON_ERROR", 10)
+BUNDLE_SHA_POLL_SECS = int(os.environ.get("BUNDLE_SHA_POLL_SECS", 0))
 
 LOG = logging.getLogger(__name__)
 
@@ -116,6 +120,37 @@ def build_entry_point_func(command_name: str) -> click.Command:
         )
 
 
+def get_bundle_sha() -> Optional[str]:
+    """
+    Returns the sha of the bundle currently served by the GraphQL server,
+    or None if it can not be fetched.
+    """
+    try:
+        graphql_config = toml.load(CONFIG)["graphql"]
+        return gql.get_sha(
+            urlparse(graphql_config["server"]), graphql_config.get("token")
+        )
+    except Exception:
+        LOG.exception("Error fetching the bundle sha")
+        return None
+
+
+def wait_for_bundle_change(
+    bundle_sha: Optional[str], max_wait: int, poll_interval: int
+) -> None:
+    """
+    Blocks until the served bundle sha differs from bundle_sha or max_wait
+    seconds have passed, checking every poll_interval seconds.
+    """
+    deadline = time.monotonic() + max_wait
+    while (remaining := deadline - time.monotonic()) > 0:
+        time.sleep(min(poll_interval, remaining))
+        sha = get_bundle_sha()
+        if sha is not None and sha != bundle_sha:
+            LOG.info(f"Bundle changed from {bundle_sha} to {sha}")
+            return
+
+
 def main():
     """
     This entry point script expects certain env variables
@@ -144,6 +179,10 @@ def main():
       amount of seconds to sleep between successful integration runs
     * SLEEP_ON_ERROR (default 10)
       amount of seconds to sleep before another integration run is started
+    * BUNDLE_SHA_POLL_SECS (default 0)
+      if not 0, poll the bundle sha every BUNDLE_SHA_POLL_SECS seconds after a
+      successful run and start the next run as soon as it changes.
+      SLEEP_DURATION_SECS then is the maximum time between two runs.
 
     Based on those variables, the following command will be executed
       $COMMAND --config $CONFIG $DRY_RUN $INTEGRATION_NAME \
@@ -153,11 +192,17 @@ def main():
     start_http_server(9090)
 
     command = build_entry_point_func(COMMAND_NAME)
+    # runs share this process, so pooled GraphQL clients stay connected
+    # across iterations and are only closed on exit
     while True:
+        # fetched before the run, so that a bundle change during the run
+        # triggers another one
+        bundle_sha = get_bundle_sha() if BUNDLE_SHA_POLL_SECS else None
         args = build_entry_point_args(
             command, CONFIG, DRY_RUN, INTEGRATION_NAME, INTEGRATION_EXTRA_ARGS
         )
         sleep = SLEEP_DURATION_SECS
+        wait_for_change = bool(BUNDLE_SHA_POLL_SECS)
         start_time = time.monotonic()
         # Running the integration via Click, so we don't have to replicate
         # the CLI logic here
@@ -177,6 +222,7 @@ def main():
         # in the integrations, but we want to continue the loop anyway
         except Exception:
             sleep = SLEEP_ON_ERROR
+            wait_for_change = False
             LOG.exception(f"Error running {COMMAND_NAME}")
             return_code = ExitCodes.ERROR
 
@@ -192,7 +238,10 @@ def main():
         if RUN_ONCE:
             sys.exit(return_code)
 
-        time.sleep(int(sleep))
+        if wait_for_change:
+            wait_for_bundle_change(bundle_sha, int(sleep), BUNDLE_SHA_POLL_SECS)
+        else:
+            time.sleep(int(sleep))
 
 
 if __name__ == "__main__":
@@ -2375,11 +2375,12 @@ def parse_image_tag_from_ref(ctx, param, value) -> Optional[dict[str, str]]:
 
 
 @integration.command(short_help="Allow vault to replicate secrets to other instances.")
+@threaded()
 @click.pass_context
-def vault_replication(ctx):
+def vault_replication(ctx, thread_pool_size):
     import reconcile.vault_replication
 
-    run_integration(reconcile.vault_replication, ctx.obj)
+    run_integration(reconcile.vault_replication, ctx.obj, thread_pool_size)
 
 
 @integration.command(short_help="Manages Qontract Reconcile integrations.")
@@ -1,11 +1,7 @@
 import base64
 import logging
 
-from sretoolbox.container import (
-    Image,
-    Skopeo,
-)
-from sretoolbox.container.skopeo import SkopeoCmdError
+from sretoolbox.container import Image
 from sretoolbox.utils import threaded
 
 from reconcile import queries
@@ -15,6 +11,11 @@ from reconcile.utils.external_resources import (
     get_external_resource_specs,
     managed_external_resources,
 )
+from reconcile.utils.image_mirror import (
+    CopyTask,
+    copy_images,
+)
+from reconcile.utils.instrumented_wrappers import InstrumentedSkopeo as Skopeo
 from reconcile.utils.secret_reader import SecretReader
 
 QONTRACT_INTEGRATION = "ecr-mirror"
@@ -27,7 +28,6 @@ class EcrMirror:
         self.instance = instance
         self.settings = queries.get_app_interface_settings()
         self.secret_reader = SecretReader(settings=self.settings)
-        self.skopeo_cli = Skopeo(dry_run)
         self.error = False
 
         identifier = instance.identifier
@@ -67,9 +67,9 @@ class EcrMirror:
             self.image_password = raw_data["token"]
             self.image_auth = f"{self.image_username}:{self.image_password}"
 
-    def run(self):
+    def sync_tasks(self) -> list[CopyTask]:
         if self.error:
-            return
+            return []
 
         ecr_mirror = Image(
             self.ecr_uri, username=self.ecr_username, password=self.ecr_password
@@ -82,17 +82,16 @@ class EcrMirror:
         )
 
         LOG.debug("[checking %s -> %s]", image, ecr_mirror)
-        for tag in image:
-            if tag not in ecr_mirror:
-                try:
-                    self.skopeo_cli.copy(
-                        src_image=image[tag],
-                        src_creds=self.image_auth,
-                        dst_image=ecr_mirror[tag],
-                        dest_creds=self.ecr_auth,
-                    )
-                except SkopeoCmdError as details:
-                    LOG.error("[%s]", details)
+        return [
+            CopyTask(
+                src_image=str(image[tag]),
+                src_creds=self.image_auth,
+                dst_image=str(ecr_mirror[tag]),
+                dest_creds=self.ecr_auth,
+            )
+            for tag in image
+            if tag not in ecr_mirror
+        ]
 
     def _get_ecr_creds(self, account, region):
         if region is None:
@@ -120,7 +119,7 @@ class EcrMirror:
 
 
 def worker(ecr_mirror_instance):
-    return ecr_mirror_instance.run()
+    return ecr_mirror_instance.sync_tasks()
 
 
 def run(dry_run, thread_pool_size=10):
@@ -144,4 +143,9 @@ def run(dry_run, thread_pool_size=10):
     work_list = threaded.run(
         EcrMirror, tfrs_to_mirror, thread_pool_size=thread_pool_size, dry_run=dry_run
     )
-    threaded.run(worker, work_list, thread_pool_size=thread_pool_size)
+    sync_tasks = threaded.run(worker, work_list, thread_pool_size=thread_pool_size)
+    copy_images(
+        Skopeo(dry_run),
+        [task for tasks in sync_tasks for task in tasks],
+        thread_pool_size=thread_pool_size,
+    )
@@ -104,7 +104,9 @@ def run(dry_run):
         logging.error("email names must be unique.")
         sys.exit(1)
 
-    emails_to_send = [e for e in emails if not state.exists(e["name"])]
+    # list the state once instead of checking every email on its own
+    sent_emails = {k.lstrip("/") for k in state.ls()}
+    emails_to_send = [e for e in emails if e["name"] not in sent_emails]
     for email in emails_to_send:
         logging.info(["send_email", email["name"], email["subject"]])
 
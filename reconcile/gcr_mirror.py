@@ -6,15 +6,18 @@ import tempfile
 import time
 from collections import defaultdict
 
-from sretoolbox.container import (
-    Image,
-    Skopeo,
-)
+from sretoolbox.container import Image
 from sretoolbox.container.image import ImageComparisonError
-from sretoolbox.container.skopeo import SkopeoCmdError
 
 from reconcile import queries
 from reconcile.utils import gql
+from reconcile.utils.image_mirror import (
+    CopyTask,
+    copy_images,
+    new_manifest_cache,
+    run_per_registry,
+)
+from reconcile.utils.instrumented_wrappers import InstrumentedSkopeo as Skopeo
 from reconcile.utils.secret_reader import SecretReader
 
 _LOG = logging.getLogger(__name__)
@@ -24,6 +27,9 @@ QONTRACT_INTEGRATION = "gcr-mirror"
 
 class QuayMirror:
 
+    # shared by all instances, so that it outlives a single run
+    response_cache = new_manifest_cache()
+
     GCR_PROJECT_CATALOG_QUERY = """
     {
       projects: gcp_projects_v1 {
@@ -74,17 +80,19 @@ class QuayMirror:
 
     def run(self):
         sync_tasks = self.process_sync_tasks()
-        for org, data in sync_tasks.items():
-            for item in data:
-                try:
-                    self.skopeo_cli.copy(
-                        src_image=item["mirror_url"],
-                        src_creds=item["mirror_creds"],
-                        dst_image=item["image_url"],
-                        dest_creds=self.push_creds[org],
-                    )
-                except SkopeoCmdError as details:
-                    _LOG.error("[%s]", details)
+        copy_images(
+            self.skopeo_cli,
+            [
+                CopyTask(
+                    src_image=item["mirror_url"],
+                    src_creds=item["mirror_creds"],
+                    dst_image=item["image_url"],
+                    dest_creds=self.push_creds[org],
+                )
+                for org, data in sync_tasks.items()
+                for item in data
+            ],
+        )
 
     def process_repos_query(self):
         result = self.gqlapi.query(self.GCR_REPOS_QUERY)
@@ -140,87 +148,100 @@ class QuayMirror:
 
         summary = self.process_repos_query()
 
+        # repositories are compared in parallel, scheduled by the registry
+        # of the mirrored image
+        repos = [(org, item) for org, data in summary.items() for item in data]
+        results = run_per_registry(
+            lambda repo: self._process_repo_sync_tasks(*repo, is_deep_sync),
+            repos,
+            image_url=lambda repo: repo[1]["mirror"]["url"],
+            task="compare",
+        )
         sync_tasks = defaultdict(list)
-        for org, data in summary.items():
-            for item in data:
-                image = Image(f'{item["server_url"]}/{org}/{item["name"]}')
-
-                mirror_url = item["mirror"]["url"]
-
-                username = None
-                password = None
-                mirror_creds = None
-                if item["mirror"]["pullCredentials"] is not None:
-                    pull_credentials = item["mirror"]["pullCredentials"]
-                    raw_data = self.secret_reader.read_all(pull_credentials)
-                    username = raw_data["user"]
-                    password = raw_data["token"]
-                    mirror_creds = f"{username}:{password}"
-
-                image_mirror = Image(mirror_url, username=username, password=password)
-
-                tags = item["mirror"].get("tags")
-                tags_exclude = item["mirror"].get("tagsExclude")
-
-                for tag in image_mirror:
-                    if not self.sync_tag(
-                        tags=tags, tags_exclude=tags_exclude, candidate=tag
-                    ):
-                        continue
+        for (org, _), tasks in zip(repos, results):
+            sync_tasks[org].extend(tasks)
+        return sync_tasks
 
-                    upstream = image_mirror[tag]
-                    downstream = image[tag]
-                    if tag not in image:
-                        _LOG.debug(
-                            "Image %s and mirror %s are out off sync",
-                            downstream,
-                            upstream,
-                        )
-                        sync_tasks[org].append(
-                            {
-                                "mirror_url": str(upstream),
-                                "mirror_creds": mirror_creds,
-                                "image_url": str(downstream),
-                            }
-                        )
-                        continue
+    def _process_repo_sync_tasks(self, org, item, is_deep_sync):
+        sync_tasks = []
+        image = Image(
+            f'{item["server_url"]}/{org}/{item["name"]}',
+            response_cache=self.response_cache,
+        )
+
+        mirror_url = item["mirror"]["url"]
+
+        username = None
+        password = None
+        mirror_creds = None
+        if item["mirror"]["pullCredentials"] is not None:
+            pull_credentials = item["mirror"]["pullCredentials"]
+            raw_data = self.secret_reader.read_all(pull_credentials)
+            username = raw_data["user"]
+            password = raw_data["token"]
+            mirror_creds = f"{username}:{password}"
+
+        image_mirror = Image(
+            mirror_url,
+            username=username,
+            password=password,
+            response_cache=self.response_cache,
+        )
+
+        tags = item["mirror"].get("tags")
+        tags_exclude = item["mirror"].get("tagsExclude")
+
+        for tag in image_mirror:
+            if not self.sync_tag(tags=tags, tags_exclude=tags_exclude, candidate=tag):
+                continue
 
-                    # Deep (slow) check only in non dry-run mode
-                    if self.dry_run:
-                        _LOG.debug(
-                            "Image %s and mirror %s are in sync", downstream, upstream
-                        )
-                        continue
+            upstream = image_mirror[tag]
+            downstream = image[tag]
+            if tag not in image:
+                _LOG.debug(
+                    "Image %s and mirror %s are out off sync",
+                    downstream,
+                    upstream,
+                )
+                sync_tasks.append(
+                    {
+                        "mirror_url": str(upstream),
+                        "mirror_creds": mirror_creds,
+                        "image_url": str(downstream),
+                    }
+                )
+                continue
 
-                    # Deep (slow) check only from time to time
-                    if not is_deep_sync:
-                        _LOG.debug(
-                            "Image %s and mirror %s are in sync", downstream, upstream
-                        )
-                        continue
+            # Deep (slow) check only in non dry-run mode
+            if self.dry_run:
+                _LOG.debug("Image %s and mirror %s are in sync", downstream, upstream)
+                continue
 
-                    try:
-                        if downstream == upstream:
-                            _LOG.debug(
-                                "Image %s and mirror %s are in sync",
-                                downstream,
-                                upstream,
-                            )
-                            continue
-                    except ImageComparisonError as details:
-                        _LOG.error("[%s]", details)
-                        continue
+            # Deep (slow) check only from time to time
+            if not is_deep_sync:
+                _LOG.debug("Image %s and mirror %s are in sync", downstream, upstream)
+                continue
 
+            try:
+                if downstream == upstream:
                     _LOG.debug(
-                        "Image %s and mirror %s are out of sync", downstream, upstream
-                    )
-                    sync_tasks[org].append(
-                        {
-                            "mirror_url": str(upstream),
-                            "mirror_creds": mirror_creds,
-                            "image_url": str(downstream),
-                        }
+                        "Image %s and mirror %s are in sync",
+                        downstream,
+                        upstream,
                     )
+                    continue
+            except ImageComparisonError as details:
+                _LOG.error("[%s]", details)
+                continue
+
+            _LOG.debug("Image %s and mirror %s are out of sync", downstream, upstream)
+            sync_tasks.append(
+                {
+                    "mirror_url": str(upstream),
+                    "mirror_creds": mirror_creds,
+                    "image_url": str(downstream),
+                }
+            )
 
         return sync_tasks
 
@@ -2,6 +2,7 @@ import logging
 import os
 from typing import Any
 
+import requests
 from github import Github
 from github.GithubObject import NotSet  # type: ignore
 from sretoolbox.utils import retry
@@ -18,7 +19,10 @@ from reconcile.utils.aggregated_list import (
     AggregatedDiffRunner,
     AggregatedList,
 )
-from reconcile.utils.raw_github_api import RawGithubApi
+from reconcile.utils.raw_github_api import (
+    GithubGraphQLError,
+    RawGithubApi,
+)
 from reconcile.utils.secret_reader import SecretReader
 
 GH_BASE_URL = os.environ.get("GITHUB_API", "https://api.github.com")
@@ -143,37 +147,78 @@ def get_members(unit):
     return [member.login for member in unit.get_members()]
 
 
+def fetch_org_members_graphql(gh_api_store, org_name, is_managed, managed_teams):
+    """
+    Returns the members of an org (None if the org is not managed) and of
+    its managed teams, including pending invitations. Uses a few paginated
+    GraphQL queries per org.
+    """
+    raw_gh_api = gh_api_store.raw_github_api(org_name)
+    org_members = raw_gh_api.org_members(org_name) if is_managed else None
+    team_members = {
+        team_name: members
+        for team_name, members in raw_gh_api.org_teams(org_name).items()
+        if is_managed or team_name in managed_teams
+    }
+    return org_members, team_members
+
+
+def fetch_org_members_rest(gh_api_store, org_name, is_managed, managed_teams):
+    """Same as fetch_org_members_graphql, using REST calls per team."""
+    g = gh_api_store.github(org_name)
+    raw_gh_api = gh_api_store.raw_github_api(org_name)
+
+    org, teams = get_org_and_teams(g, org_name)
+
+    org_members = None
+    if is_managed:
+        org_members = get_members(org)
+        org_members.extend(raw_gh_api.org_invitations(org_name))
+
+    team_members = {}
+    for team in teams:
+        if not is_managed and team.name not in managed_teams:
+            continue
+
+        members = get_members(team)
+        members.extend(raw_gh_api.team_invitations(org.id, team.id))
+        team_members[team.name] = members
+
+    return org_members, team_members
+
+
 def fetch_current_state(gh_api_store):
     state = AggregatedList()
 
     for org_name in gh_api_store.orgs():
-        g = gh_api_store.github(org_name)
-        raw_gh_api = gh_api_store.raw_github_api(org_name)
         managed_teams = gh_api_store.managed_teams(org_name)
         # if 'managedTeams' is not specified
         # we manage all teams
         is_managed = managed_teams is None or len(managed_teams) == 0
 
-        org, teams = get_org_and_teams(g, org_name)
+        try:
+            org_members, team_members = fetch_org_members_graphql(
+                gh_api_store, org_name, is_managed, managed_teams
+            )
+        except (requests.exceptions.RequestException, GithubGraphQLError) as e:
+            logging.warning(
+                f"could not fetch members of {org_name} with GraphQL, "
+                f"falling back to REST: {e}"
+            )
+            org_members, team_members = fetch_org_members_rest(
+                gh_api_store, org_name, is_managed, managed_teams
+            )
 
-        org_members = None
-        if is_managed:
-            org_members = get_members(org)
-            org_members.extend(raw_gh_api.org_invitations(org_name))
+        if org_members is not None:
             org_members = [m.lower() for m in org_members]
 
         all_team_members = []
-        for team in teams:
-            if not is_managed and team.name not in managed_teams:
-                continue
-
-            members = get_members(team)
-            members.extend(raw_gh_api.team_invitations(org.id, team.id))
+        for team_name, members in team_members.items():
             members = [m.lower() for m in members]
             all_team_members.extend(members)
 
             state.add(
-                {"service": "github-org-team", "org": org_name, "team": team.name},
+                {"service": "github-org-team", "org": org_name, "team": team_name},
                 members,
             )
         all_team_members = list(set(all_team_members))
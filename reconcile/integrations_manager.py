@@ -18,6 +18,7 @@ from typing import (
 )
 
 from github import Github
+from sretoolbox.utils import threaded
 
 import reconcile.openshift_base as ob
 from reconcile import queries
@@ -277,16 +278,21 @@ def fetch_desired_state(
     environment_override_mapping: Mapping[
         str, Mapping[str, list[IntegrationShardSpecOverride]]
     ],
+    thread_pool_size: int = 1,
 ) -> None:
-    for namespace_info in namespaces:
-        namespace = namespace_info["name"]
+    def construct(namespace_info: Mapping[str, Any]) -> list[OpenshiftResource]:
         environment_name = namespace_info["environment"]["name"]
-        cluster = namespace_info["cluster"]["name"]
-        oc_resources = construct_oc_resources(
+        return construct_oc_resources(
             namespace_info,
             image_tag_from_ref,
             environment_override_mapping[environment_name],
         )
+
+    namespaces = list(namespaces)
+    results = threaded.run(construct, namespaces, thread_pool_size)
+    for namespace_info, oc_resources in zip(namespaces, results):
+        namespace = namespace_info["name"]
+        cluster = namespace_info["cluster"]["name"]
         for r in oc_resources:
             ri.add_desired(cluster, namespace, r.kind, r.name, r)
 
@@ -394,7 +400,11 @@ def run(
     )
     initialize_shard_specs(namespaces, shard_manager)
     fetch_desired_state(
-        namespaces, ri, image_tag_from_ref, environment_override_mapping
+        namespaces,
+        ri,
+        image_tag_from_ref,
+        environment_override_mapping,
+        thread_pool_size=thread_pool_size,
     )
     ob.realize_data(dry_run, oc_map, ri, thread_pool_size)
 
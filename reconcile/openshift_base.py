@@ -1,5 +1,8 @@
 import itertools
 import logging
+import os
+import time
+from collections import defaultdict
 from collections.abc import (
     Iterable,
     Mapping,
@@ -18,12 +21,15 @@ from typing import (
 )
 
 import yaml
+from kubernetes.dynamic.exceptions import ForbiddenError
 from sretoolbox.utils import (
     retry,
     threaded,
 )
 
 from reconcile import queries
+from reconcile.utils.fair_scheduler import run_fair
+from reconcile.utils.metrics import openshift_apply_time
 from reconcile.utils.oc import (
     DeploymentFieldIsImmutableError,
     FieldIsImmutableError,
@@ -45,6 +51,24 @@ from reconcile.utils.openshift_resource import ResourceInventory
 ACTION_APPLIED = "applied"
 ACTION_DELETED = "deleted"
 
+# Fetch the current state of a kind with one cluster wide list instead of
+# one list per namespace, if at least this ratio of the namespaces on the
+# cluster is managed. Disabled if not set.
+CLUSTER_WIDE_FETCH_MIN_RATIO: Optional[float] = (
+    float(os.environ["CLUSTER_WIDE_FETCH_MIN_RATIO"])
+    if os.environ.get("CLUSTER_WIDE_FETCH_MIN_RATIO")
+    else None
+)
+
+# Maximum number of resource types realized in parallel on the same
+# cluster, so that a slow cluster can not occupy the whole thread pool.
+# Not limited if not set.
+REALIZE_DATA_CLUSTER_CONCURRENCY: Optional[int] = (
+    int(os.environ["REALIZE_DATA_CLUSTER_CONCURRENCY"])
+    if os.environ.get("REALIZE_DATA_CLUSTER_CONCURRENCY")
+    else None
+)
+
 
 class ValidationError(Exception):
     pass
@@ -69,6 +93,17 @@ class CurrentStateSpec(BaseStateSpec):
     resource_names: Optional[Iterable[str]]
 
 
+@dataclass
+class ClusterCurrentStateSpec:
+    """Current state of a kind in many namespaces of a cluster, fetched
+    with a single cluster wide list."""
+
+    oc: OCClient = field(compare=False, repr=False)
+    cluster: str
+    kind: str
+    namespaces: set[str]
+
+
 @dataclass
 class DesiredStateSpec(BaseStateSpec):
 
@@ -77,7 +112,7 @@ class DesiredStateSpec(BaseStateSpec):
     privileged: bool = False
 
 
-StateSpec = Union[CurrentStateSpec, DesiredStateSpec]
+StateSpec = Union[CurrentStateSpec, ClusterCurrentStateSpec, DesiredStateSpec]
 
 
 @runtime_checkable
@@ -280,12 +315,123 @@ def init_specs_to_fetch(
     return state_specs
 
 
+def _get_cluster_namespace_count(oc: OCClient) -> Optional[int]:
+    if oc.is_kind_supported("Project"):
+        kind = "Project.project.openshift.io"
+    else:
+        kind = "Namespace"
+    try:
+        return len(oc.get_all(kind)["items"])
+    except (StatusCodeError, ForbiddenError) as e:
+        logging.debug(f"[{oc.cluster_name}] could not count namespaces: {e}")
+        return None
+
+
+def group_current_state_specs(
+    state_specs: Iterable[StateSpec], min_ratio: Optional[float]
+) -> list[StateSpec]:
+    """Replaces the per namespace CurrentStateSpecs of a kind by a single
+    ClusterCurrentStateSpec, for each cluster where the ratio of managed
+    to existing namespaces is at least min_ratio.
+
+    Specs with resource names are kept, as they only fetch single objects.
+    """
+    if min_ratio is None:
+        return list(state_specs)
+
+    grouped_specs: list[StateSpec] = []
+    groupable: dict[str, list[CurrentStateSpec]] = defaultdict(list)
+    for spec in state_specs:
+        if (
+            isinstance(spec, CurrentStateSpec)
+            and not spec.resource_names
+            and spec.namespace != "cluster"
+        ):
+            groupable[spec.cluster].append(spec)
+        else:
+            grouped_specs.append(spec)
+
+    for cluster, specs in groupable.items():
+        oc = specs[0].oc
+        managed_namespaces = {s.namespace for s in specs}
+        namespace_count = _get_cluster_namespace_count(oc)
+        if (
+            len(managed_namespaces) < 2
+            or not namespace_count
+            or len(managed_namespaces) / namespace_count < min_ratio
+        ):
+            grouped_specs.extend(specs)
+            continue
+
+        namespaces_by_kind: dict[str, set[str]] = defaultdict(set)
+        for s in specs:
+            namespaces_by_kind[s.kind].add(s.namespace)
+        for kind, namespaces in namespaces_by_kind.items():
+            grouped_specs.append(
+                ClusterCurrentStateSpec(
+                    oc=oc, cluster=cluster, kind=kind, namespaces=namespaces
+                )
+            )
+
+    return grouped_specs
+
+
+def populate_cluster_current_state(
+    spec: ClusterCurrentStateSpec,
+    ri: ResourceInventory,
+    integration: str,
+    integration_version: str,
+):
+    if not spec.oc.is_kind_supported(spec.kind):
+        msg = f"[{spec.cluster}] cluster has no API resource {spec.kind}."
+        logging.warning(msg)
+        return
+    try:
+        items = spec.oc.get_items(spec.kind, all_namespaces=True)
+    except (StatusCodeError, ForbiddenError) as e:
+        # e.g. missing permissions to list the kind cluster wide
+        logging.debug(
+            f"[{spec.cluster}] falling back to per namespace fetch "
+            f"of {spec.kind}: {e}"
+        )
+        for namespace in spec.namespaces:
+            populate_current_state(
+                CurrentStateSpec(
+                    oc=spec.oc,
+                    cluster=spec.cluster,
+                    namespace=namespace,
+                    kind=spec.kind,
+                    resource_names=None,
+                ),
+                ri,
+                integration,
+                integration_version,
+            )
+        return
+
+    for item in items:
+        namespace = item["metadata"].get("namespace")
+        if namespace not in spec.namespaces:
+            continue
+        openshift_resource = OR(item, integration, integration_version)
+        ri.add_current(
+            spec.cluster,
+            namespace,
+            spec.kind,
+            openshift_resource.name,
+            openshift_resource,
+        )
+
+
 def populate_current_state(
-    spec: CurrentStateSpec,
+    spec: Union[CurrentStateSpec, ClusterCurrentStateSpec],
     ri: ResourceInventory,
     integration: str,
     integration_version: str,
 ):
+    if isinstance(spec, ClusterCurrentStateSpec):
+        populate_cluster_current_state(spec, ri, integration, integration_version)
+        return
     # if spec.oc is None: - oc can't be none because init_namespace_specs_to_fetch does not create specs if oc is none
     #    return
     if not spec.oc.is_kind_supported(spec.kind):
@@ -341,6 +487,7 @@ def fetch_current_state(
         clusters=clusters,
         override_managed_types=override_managed_types,
     )
+    state_specs = group_current_state_specs(state_specs, CLUSTER_WIDE_FETCH_MIN_RATIO)
     threaded.run(
         populate_current_state,
         state_specs,
@@ -648,6 +795,7 @@ def _realize_resource_data(
 
         try:
             privileged = data["use_admin_token"].get(name, False)
+            start = time.monotonic()
             apply(
                 dry_run,
                 oc_map,
@@ -659,6 +807,10 @@ def _realize_resource_data(
                 recycle_pods,
                 privileged,
             )
+            if not dry_run:
+                openshift_apply_time.labels(cluster_name=cluster).observe(
+                    time.monotonic() - start
+                )
             action = {
                 "action": ACTION_APPLIED,
                 "cluster": cluster,
@@ -765,8 +917,19 @@ def realize_data(
     """
     args = locals()
     del args["thread_pool_size"]
-    results = threaded.run(_realize_resource_data, ri, thread_pool_size, **args)
-    return list(itertools.chain.from_iterable(results))
+    # resource types are scheduled round-robin across clusters, with
+    # at most REALIZE_DATA_CLUSTER_CONCURRENCY in parallel per cluster
+    results = dict(
+        run_fair(
+            _realize_resource_data,
+            ri,
+            key=lambda ri_item: ri_item[0],
+            thread_pool_size=thread_pool_size,
+            max_per_key=REALIZE_DATA_CLUSTER_CONCURRENCY,
+            **args,
+        )
+    )
+    return list(itertools.chain.from_iterable(results[i] for i in sorted(results)))
 
 
 def _validate_resources_used_exist(
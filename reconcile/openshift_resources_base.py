@@ -18,6 +18,7 @@ from typing import (
     Optional,
     Protocol,
     Tuple,
+    Union,
 )
 from urllib import parse
 
@@ -57,7 +58,11 @@ from reconcile.utils.openshift_resource import (
     ResourceKeyExistsError,
 )
 from reconcile.utils.runtime.integration import DesiredStateShardConfig
-from reconcile.utils.secret_reader import SecretReader
+from reconcile.utils.secret_reader import (
+    SecretKey,
+    SecretReader,
+    secret_key,
+)
 from reconcile.utils.semver_helper import make_semver
 from reconcile.utils.sharding import is_in_shard
 from reconcile.utils.vault import (
@@ -502,10 +507,12 @@ def fetch_provider_vault_secret(
     validate_alertmanager_config=False,
     alertmanager_config_key="alertmanager.yaml",
     settings=None,
+    secrets=None,
 ) -> OR:
     # get the fields from vault
-    secret_reader = SecretReader(settings)
-    raw_data = secret_reader.read_all({"path": path, "version": version})
+    raw_data = read_secret(
+        {"path": path, "version": version}, settings=settings, secrets=secrets
+    )
 
     if validate_alertmanager_config:
         check_alertmanager_config(raw_data, path, alertmanager_config_key)
@@ -537,7 +544,9 @@ def fetch_provider_vault_secret(
         raise FetchResourceError(str(e))
 
 
-def fetch_provider_route(resource: dict, tls_path, tls_version, settings=None) -> OR:
+def fetch_provider_route(
+    resource: dict, tls_path, tls_version, settings=None, secrets=None
+) -> OR:
     global _log_lock
 
     path = resource["path"]
@@ -550,8 +559,9 @@ def fetch_provider_route(resource: dict, tls_path, tls_version, settings=None) -
     openshift_resource.body["spec"].setdefault("tls", {})
     tls = openshift_resource.body["spec"]["tls"]
     # get tls fields from vault
-    secret_reader = SecretReader(settings)
-    raw_data = secret_reader.read_all({"path": tls_path, "version": tls_version})
+    raw_data = read_secret(
+        {"path": tls_path, "version": tls_version}, settings=settings, secrets=secrets
+    )
     valid_keys = [
         "termination",
         "insecureEdgeTerminationPolicy",
@@ -590,7 +600,7 @@ def _locked_log(lock, msg):
 
 
 def fetch_openshift_resource(
-    resource, parent, settings=None, skip_validation=False
+    resource, parent, settings=None, skip_validation=False, secrets=None
 ) -> OR:
     global _log_lock
 
@@ -683,6 +693,7 @@ def fetch_openshift_resource(
                 validate_alertmanager_config=validate_alertmanager_config,
                 alertmanager_config_key=alertmanager_config_key,
                 settings=settings,
+                secrets=secrets,
             )
         except (SecretVersionNotFound, SecretVersionIsNone) as e:
             raise FetchSecretError(e)
@@ -692,7 +703,7 @@ def fetch_openshift_resource(
         tls_path = resource["vault_tls_secret_path"]
         tls_version = resource["vault_tls_secret_version"]
         openshift_resource = fetch_provider_route(
-            resource["resource"], tls_path, tls_version, settings
+            resource["resource"], tls_path, tls_version, settings, secrets
         )
     else:
         raise UnknownProviderError(provider)
@@ -739,11 +750,14 @@ def fetch_desired_state(
     parent: Mapping[str, Any],
     privileged: bool,
     settings: Optional[Mapping[str, Any]] = None,
+    secrets: Optional[Mapping[SecretKey, Union[dict[str, str], Exception]]] = None,
 ):
     global _log_lock
 
     try:
-        openshift_resource = fetch_openshift_resource(resource, parent, settings)
+        openshift_resource = fetch_openshift_resource(
+            resource, parent, settings, secrets=secrets
+        )
     except (
         FetchResourceError,
         FetchSecretError,
@@ -796,8 +810,13 @@ def fetch_states(
     spec: ob.StateSpec,
     ri: ResourceInventory,
     settings: Optional[Mapping[str, Any]] = None,
+    secrets: Optional[Mapping[SecretKey, Union[dict[str, str], Exception]]] = None,
 ) -> None:
     try:
+        if isinstance(spec, ob.ClusterCurrentStateSpec):
+            ob.populate_cluster_current_state(
+                spec, ri, QONTRACT_INTEGRATION, QONTRACT_INTEGRATION_VERSION
+            )
         if isinstance(spec, ob.CurrentStateSpec):
             fetch_current_state(
                 spec.oc,
@@ -817,6 +836,7 @@ def fetch_states(
                 spec.parent,
                 spec.privileged,
                 settings,
+                secrets,
             )
 
     except StatusCodeError as e:
@@ -847,11 +867,74 @@ def fetch_data(
     state_specs = ob.init_specs_to_fetch(
         ri, oc_map, namespaces=namespaces, override_managed_types=overrides
     )
-    threaded.run(fetch_states, state_specs, thread_pool_size, ri=ri, settings=settings)
+    state_specs = ob.group_current_state_specs(
+        state_specs, ob.CLUSTER_WIDE_FETCH_MIN_RATIO
+    )
+    secrets = prefetch_secrets(state_specs, thread_pool_size, settings)
+    threaded.run(
+        fetch_states,
+        state_specs,
+        thread_pool_size,
+        ri=ri,
+        settings=settings,
+        secrets=secrets,
+    )
 
     return oc_map, ri
 
 
+def prefetch_secrets(
+    state_specs: Iterable[ob.StateSpec],
+    thread_pool_size: int,
+    settings: Optional[Mapping[str, Any]] = None,
+) -> dict[SecretKey, Union[dict[str, str], Exception]]:
+    """
+    Reads the vault secrets of all desired resources in one batch and
+    returns them by secret_key, to be passed on to fetch_states.
+    Errors are reported when the single resources are fetched.
+    """
+    if not (settings and settings.get("vault")):
+        return {}
+    secrets = []
+    for spec in state_specs:
+        if not isinstance(spec, ob.DesiredStateSpec):
+            continue
+        resource = spec.resource
+        if resource["provider"] == "vault-secret":
+            secrets.append({"path": resource["path"], "version": resource["version"]})
+        elif (
+            resource["provider"] == "route"
+            and resource.get("vault_tls_secret_path") is not None
+            and resource.get("vault_tls_secret_version") is not None
+        ):
+            secrets.append(
+                {
+                    "path": resource["vault_tls_secret_path"],
+                    "version": resource["vault_tls_secret_version"],
+                }
+            )
+    if not secrets:
+        return {}
+    return SecretReader(settings).read_all_many(secrets, thread_pool_size)
+
+
+def read_secret(
+    secret: Mapping[str, Any],
+    settings: Optional[Mapping[str, Any]] = None,
+    secrets: Optional[Mapping[SecretKey, Union[dict[str, str], Exception]]] = None,
+) -> dict[str, str]:
+    """
+    Returns the data of a secret from the prefetched secrets, or reads it
+    if it was not prefetched. Raises the error prefetching it raised.
+    """
+    prefetched = (secrets or {}).get(secret_key(secret))
+    if prefetched is None:
+        return SecretReader(settings).read_all(secret)
+    if isinstance(prefetched, Exception):
+        raise prefetched
+    return prefetched
+
+
 def filter_namespaces_by_cluster_and_namespace(
     namespaces, cluster_name, namespace_name
 ):
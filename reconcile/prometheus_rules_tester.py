@@ -14,7 +14,6 @@ from typing import (
 )
 
 import yaml
-from sretoolbox.utils import threaded
 
 import reconcile.openshift_resources_base as orb
 from reconcile import queries
@@ -190,8 +189,11 @@ def check_rule_length(rule_length: int) -> CommandExecutionResult:
     return CommandExecutionResult(True, "")
 
 
-def check_rule(rule: MutableMapping, settings: Mapping) -> MutableMapping:
-    promtool_check_result = promtool.check_rule(yaml_spec=rule["spec"])
+def check_rule(
+    rule: MutableMapping,
+    settings: Mapping,
+    promtool_check_result: CommandExecutionResult,
+) -> MutableMapping:
     valid_services_result = check_valid_services(rule, settings)
     rule_length_result = check_rule_length(rule["length"])
     rule["check_result"] = (
@@ -219,22 +221,14 @@ def check_prometheus_rules(
                     }
                 )
 
-    result = threaded.run(
-        func=check_rule,
-        iterable=rules_to_check,
-        thread_pool_size=thread_pool_size,
-        settings=settings,
+    promtool_results = promtool.check_rules(
+        [rule["spec"] for rule in rules_to_check], thread_pool_size=thread_pool_size
     )
+    for rule, promtool_result in zip(rules_to_check, promtool_results):
+        check_rule(rule, settings, promtool_result)
 
     # return invalid rules
-    return [rule for rule in result if not rule["check_result"]]
-
-
-def run_test(test: MutableMapping[str, Any]) -> MutableMapping[str, Any]:
-    test["check_result"] = promtool.run_test(
-        test_yaml_spec=test["test"], rule_files=test["rule_files"]
-    )
-    return test
+    return [rule for rule in rules_to_check if not rule["check_result"]]
 
 
 def get_data_from_jinja_test_template(
@@ -383,11 +377,14 @@ def check_prometheus_tests(
             failed_tests.append({**test_to_run, "check_result": msg})
             continue
 
-    result = threaded.run(
-        func=run_test, iterable=tests_to_run, thread_pool_size=thread_pool_size
+    promtool_results = promtool.run_tests(
+        [(test["test"], test["rule_files"]) for test in tests_to_run],
+        thread_pool_size=thread_pool_size,
     )
+    for test_run, promtool_result in zip(tests_to_run, promtool_results):
+        test_run["check_result"] = promtool_result
 
-    failed_tests.extend([test for test in result if not test["check_result"]])
+    failed_tests.extend([t for t in tests_to_run if not t["check_result"]])
 
     return failed_tests
 
@@ -8,18 +8,20 @@ from collections import (
     defaultdict,
     namedtuple,
 )
-from collections.abc import Iterable
+from collections.abc import (
+    Iterable,
+    Mapping,
+)
 from typing import (
     Any,
     Optional,
+    Union,
 )
 
-from requests import Response
 from sretoolbox.container.image import (
     ImageComparisonError,
     ImageContainsError,
 )
-from sretoolbox.container.skopeo import SkopeoCmdError
 
 from reconcile import queries
 from reconcile.status import ExitCodes
@@ -28,9 +30,19 @@ from reconcile.utils import (
     metrics,
     sharding,
 )
+from reconcile.utils.image_mirror import (
+    CopyTask,
+    copy_images,
+    new_manifest_cache,
+    run_per_registry,
+)
 from reconcile.utils.instrumented_wrappers import InstrumentedImage as Image
 from reconcile.utils.instrumented_wrappers import InstrumentedSkopeo as Skopeo
-from reconcile.utils.secret_reader import SecretReader
+from reconcile.utils.secret_reader import (
+    SecretKey,
+    SecretReader,
+    secret_key,
+)
 
 _LOG = logging.getLogger(__name__)
 
@@ -60,7 +72,8 @@ class QuayMirror:
     }
     """
 
-    response_cache: dict[tuple[str, str], Response] = {}
+    # shared by all instances, so that it outlives a single run
+    response_cache = new_manifest_cache()
 
     def __init__(
         self,
@@ -113,17 +126,19 @@ class QuayMirror:
 
     def run(self) -> None:
         sync_tasks = self.process_sync_tasks()
-        for org, data in sync_tasks.items():
-            for item in data:
-                try:
-                    self.skopeo_cli.copy(
-                        src_image=item["mirror_url"],
-                        src_creds=item["mirror_creds"],
-                        dst_image=item["image_url"],
-                        dest_creds=self.push_creds[org],
-                    )
-                except SkopeoCmdError as details:
-                    _LOG.error("skopeo command error message: '%s'", details)
+        copy_images(
+            self.skopeo_cli,
+            [
+                CopyTask(
+                    src_image=item["mirror_url"],
+                    src_creds=item["mirror_creds"],
+                    dst_image=item["image_url"],
+                    dest_creds=self.push_creds[org],
+                )
+                for org, data in sync_tasks.items()
+                for item in data
+            ],
+        )
 
         if self.is_compare_tags and not self.dry_run:
             self.record_timestamp(self.control_file_path)
@@ -197,119 +212,137 @@ class QuayMirror:
 
     def process_sync_tasks(self):
         summary = self.process_repos_query(self.images)
+        # repositories are compared in parallel, scheduled by the registry
+        # of the mirrored image
+        repos = [(org_key, item) for org_key, data in summary.items() for item in data]
+        pull_credentials = self.secret_reader.read_all_many(
+            item["mirror"]["pullCredentials"]
+            for _, item in repos
+            if item["mirror"]["pullCredentials"] is not None
+        )
+        results = run_per_registry(
+            lambda repo: self._process_repo_sync_tasks(*repo, pull_credentials),
+            repos,
+            image_url=lambda repo: repo[1]["mirror"]["url"],
+            task="compare",
+        )
         sync_tasks = defaultdict(list)
-        for org_key, data in summary.items():
-            org = org_key.org_name
-            for item in data:
-                push_creds = self.push_creds[org_key].split(":")
-                image = Image(
-                    f'{item["server_url"]}/{org}/{item["name"]}',
-                    username=push_creds[0],
-                    password=push_creds[1],
-                    response_cache=self.response_cache,
-                )
+        for (org_key, _), tasks in zip(repos, results):
+            sync_tasks[org_key].extend(tasks)
+        return sync_tasks
 
-                mirror_url = item["mirror"]["url"]
-
-                username = None
-                password = None
-                mirror_creds = None
-                if item["mirror"]["pullCredentials"] is not None:
-                    pull_credentials = item["mirror"]["pullCredentials"]
-                    raw_data = self.secret_reader.read_all(pull_credentials)
-                    username = raw_data["user"]
-                    password = raw_data["token"]
-                    mirror_creds = f"{username}:{password}"
-
-                image_mirror = Image(
-                    mirror_url,
-                    username=username,
-                    password=password,
-                    response_cache=self.response_cache,
-                )
+    def _process_repo_sync_tasks(
+        self,
+        org_key: OrgKey,
+        item: dict[str, Any],
+        pull_credentials: Mapping[SecretKey, Union[dict[str, str], Exception]],
+    ) -> list[dict[str, Any]]:
+        org = org_key.org_name
+        sync_tasks: list[dict[str, Any]] = []
+        push_creds = self.push_creds[org_key].split(":")
+        image = Image(
+            f'{item["server_url"]}/{org}/{item["name"]}',
+            username=push_creds[0],
+            password=push_creds[1],
+            response_cache=self.response_cache,
+        )
 
-                tags = item["mirror"].get("tags")
-                tags_exclude = item["mirror"].get("tagsExclude")
+        mirror_url = item["mirror"]["url"]
+
+        username = None
+        password = None
+        mirror_creds = None
+        if item["mirror"]["pullCredentials"] is not None:
+            raw_data = pull_credentials[secret_key(item["mirror"]["pullCredentials"])]
+            if isinstance(raw_data, Exception):
+                raise raw_data
+            username = raw_data["user"]
+            password = raw_data["token"]
+            mirror_creds = f"{username}:{password}"
+
+        image_mirror = Image(
+            mirror_url,
+            username=username,
+            password=password,
+            response_cache=self.response_cache,
+        )
 
-                for tag in image_mirror:
-                    if not self.sync_tag(
-                        tags=tags, tags_exclude=tags_exclude, candidate=tag
-                    ):
-                        continue
+        tags = item["mirror"].get("tags")
+        tags_exclude = item["mirror"].get("tagsExclude")
 
-                    upstream = image_mirror[tag]
-                    downstream = image[tag]
-                    if tag not in image:
-                        _LOG.debug(
-                            "Image %s does not exist. Syncing it from %s",
-                            downstream,
-                            upstream,
-                        )
-                        task = {
-                            "mirror_url": str(upstream),
-                            "mirror_creds": mirror_creds,
-                            "image_url": str(downstream),
-                        }
-                        sync_tasks[org_key].append(task)
-                        continue
+        for tag in image_mirror:
+            if not self.sync_tag(tags=tags, tags_exclude=tags_exclude, candidate=tag):
+                continue
 
-                    # Compare tags (slow) only from time to time.
-                    if not self.is_compare_tags:
-                        _LOG.debug(
-                            "Running in non compare-tags mode. We won't check if %s "
-                            "and %s are actually in sync",
-                            downstream,
-                            upstream,
-                        )
-                        continue
+            upstream = image_mirror[tag]
+            downstream = image[tag]
+            if tag not in image:
+                _LOG.debug(
+                    "Image %s does not exist. Syncing it from %s",
+                    downstream,
+                    upstream,
+                )
+                task = {
+                    "mirror_url": str(upstream),
+                    "mirror_creds": mirror_creds,
+                    "image_url": str(downstream),
+                }
+                sync_tasks.append(task)
+                continue
 
-                    try:
-                        if downstream == upstream:
-                            _LOG.debug(
-                                "Image %s and mirror %s are in sync",
-                                downstream,
-                                upstream,
-                            )
-                            continue
-                        elif downstream.is_part_of(upstream):
-                            _LOG.debug(
-                                "Image %s is part of mirror multi-arch image %s",
-                                downstream,
-                                upstream,
-                            )
-                            continue
-                    except ImageComparisonError as details:
-                        _LOG.error(
-                            "Error comparing image %s and %s - %s",
-                            downstream,
-                            upstream,
-                            details,
-                        )
-                        continue
-                    except ImageContainsError:
-                        # Upstream and downstream images are different and not part
-                        # of each other. We will mirror them.
-                        pass
-                    finally:
-                        self.response_cache_hits.inc(
-                            upstream.response_cache_hits
-                            + downstream.response_cache_hits
-                        )
-                        self.response_cache_misses.inc(
-                            upstream.response_cache_misses
-                            + downstream.response_cache_misses
-                        )
+            # Compare tags (slow) only from time to time.
+            if not self.is_compare_tags:
+                _LOG.debug(
+                    "Running in non compare-tags mode. We won't check if %s "
+                    "and %s are actually in sync",
+                    downstream,
+                    upstream,
+                )
+                continue
 
+            try:
+                if downstream == upstream:
                     _LOG.debug(
-                        "Image %s and mirror %s are out of sync", downstream, upstream
+                        "Image %s and mirror %s are in sync",
+                        downstream,
+                        upstream,
                     )
-                    sync_tasks[org_key].append(
-                        {
-                            "mirror_url": str(upstream),
-                            "mirror_creds": mirror_creds,
-                            "image_url": str(downstream),
-                        }
+                    continue
+                elif downstream.is_part_of(upstream):
+                    _LOG.debug(
+                        "Image %s is part of mirror multi-arch image %s",
+                        downstream,
+                        upstream,
                     )
+                    continue
+            except ImageComparisonError as details:
+                _LOG.error(
+                    "Error comparing image %s and %s - %s",
+                    downstream,
+                    upstream,
+                    details,
+                )
+                continue
+            except ImageContainsError:
+                # Upstream and downstream images are different and not part
+                # of each other. We will mirror them.
+                pass
+            finally:
+                self.response_cache_hits.inc(
+                    upstream.response_cache_hits + downstream.response_cache_hits
+                )
+                self.response_cache_misses.inc(
+                    upstream.response_cache_misses + downstream.response_cache_misses
+                )
+
+            _LOG.debug("Image %s and mirror %s are out of sync", downstream, upstream)
+            sync_tasks.append(
+                {
+                    "mirror_url": str(upstream),
+                    "mirror_creds": mirror_creds,
+                    "image_url": str(downstream),
+                }
+            )
 
         return sync_tasks
 
@@ -353,13 +386,16 @@ class QuayMirror:
     def _get_push_creds(self):
         result = self.gqlapi.query(self.QUAY_ORG_CATALOG_QUERY)
 
-        creds = {}
-        for org_data in result["quay_orgs"]:
-            push_secret = org_data["pushCredentials"]
-            if push_secret is None:
-                continue
+        orgs = [o for o in result["quay_orgs"] if o["pushCredentials"] is not None]
+        push_credentials = self.secret_reader.read_all_many(
+            o["pushCredentials"] for o in orgs
+        )
 
-            raw_data = self.secret_reader.read_all(push_secret)
+        creds = {}
+        for org_data in orgs:
+            raw_data = push_credentials[secret_key(org_data["pushCredentials"])]
+            if isinstance(raw_data, Exception):
+                raise raw_data
             org = org_data["name"]
             instance = org_data["instance"]["name"]
             org_key = OrgKey(instance, org)
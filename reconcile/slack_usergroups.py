@@ -271,14 +271,46 @@ def get_usernames_from_pagerduty(
     return all_output_usernames
 
 
+class UsernameIndex:
+    """Users by lower case username, indexed once per user key."""
+
+    def __init__(self, users: Iterable[User]) -> None:
+        self.users = list(users)
+        self._indexes: dict[str, dict[str, list[User]]] = {}
+
+    def get(self, user_key: str, username: str) -> list[User]:
+        index = self._indexes.get(user_key)
+        if index is None:
+            index = {}
+            for u in self.users:
+                index.setdefault(getattr(u, user_key).lower(), []).append(u)
+            self._indexes[user_key] = index
+        return index.get(username.lower(), [])
+
+
+# user key and owners by (url, ref) of a repo
+RepoOwnersCache = dict[tuple[str, str], tuple[str, list[str]]]
+
+
 @retry(max_attempts=10)
 def get_slack_usernames_from_owners(
     owners_from_repo: Iterable[str],
     users: Iterable[User],
     usergroup: str,
     repo_owner_class: type[RepoOwners] = RepoOwners,
+    username_index: Optional[UsernameIndex] = None,
+    repo_owners_cache: Optional[RepoOwnersCache] = None,
 ) -> list[str]:
-    """Return list of usernames from all repo owners."""
+    """
+    Return list of usernames from all repo owners.
+
+    Pass the same username_index and repo_owners_cache for all usergroups of
+    a run to look up the owners of every repo and ref only once.
+    """
+    if username_index is None:
+        username_index = UsernameIndex(users)
+    if repo_owners_cache is None:
+        repo_owners_cache = {}
     all_slack_usernames = []
 
     for url_ref in owners_from_repo:
@@ -289,48 +321,53 @@ def get_slack_usernames_from_owners(
             url = url_ref
             ref = "master"
 
-        repo_cli = get_git_api(url)
+        if (url, ref) not in repo_owners_cache:
+            repo_cli = get_git_api(url)
 
-        if isinstance(repo_cli, GitLabApi):
-            user_key = "org_username"
-            missing_user_log_method = logging.warning
-        elif isinstance(repo_cli, GithubApi):
-            user_key = "github_username"
-            missing_user_log_method = logging.debug
-        else:
-            raise TypeError(f"{type(repo_cli)} not supported")
+            if isinstance(repo_cli, GitLabApi):
+                user_key = "org_username"
+            elif isinstance(repo_cli, GithubApi):
+                user_key = "github_username"
+            else:
+                raise TypeError(f"{type(repo_cli)} not supported")
 
-        repo_owners = repo_owner_class(git_cli=repo_cli, ref=ref)
+            repo_owners = repo_owner_class(git_cli=repo_cli, ref=ref)
 
-        try:
-            owners = repo_owners.get_root_owners()
-        except UnknownObjectException:
-            logging.error(f"ref {ref} not found for repo {url}")
-            raise
+            try:
+                owners = repo_owners.get_root_owners()
+            except UnknownObjectException:
+                logging.error(f"ref {ref} not found for repo {url}")
+                raise
+
+            repo_owners_cache[(url, ref)] = (
+                user_key,
+                owners["approvers"] + owners["reviewers"],
+            )
 
-        all_owners = owners["approvers"] + owners["reviewers"]
+        user_key, all_owners = repo_owners_cache[(url, ref)]
 
         if not all_owners:
             continue
 
-        all_username_keys = [getattr(u, user_key) for u in users]
+        slack_usernames: list[str] = []
+        not_found_users = []
+        for owner in all_owners:
+            owner_users = username_index.get(user_key, owner)
+            if not owner_users:
+                not_found_users.append(owner)
+            slack_usernames.extend(get_slack_username(u) for u in owner_users)
+        # owners can be approvers and reviewers
+        slack_usernames = list(dict.fromkeys(slack_usernames))
 
-        slack_usernames = [
-            get_slack_username(u)
-            for u in users
-            if getattr(u, user_key).lower() in [o.lower() for o in all_owners]
-        ]
-        not_found_users = [
-            owner
-            for owner in all_owners
-            if owner.lower() not in [u.lower() for u in all_username_keys]
-        ]
         if not_found_users:
             msg = (
                 f"[{usergroup}] {user_key} not found in app-interface: "
                 + f"{not_found_users}"
             )
-            missing_user_log_method(msg)
+            if user_key == "org_username":
+                logging.warning(msg)
+            else:
+                logging.debug(msg)
 
         all_slack_usernames.extend(slack_usernames)
 
@@ -389,6 +426,8 @@ def get_desired_state(
 ) -> SlackState:
     """Get the desired state of Slack usergroups."""
     desired_state: SlackState = {}
+    username_index = UsernameIndex(users)
+    repo_owners_cache: RepoOwnersCache = {}
     for p in permissions:
         if p.skip:
             continue
@@ -420,7 +459,11 @@ def get_desired_state(
 
         if p.owners_from_repos:
             slack_usernames_repo = get_slack_usernames_from_owners(
-                p.owners_from_repos, users, usergroup
+                p.owners_from_repos,
+                users,
+                usergroup,
+                username_index=username_index,
+                repo_owners_cache=repo_owners_cache,
             )
             all_user_names.extend(slack_usernames_repo)
 
@@ -561,6 +561,9 @@ def run(dry_run: bool, enable_deletion: bool = False) -> None:
     state = State(
         integration=QONTRACT_INTEGRATION, accounts=accounts, settings=settings
     )
+    # every query reads its state, read it all at once. writes are not
+    # buffered, so that a query is never executed twice
+    state.prefetch(buffer_writes=False)
     smtp_settings = typed_queries.smtp.settings()
     smtp_client = SmtpClient(
         server=get_smtp_server_connection(
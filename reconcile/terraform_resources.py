@@ -824,34 +824,35 @@ def run(
 def early_exit_desired_state(*args, **kwargs) -> dict[str, Any]:
     gqlapi = gql.get_api()
     namespaces = get_tf_namespaces()
-    resources = []
+    spec_resource_paths: list[tuple[ExternalResourceSpec, str]] = []
     for ns_info in namespaces:
         for spec in get_external_resource_specs(
             ns_info, provision_provider=PROVIDER_AWS
         ):
-
-            def register_resource(
-                spec: ExternalResourceSpec, resource: Optional[dict[str, Any]]
-            ):
-                if resource:
-                    resources.append(
-                        {
-                            IDENTIFIER_FIELD_NAME: f"{spec.cluster_name}/{spec.namespace_name}/{spec.provisioner_name}/{spec.provider}/{spec.identifier}/{resource.get('path')}",
-                            "content_sha": resource.get("sha256sum"),
-                            "provisioner": spec.provisioner_name,
-                        }
-                    )
-
             defaults = spec.resource.get("defaults")
             if defaults:
-                register_resource(spec, gqlapi.get_resource(defaults))
+                spec_resource_paths.append((spec, defaults))
             parameter_group = spec.resource.get("parameter_group")
             if parameter_group:
-                register_resource(spec, gqlapi.get_resource(parameter_group))
+                spec_resource_paths.append((spec, parameter_group))
             for spec_item in spec.resource.get("specs") or []:
                 defaults = spec_item.get("defaults")
                 if defaults:
-                    register_resource(spec, gqlapi.get_resource(defaults))
+                    spec_resource_paths.append((spec, defaults))
+
+    # fetch all referenced resources in batches instead of one by one
+    fetched = gqlapi.get_resources(path for _, path in spec_resource_paths)
+    resources = []
+    for spec, path in spec_resource_paths:
+        resource = fetched[path]
+        assert not isinstance(resource, gql.GqlGetResourceError)
+        resources.append(
+            {
+                IDENTIFIER_FIELD_NAME: f"{spec.cluster_name}/{spec.namespace_name}/{spec.provisioner_name}/{spec.provider}/{spec.identifier}/{resource.get('path')}",
+                "content_sha": resource.get("sha256sum"),
+                "provisioner": spec.provisioner_name,
+            }
+        )
 
     return {
         "accounts": queries.get_aws_accounts(terraform_state=True),
@@ -151,6 +151,23 @@ class TestAggregatedList:
 
         assert diff["update-delete"] == [{"items": ["qwerty2"], "params": {"a": 1}}]
 
+    @staticmethod
+    def test_diff_large_states():
+        # adding and diffing used to be quadratic in the number of items
+        left = AggregatedList()
+        right = AggregatedList()
+
+        members = [f"user{i}" for i in range(100000)]
+        left.add({"a": 1}, members[:90000])
+        left.add({"a": 1}, members[:90000])
+        right.add({"a": 1}, members[10000:])
+
+        diff = left.diff(right)
+
+        assert len(left.get({"a": 1})["items"]) == 90000
+        assert diff["update-insert"] == [{"items": members[90000:], "params": {"a": 1}}]
+        assert diff["update-delete"] == [{"items": members[:10000], "params": {"a": 1}}]
+
 
 class TestAggregatedDiffRunner:
     @staticmethod
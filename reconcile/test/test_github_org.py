@@ -6,6 +6,7 @@ from reconcile.utils import (
     gql,
 )
 from reconcile.utils.aggregated_list import AggregatedList
+from reconcile.utils.raw_github_api import GithubGraphQLError
 
 from .fixtures import Fixtures
 
@@ -21,6 +22,28 @@ class RawGithubApiMock:
     def team_invitations(org_id, team_id):
         return []
 
+    @staticmethod
+    def org_members(org_name):
+        raise GithubGraphQLError("not available")
+
+    @staticmethod
+    def org_teams(org_name):
+        raise GithubGraphQLError("not available")
+
+
+class RawGithubApiGraphQLMock:
+    def __init__(self, spec):
+        self.spec = spec
+
+    def org_members(self, org_name):
+        return [m["login"] for m in self.spec[org_name]["members"]]
+
+    def org_teams(self, org_name):
+        return {
+            t["name"]: [m["login"] for m in t["members"]]
+            for t in self.spec[org_name]["teams"]
+        }
+
 
 class AttrDict(dict):
     def __init__(self, *args, **kwargs):
@@ -82,13 +105,16 @@ class TestGithubOrg:
         gql.init_from_config(autodetect_sha=False)
 
     @staticmethod
-    def do_current_state_test(path):
+    def do_current_state_test(path, graphql=False):
         fixture = fxt.get_anymarkup(path)
 
         with patch("reconcile.github_org.RawGithubApi") as m_rga:
             with patch("reconcile.github_org.Github") as m_gh:
                 m_gh.return_value = GithubMock(fixture["gh_api"])
-                m_rga.return_value = RawGithubApiMock()
+                if graphql:
+                    m_rga.return_value = RawGithubApiGraphQLMock(fixture["gh_api"])
+                else:
+                    m_rga.return_value = RawGithubApiMock()
 
                 gh_api_store = github_org.GHApiStore(config.get_config())
                 current_state = github_org.fetch_current_state(gh_api_store)
@@ -122,6 +148,9 @@ class TestGithubOrg:
     def test_current_state_simple(self):
         self.do_current_state_test("current_state_simple.yml")
 
+    def test_current_state_simple_graphql(self):
+        self.do_current_state_test("current_state_simple.yml", graphql=True)
+
     def test_desired_state_simple(self):
         self.do_desired_state_test("desired_state_simple.yml")
 
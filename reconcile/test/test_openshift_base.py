@@ -1,6 +1,9 @@
 import logging
 from typing import Any
-from unittest.mock import patch
+from unittest.mock import (
+    MagicMock,
+    patch,
+)
 
 import pytest
 import yaml
@@ -625,6 +628,115 @@ def test_populate_current_state_resource_name_filtering(
     )
 
 
+def test_group_current_state_specs_disabled(oc_cs1: oc.OCNative):
+    specs: list[sut.StateSpec] = [
+        sut.CurrentStateSpec(
+            oc=oc_cs1, cluster="cs1", namespace=ns, kind="Secret", resource_names=None
+        )
+        for ns in ["ns1", "ns2"]
+    ]
+    assert sut.group_current_state_specs(specs, None) == specs
+
+
+def test_group_current_state_specs(oc_cs1: MagicMock):
+    oc_cs1.is_kind_supported.return_value = False
+    oc_cs1.get_all.return_value = {"items": [{}, {}, {}]}
+    named_spec = sut.CurrentStateSpec(
+        oc=oc_cs1,
+        cluster="cs1",
+        namespace="ns3",
+        kind="Secret",
+        resource_names=["name"],
+    )
+    specs: list[sut.StateSpec] = [
+        sut.CurrentStateSpec(
+            oc=oc_cs1, cluster="cs1", namespace=ns, kind=kind, resource_names=None
+        )
+        for ns in ["ns1", "ns2"]
+        for kind in ["Secret", "ConfigMap"]
+    ]
+
+    grouped = sut.group_current_state_specs(specs + [named_spec], 0.5)
+
+    assert named_spec in grouped
+    assert (
+        sut.ClusterCurrentStateSpec(
+            oc=oc_cs1, cluster="cs1", kind="Secret", namespaces={"ns1", "ns2"}
+        )
+        in grouped
+    )
+    assert (
+        sut.ClusterCurrentStateSpec(
+            oc=oc_cs1, cluster="cs1", kind="ConfigMap", namespaces={"ns1", "ns2"}
+        )
+        in grouped
+    )
+    assert len(grouped) == 3
+
+
+def test_group_current_state_specs_below_ratio(oc_cs1: MagicMock):
+    oc_cs1.is_kind_supported.return_value = False
+    oc_cs1.get_all.return_value = {"items": [{}] * 10}
+    specs: list[sut.StateSpec] = [
+        sut.CurrentStateSpec(
+            oc=oc_cs1, cluster="cs1", namespace=ns, kind="Secret", resource_names=None
+        )
+        for ns in ["ns1", "ns2"]
+    ]
+    assert sut.group_current_state_specs(specs, 0.5) == specs
+
+
+def test_populate_cluster_current_state(
+    resource_inventory: resource.ResourceInventory, oc_cs1: MagicMock
+):
+    def namespaced_resource(namespace: str, name: str) -> dict[str, Any]:
+        r = build_resource("Secret", "v1", name)
+        r["metadata"]["namespace"] = namespace
+        return r
+
+    oc_cs1.is_kind_supported.return_value = True
+    oc_cs1.get_items.return_value = [
+        namespaced_resource("ns1", "a"),
+        namespaced_resource("ns2", "b"),
+        namespaced_resource("unmanaged", "c"),
+    ]
+    resource_inventory.initialize_resource_type("cs1", "ns1", "Secret")
+    resource_inventory.initialize_resource_type("cs1", "ns2", "Secret")
+
+    spec = sut.ClusterCurrentStateSpec(
+        oc=oc_cs1, cluster="cs1", kind="Secret", namespaces={"ns1", "ns2"}
+    )
+    sut.populate_current_state(spec, resource_inventory, TEST_INT, TEST_INT_VER)
+
+    oc_cs1.get_items.assert_called_once_with("Secret", all_namespaces=True)
+    current = {
+        (namespace, name)
+        for _, namespace, _, data in resource_inventory
+        for name in data["current"]
+    }
+    assert current == {("ns1", "a"), ("ns2", "b")}
+
+
+def test_populate_cluster_current_state_fallback(
+    resource_inventory: resource.ResourceInventory, oc_cs1: MagicMock
+):
+    oc_cs1.is_kind_supported.return_value = True
+    oc_cs1.get_items.side_effect = [
+        oc.StatusCodeError("forbidden"),
+        [build_resource("Secret", "v1", "a")],
+    ]
+    resource_inventory.initialize_resource_type("cs1", "ns1", "Secret")
+
+    spec = sut.ClusterCurrentStateSpec(
+        oc=oc_cs1, cluster="cs1", kind="Secret", namespaces={"ns1"}
+    )
+    sut.populate_current_state(spec, resource_inventory, TEST_INT, TEST_INT_VER)
+
+    oc_cs1.get_items.assert_called_with("Secret", namespace="ns1", resource_names=None)
+    _, _, _, data = next(iter(resource_inventory))
+    assert list(data["current"]) == ["a"]
+
+
 #
 # determine_user_keys_for_access tests
 #
@@ -728,3 +840,30 @@ def test_user_has_cluster_access(mocker: MockerFixture):
     )
     assert sut.user_has_cluster_access(user, cluster, ["user_org"])
     assert not sut.user_has_cluster_access(user, cluster, ["another_user"])
+
+
+def test_realize_data_keeps_inventory_order(
+    mocker: MockerFixture, resource_inventory: resource.ResourceInventory
+):
+    for cluster in ["cs1", "cs2"]:
+        for name in ["a", "b"]:
+            resource_inventory.initialize_resource_type(cluster, "ns", "ConfigMap")
+            resource_inventory.add_desired(
+                cluster,
+                "ns",
+                "ConfigMap",
+                name,
+                resource.OpenshiftResource(
+                    build_resource("ConfigMap", "v1", name), TEST_INT, TEST_INT_VER
+                ),
+            )
+    oc_map = mocker.create_autospec(oc.OC_Map)
+
+    actions = sut.realize_data(True, oc_map, resource_inventory, 2)
+
+    assert [(a["cluster"], a["name"]) for a in actions] == [
+        ("cs1", "a"),
+        ("cs1", "b"),
+        ("cs2", "a"),
+        ("cs2", "b"),
+    ]
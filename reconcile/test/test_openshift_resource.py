@@ -1,3 +1,5 @@
+import copy
+
 import pytest
 
 from reconcile.utils.openshift_resource import ConstructResourceError
@@ -220,6 +222,71 @@ def test_secret_string_data():
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    "body",
+    [
+        {
+            "apiVersion": "v1",
+            "kind": "Secret",
+            "type": "Opaque",
+            "metadata": {"name": "s", "annotations": {"qontract.update": "x"}},
+            "data": {"a": "Yg=="},
+            "stringData": {"k": "v"},
+        },
+        {
+            "apiVersion": "rbac.authorization.k8s.io/v1",
+            "kind": "Role",
+            "metadata": {"name": "r", "namespace": "ns"},
+            "rules": [{"resources": ["pods", "deployments"], "verbs": ["list", "get"]}],
+        },
+        {
+            "apiVersion": "rbac.authorization.k8s.io/v1",
+            "kind": "RoleBinding",
+            "metadata": {"name": "rb"},
+            "roleRef": {"kind": "Role", "name": "r", "namespace": "ns"},
+            "subjects": [{"kind": "User", "name": "u", "namespace": "ns"}],
+        },
+        {
+            "apiVersion": "route.openshift.io/v1",
+            "kind": "Route",
+            "metadata": {
+                "name": "rt",
+                "annotations": {"kubernetes.io/tls-acme": "true"},
+            },
+            "spec": {
+                "wildcardPolicy": "None",
+                "subdomain": "",
+                "tls": {"key": "k", "certificate": "c"},
+            },
+        },
+        {
+            "apiVersion": "v1",
+            "kind": "Service",
+            "metadata": {"name": "svc", "labels": {"app": "a"}},
+            "spec": {"type": "ClusterIP", "clusterIP": "1.2.3.4"},
+            "status": {},
+        },
+    ],
+)
+def test_canonicalize_does_not_modify_body(body):
+    original = copy.deepcopy(body)
+    OR.canonicalize(body)
+    assert body == original
+
+
+def test_sha256sum_memoized():
+    resource = fxt.get_anymarkup("sha256sum.yml")
+    openshift_resource = OR(resource, TEST_INT, TEST_INT_VER)
+
+    sha256sum = openshift_resource.sha256sum()
+    openshift_resource.body["metadata"]["name"] = "changed"
+    assert openshift_resource.sha256sum() == sha256sum
+
+    # assigning the body again invalidates the memoized sum
+    openshift_resource.body = openshift_resource.body
+    assert openshift_resource.sha256sum() != sha256sum
+
+
 def test_managed_cluster_label_ignore():
     desired = {
         "apiVersion": "cluster.open-cluster-management.io/v1",
@@ -413,3 +480,40 @@ def test_resource_inventory_add_desired_resource_mixed_kinds():
             assert resource["desired"].get("foo")
         elif resource_type == "Deployment":
             assert len(resource["desired"]) == 0
+
+
+def test_resource_inventory_state_item_access():
+    ri = ResourceInventory()
+    ri.initialize_resource_type("cl", "ns", "Deployment")
+    res = build_resource("Deployment", "apps/v1", "foo")
+    ri.add_current("cl", "ns", "Deployment", "foo", res)
+
+    _, _, _, resource = list(ri)[0]
+    assert resource["current"] == {"foo": res}
+    assert resource["desired"] == {}
+    assert "desired" in resource
+    with pytest.raises(KeyError):
+        resource["status"]
+
+
+def test_resource_inventory_memory_report():
+    ri = ResourceInventory()
+    ri.initialize_resource_type("cl", "ns1", "Deployment")
+    ri.initialize_resource_type("cl", "ns2", "Deployment")
+    ri.initialize_resource_type("cl", "ns2", "Secret")
+    ri.add_desired(
+        "cl", "ns1", "Deployment", "foo", build_resource("Deployment", "apps/v1", "foo")
+    )
+    ri.add_current(
+        "cl", "ns1", "Deployment", "foo", build_resource("Deployment", "apps/v1", "foo")
+    )
+    ri.add_current("cl", "ns2", "Secret", "bar", build_resource("Secret", "v1", "bar"))
+
+    report = ri.memory_report()
+
+    assert report.keys() == {"cl"}
+    assert report["cl"]["namespaces"] == 2
+    assert report["cl"]["resource_types"] == 3
+    assert report["cl"]["desired"] == 1
+    assert report["cl"]["current"] == 2
+    assert report["cl"]["bytes"] > 0
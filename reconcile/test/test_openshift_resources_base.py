@@ -438,3 +438,33 @@ def test_check_cluster_scoped_resources_duplicated(
 def test_check_error():
     e = orb.CheckError("message")
     print(e)
+
+
+def test_read_secret_prefetched(mocker):
+    secret_reader = mocker.patch.object(orb, "SecretReader", autospec=True)
+    secrets = {("path/a", 1): {"key": "value"}}
+
+    data = orb.read_secret({"path": "path/a", "version": 1}, secrets=secrets)
+
+    assert data == {"key": "value"}
+    secret_reader.assert_not_called()
+
+
+def test_read_secret_prefetch_error(mocker):
+    mocker.patch.object(orb, "SecretReader", autospec=True)
+    secrets = {("path/a", 1): orb.SecretVersionNotFound("not found")}
+
+    with pytest.raises(orb.SecretVersionNotFound):
+        orb.read_secret({"path": "path/a", "version": 1}, secrets=secrets)
+
+
+def test_read_secret_not_prefetched(mocker):
+    secret_reader = mocker.patch.object(orb, "SecretReader", autospec=True)
+    secret_reader.return_value.read_all.return_value = {"key": "value"}
+
+    data = orb.read_secret({"path": "path/b", "version": 2}, secrets={})
+
+    assert data == {"key": "value"}
+    secret_reader.return_value.read_all.assert_called_once_with(
+        {"path": "path/b", "version": 2}
+    )
@@ -151,3 +151,30 @@ def test_read_all_config_raises(mocker, patch_sleep):
 
     with pytest.raises(SecretNotFound):
         secret_reader.read_all({"path": "test", "field": "some-field"})
+
+
+def test_read_all_many_dedupes_and_collects_errors(vault_mock, mocker):
+    mocker.patch("time.sleep")
+
+    def read_all(secret):
+        if secret["path"] == "missing":
+            raise vault.SecretNotFound("missing")
+        return {"path": secret["path"]}
+
+    vault_mock.read_all.side_effect = read_all
+    secret_reader = VaultSecretReader(vault_client=vault_mock)
+
+    results = secret_reader.read_all_many(
+        [
+            {"path": "a", "version": 1},
+            {"path": "a", "version": 1, "field": "other"},
+            {"path": "a", "version": 2},
+            {"path": "missing"},
+        ],
+        thread_pool_size=2,
+    )
+
+    assert results[("a", 1)] == {"path": "a"}
+    assert results[("a", 2)] == {"path": "a"}
+    assert isinstance(results[("missing", None)], SecretNotFound)
+    assert vault_mock.read_all.call_count == 2 + 3  # the missing one is retried
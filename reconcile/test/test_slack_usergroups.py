@@ -231,6 +231,40 @@ def test_get_slack_usernames_from_owners(mocker: MockerFixture, user: UserV1) ->
     assert result == [user.slack_username]
 
 
+def test_get_slack_usernames_from_owners_cached(
+    mocker: MockerFixture, user: UserV1
+) -> None:
+    get_git_api = mocker.patch("reconcile.slack_usergroups.get_git_api")
+    get_git_api.return_value = create_autospec(GithubApi)
+    mock_repo_owner = create_autospec(repo_owners.RepoOwners)
+    mock_repo_owner.return_value.get_root_owners.return_value = {
+        "approvers": ["GitHub"],
+        "reviewers": ["github"],
+    }
+    username_index = integ.UsernameIndex([user])
+    repo_owners_cache: integ.RepoOwnersCache = {}
+
+    for usergroup in ["usergroup1", "usergroup2"]:
+        result = integ.get_slack_usernames_from_owners(
+            owners_from_repo=["https://github.com/owner/repo"],
+            users=[user],
+            usergroup=usergroup,
+            repo_owner_class=mock_repo_owner,
+            username_index=username_index,
+            repo_owners_cache=repo_owners_cache,
+        )
+        assert result == [user.slack_username]
+
+    get_git_api.assert_called_once_with("https://github.com/owner/repo")
+    mock_repo_owner.return_value.get_root_owners.assert_called_once_with()
+    assert repo_owners_cache == {
+        ("https://github.com/owner/repo", "master"): (
+            "github_username",
+            ["GitHub", "github"],
+        )
+    }
+
+
 def test_include_user_to_cluster_usergroup_user_has_cluster_access(
     mocker: MockerFixture, user: UserV1
 ) -> None:
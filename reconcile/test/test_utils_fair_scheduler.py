@@ -0,0 +1,74 @@
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+from reconcile.utils.fair_scheduler import run_fair
+
+
+def test_run_fair_results():
+    items = [("a", 1), ("b", 2), ("a", 3), ("c", 4)]
+
+    results = dict(
+        run_fair(lambda i, factor: i[1] * factor, items, lambda i: i[0], 2, factor=10)
+    )
+
+    assert results == {0: 10, 1: 20, 2: 30, 3: 40}
+
+
+def test_run_fair_round_robin_order():
+    items = [("a", 1), ("a", 2), ("a", 3), ("b", 4), ("b", 5), ("c", 6)]
+    started = []
+
+    def func(item):
+        started.append(item[1])
+
+    list(run_fair(func, items, lambda i: i[0], 1))
+
+    assert started == [1, 4, 6, 2, 5, 3]
+
+
+def test_run_fair_max_per_key():
+    items = [("a", i) for i in range(6)] + [("b", i) for i in range(6)]
+    running: Counter[str] = Counter()
+    peak: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def func(item):
+        with lock:
+            running[item[0]] += 1
+            peak[item[0]] = max(peak[item[0]], running[item[0]])
+        time.sleep(0.01)
+        with lock:
+            running[item[0]] -= 1
+
+    list(run_fair(func, items, lambda i: i[0], 4, max_per_key=2))
+
+    assert peak == {"a": 2, "b": 2}
+
+
+def test_run_fair_raises():
+    def func(item):
+        if item == 2:
+            raise ValueError(item)
+        return item
+
+    with pytest.raises(ValueError):
+        list(run_fair(func, [1, 2, 3], lambda i: i, 2))
+
+
+def test_run_fair_runs_all_items_before_raising():
+    items = [("a", 1), ("a", 2), ("b", 3), ("b", 4)]
+    results = []
+
+    def func(item):
+        if item[1] == 1:
+            raise ValueError(item)
+        return item[1]
+
+    with pytest.raises(ValueError):
+        for _, result in run_fair(func, items, lambda i: i[0], 1):
+            results.append(result)
+
+    assert sorted(results) == [2, 3, 4]
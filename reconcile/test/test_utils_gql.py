@@ -7,7 +7,12 @@ from reconcile.utils.gql import (
     GqlApiError,
     GqlApiErrorForbiddenSchema,
     GqlApiIntegrationNotFound,
+    GqlClientPool,
+    GqlGetResourceError,
+    PersistentRequestsHTTPTransport,
+    get_client_pool,
 )
+from reconcile.utils.gql_query_cache import GqlQueryCache
 
 TEST_QUERY = """
 {
@@ -79,3 +84,140 @@ def test_gqlapi_throws_gqlapierrorforbiddenschema_exception(mocker):
     with pytest.raises(GqlApiErrorForbiddenSchema):
         gql_api = GqlApi("test_url", "test_token", "INTEGRATION", validate_schemas=True)
         gql_api.query.__wrapped__(gql_api, TEST_QUERY)
+
+
+def test_gql_client_pool_reuses_idle_client():
+    pool = GqlClientPool("test_url", "test_token", size=2)
+    with pool.client() as first:
+        pass
+    with pool.client() as second:
+        pass
+    assert first is second
+
+
+def test_gql_client_pool_concurrent_clients_differ():
+    pool = GqlClientPool("test_url", "test_token", size=2)
+    with pool.client() as first:
+        with pool.client() as second:
+            assert first is not second
+
+
+def test_gql_client_pool_discards_client_on_error():
+    pool = GqlClientPool("test_url", "test_token", size=2)
+    with pytest.raises(Exception):
+        with pool.client() as first:
+            raise Exception("Something went wrong!")
+    with pool.client() as second:
+        assert first is not second
+
+
+def test_gql_client_pool_bounded():
+    pool = GqlClientPool("test_url", "test_token", size=1)
+    with pool.client() as first:
+        with pool.client() as second:
+            pass
+    with pool.client() as third:
+        with pool.client() as fourth:
+            pass
+    assert third is second
+    assert fourth is not first
+
+
+def test_gql_client_pool_shared_across_bundle_shas(mocker):
+    mocker.patch("reconcile.utils.gql._client_pools", {})
+    old_url = "https://gql.example.com/graphqlsha/old"
+    new_url = "https://gql.example.com/graphqlsha/new"
+    pool = get_client_pool(old_url, "test_token")
+
+    assert get_client_pool(new_url, "test_token") is pool
+    assert get_client_pool(new_url, "other_token") is not pool
+    with pool.client(old_url) as first:
+        pass
+    with pool.client(new_url) as second:
+        assert second is first
+        assert isinstance(second.transport, PersistentRequestsHTTPTransport)
+        assert second.transport.url == new_url
+
+
+def test_persistent_transport_keeps_session():
+    transport = PersistentRequestsHTTPTransport("test_url")
+    transport.connect()
+    session = transport.session
+    transport.close()
+    transport.connect()
+    assert transport.session is session
+    transport.shutdown()
+    assert transport.session is None
+
+
+def test_gqlapi_caches_queries_for_pinned_sha(mocker):
+    mocker.patch(
+        "reconcile.utils.gql.get_query_cache", return_value=GqlQueryCache(1000)
+    )
+    patched_client = mocker.patch("reconcile.utils.gql.Client.execute", autospec=True)
+    patched_client.return_value.formatted = {"data": {"integrations": []}}
+
+    gql_api = GqlApi("http://server/graphqlsha/abc", "test_token")
+    assert gql_api.sha == "abc"
+    first = gql_api.query.__wrapped__(gql_api, TEST_QUERY)
+    second = gql_api.query.__wrapped__(gql_api, TEST_QUERY)
+    assert first == second == {"integrations": []}
+    assert patched_client.call_count == 1
+
+
+def test_gqlapi_does_not_cache_unpinned_queries(mocker):
+    mocker.patch(
+        "reconcile.utils.gql.get_query_cache", return_value=GqlQueryCache(1000)
+    )
+    patched_client = mocker.patch("reconcile.utils.gql.Client.execute", autospec=True)
+    patched_client.return_value.formatted = {"data": {"integrations": []}}
+
+    gql_api = GqlApi("http://server/graphql", "test_token")
+    assert gql_api.sha is None
+    gql_api.query.__wrapped__(gql_api, TEST_QUERY)
+    gql_api.query.__wrapped__(gql_api, TEST_QUERY)
+    assert patched_client.call_count == 2
+
+
+def test_gqlapi_get_resources_batches_paths(mocker):
+    gql_api = GqlApi("test_url", "test_token")
+    gql_api.RESOURCES_BATCH_SIZE = 2
+    query = mocker.patch.object(gql_api, "query", autospec=True)
+    query.side_effect = [
+        {
+            "r0": [{"path": "/a.yml", "content": "a", "sha256sum": "1"}],
+            "r1": [{"path": "/b.yml", "content": "b", "sha256sum": "2"}],
+        },
+        {"r0": []},
+    ]
+
+    resources = gql_api.get_resources(
+        ["/a.yml", "/b.yml", "/a.yml", "/c.yml"], return_errors=True
+    )
+
+    assert query.call_count == 2
+    assert query.call_args_list[0][0][1] == {"path0": "/a.yml", "path1": "/b.yml"}
+    a, b = resources["/a.yml"], resources["/b.yml"]
+    assert not isinstance(a, GqlGetResourceError)
+    assert not isinstance(b, GqlGetResourceError)
+    assert a["content"] == "a"
+    assert b["content"] == "b"
+    assert isinstance(resources["/c.yml"], GqlGetResourceError)
+
+
+def test_gqlapi_get_resources_raises_errors(mocker):
+    gql_api = GqlApi("test_url", "test_token")
+    query = mocker.patch.object(gql_api, "query", autospec=True)
+    query.side_effect = GqlApiError("boom")
+
+    with pytest.raises(GqlGetResourceError, match="boom"):
+        gql_api.get_resources(["/a.yml"])
+
+
+def test_gqlapi_get_resource_keeps_error_message(mocker):
+    gql_api = GqlApi("test_url", "test_token")
+    query = mocker.patch.object(gql_api, "query", autospec=True)
+    query.side_effect = GqlApiError("Could not connect to GraphQL server")
+
+    with pytest.raises(GqlGetResourceError, match="Could not connect"):
+        gql_api.get_resource("/a.yml")
@@ -0,0 +1,72 @@
+import json
+import os
+
+from reconcile.utils.gql_query_cache import GqlQueryCache
+
+QUERY = "{ clusters: clusters_v1 { name } }"
+RESULT = {"data": {"clusters": [{"name": "cluster"}]}}
+
+
+def test_gql_query_cache_miss():
+    cache = GqlQueryCache(max_bytes=1000)
+    assert cache.get("sha", QUERY, None) is None
+
+
+def test_gql_query_cache_hit():
+    cache = GqlQueryCache(max_bytes=1000)
+    cache.set("sha", QUERY, None, RESULT)
+    assert cache.get("sha", QUERY, None) == RESULT
+
+
+def test_gql_query_cache_keyed_by_sha_and_variables():
+    cache = GqlQueryCache(max_bytes=1000)
+    cache.set("sha", QUERY, {"name": "a"}, RESULT)
+    assert cache.get("other-sha", QUERY, {"name": "a"}) is None
+    assert cache.get("sha", QUERY, {"name": "b"}) is None
+    assert cache.get("sha", QUERY, {"name": "a"}) == RESULT
+
+
+def test_gql_query_cache_returns_copies():
+    cache = GqlQueryCache(max_bytes=1000)
+    cache.set("sha", QUERY, None, RESULT)
+    result = cache.get("sha", QUERY, None)
+    assert result is not None
+    result["data"]["clusters"].clear()
+    assert cache.get("sha", QUERY, None) == RESULT
+
+
+def test_gql_query_cache_evicts_least_recently_used():
+    cache = GqlQueryCache(max_bytes=2 * len(json.dumps(RESULT)))
+    cache.set("sha", "a", None, RESULT)
+    cache.set("sha", "b", None, RESULT)
+    cache.get("sha", "a", None)
+    cache.set("sha", "c", None, RESULT)
+    assert cache.get("sha", "a", None) == RESULT
+    assert cache.get("sha", "b", None) is None
+    assert cache.get("sha", "c", None) == RESULT
+
+
+def test_gql_query_cache_skips_results_larger_than_max_bytes():
+    cache = GqlQueryCache(max_bytes=len(json.dumps(RESULT)) - 1)
+    cache.set("sha", QUERY, None, RESULT)
+    assert cache.get("sha", QUERY, None) is None
+
+
+def test_gql_query_cache_disk_tier(tmp_path):
+    cache = GqlQueryCache(max_bytes=1000, cache_dir=str(tmp_path))
+    cache.set("sha", QUERY, None, RESULT)
+    assert (tmp_path / "sha").is_dir()
+
+    other_cache = GqlQueryCache(max_bytes=1000, cache_dir=str(tmp_path))
+    assert other_cache.get("sha", QUERY, None) == RESULT
+
+
+def test_gql_query_cache_disk_tier_keeps_recent_shas(tmp_path):
+    for i, sha in enumerate(["old", "older"]):
+        (tmp_path / sha).mkdir()
+        os.utime(tmp_path / sha, (1000 - i, 1000 - i))
+    cache = GqlQueryCache(max_bytes=1000, cache_dir=str(tmp_path), max_shas=2)
+
+    cache.set("new", QUERY, None, RESULT)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new", "old"]
@@ -277,3 +277,46 @@ def test_template_cron_failure_history(values_cron):
     template = helm.template(values_cron)
     expected = yaml.safe_load(fxt.get("failure_history.yml"))
     assert template == expected
+
+
+def test_template_cached(mocker, values):
+    helm._template_cached.cache_clear()
+    run = mocker.patch("reconcile.utils.helm.run", autospec=True)
+    run.return_value.stdout = b"kind: Template\n"
+
+    assert helm.template(values) == {"kind": "Template"}
+    assert helm.template(values) == {"kind": "Template"}
+    assert run.call_count == 1
+
+    values["integrations"][0]["name"] = "other"
+    helm.template(values)
+    assert run.call_count == 2
+    helm._template_cached.cache_clear()
+
+
+def test_chart_sha256sum(tmp_path):
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "Chart.yaml").write_text("name: chart")
+    (tmp_path / "templates" / "a.yaml").write_text("a")
+    sha = helm.chart_sha256sum(str(tmp_path))
+
+    assert helm.chart_sha256sum(str(tmp_path)) == sha
+    (tmp_path / "templates" / "a.yaml").write_text("b")
+    assert helm.chart_sha256sum(str(tmp_path)) != sha
+
+
+def test_template_hashes_chart_once(mocker, values):
+    helm._template_cached.cache_clear()
+    helm._chart_sha256sum.cache_clear()
+    chart_sha256sum = mocker.patch.object(
+        helm, "chart_sha256sum", autospec=True, return_value="sha"
+    )
+    run = mocker.patch("reconcile.utils.helm.run", autospec=True)
+    run.return_value.stdout = b"kind: Template\n"
+
+    helm.template(values)
+    helm.template(values)
+
+    chart_sha256sum.assert_called_once_with(helm.CHART_PATH)
+    helm._template_cached.cache_clear()
+    helm._chart_sha256sum.cache_clear()
@@ -0,0 +1,126 @@
+import os
+from unittest.mock import create_autospec
+
+import requests
+from sretoolbox.container import Skopeo
+from sretoolbox.container.skopeo import SkopeoCmdError
+
+from reconcile.utils.image_mirror import (
+    CopyTask,
+    ManifestCache,
+    copy_images,
+    registry,
+    run_per_registry,
+)
+
+
+def test_registry():
+    assert registry("quay.io/app-sre/image:tag") == "quay.io"
+    assert registry("docker://registry.example.com:5000/repo/image") == (
+        "registry.example.com:5000"
+    )
+    assert registry("fedora") == "docker.io"
+
+
+def test_run_per_registry_keeps_order():
+    items = ["quay.io/a", "docker.io/b", "quay.io/c", "gcr.io/d"]
+
+    results = run_per_registry(
+        lambda item: item.upper(),
+        items,
+        image_url=lambda item: item,
+        task="test",
+        thread_pool_size=2,
+        max_per_registry=1,
+    )
+
+    assert results == [item.upper() for item in items]
+
+
+def test_copy_images():
+    skopeo = create_autospec(Skopeo)
+    skopeo.copy.side_effect = [SkopeoCmdError("failed"), None]
+    tasks = [
+        CopyTask("quay.io/a/src:1", "quay.io/b/dst:1", "u:p", "u2:p2"),
+        CopyTask("quay.io/a/src:2", "quay.io/b/dst:2"),
+    ]
+
+    copy_images(skopeo, tasks, thread_pool_size=1)
+
+    assert skopeo.copy.call_count == 2
+    skopeo.copy.assert_any_call(
+        src_image="quay.io/a/src:1",
+        src_creds="u:p",
+        dst_image="quay.io/b/dst:1",
+        dest_creds="u2:p2",
+    )
+
+
+def response(content: bytes) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.headers["Docker-Content-Digest"] = "sha256:abc"
+    r._content = content
+    return r
+
+
+def test_manifest_cache_size():
+    cache = ManifestCache(max_size=2, ttl=60)
+    cache[("url1", None)] = response(b"1")
+    cache[("url2", None)] = response(b"2")
+    assert ("url1", None) in cache
+    cache[("url3", "user")] = response(b"3")
+
+    assert ("url1", None) in cache
+    assert ("url2", None) not in cache
+    assert ("url3", "user") in cache
+    assert len(cache) == 2
+
+
+def test_manifest_cache_ttl(mocker):
+    time = mocker.patch("reconcile.utils.image_mirror.time.time", return_value=100)
+    cache = ManifestCache(max_size=2, ttl=60)
+    cache[("url", None)] = response(b"1")
+
+    time.return_value = 160
+    assert ("url", None) in cache
+    time.return_value = 161
+    assert ("url", None) not in cache
+    assert len(cache) == 0
+
+
+def test_manifest_cache_disk(tmp_path):
+    ManifestCache(max_size=2, ttl=60, cache_dir=str(tmp_path))[
+        ("url", "user")
+    ] = response(b'{"schemaVersion": 2}')
+
+    cache = ManifestCache(max_size=2, ttl=60, cache_dir=str(tmp_path))
+    cached = cache[("url", "user")]
+
+    assert cached.json() == {"schemaVersion": 2}
+    assert cached.headers["docker-content-digest"] == "sha256:abc"
+    assert ("url", None) not in cache
+
+
+def test_manifest_cache_disk_removes_evicted_and_expired(tmp_path, mocker):
+    time = mocker.patch("reconcile.utils.image_mirror.time.time", return_value=100)
+    cache = ManifestCache(max_size=1, ttl=60, cache_dir=str(tmp_path))
+    cache[("url1", None)] = response(b"1")
+    cache[("url2", None)] = response(b"2")
+    assert len(list(tmp_path.iterdir())) == 1
+
+    time.return_value = 161
+    assert ("url2", None) not in cache
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_manifest_cache_disk_sweeps_expired_files(tmp_path):
+    ManifestCache(max_size=2, ttl=60, cache_dir=str(tmp_path))[
+        ("url", None)
+    ] = response(b"1")
+    (path,) = tmp_path.iterdir()
+    os.utime(path, (0, 0))
+
+    ManifestCache(max_size=2, ttl=60, cache_dir=str(tmp_path))
+
+    assert not path.exists()
@@ -1,6 +1,11 @@
+import threading
+
 import pytest
 
-from reconcile.utils.jjb_client import JJB
+from reconcile.utils.jjb_client import (
+    JJB,
+    JobIndex,
+)
 
 
 @pytest.fixture
@@ -29,12 +34,17 @@ def gitlab_job_fixture():
 
 @pytest.fixture
 def patch_jjb(mocker, github_job_fixture, gitlab_job_fixture):
+    def init(self, configs):
+        self.working_dirs = {"ci": "/tmp/ci"}
+        self.job_indexes = {}
+        self._job_indexes_lock = threading.Lock()
+
     mocker.patch(
-        "reconcile.utils.jjb_client.JJB.__init__", return_value=None, autospec=True
+        "reconcile.utils.jjb_client.JJB.__init__", side_effect=init, autospec=True
     )
     return mocker.patch(
-        "reconcile.utils.jjb_client.JJB.get_all_jobs",
-        return_value={"ci": [github_job_fixture, gitlab_job_fixture]},
+        "reconcile.utils.jjb_client.JJB.get_jobs",
+        return_value=[github_job_fixture, gitlab_job_fixture],
         autospec=True,
     )
 
@@ -42,11 +52,44 @@ def patch_jjb(mocker, github_job_fixture, gitlab_job_fixture):
 def test_get_job_by_repo_url(patch_jjb, gitlab_job_fixture):
     jjb = JJB(None)
     job = jjb.get_job_by_repo_url(
-        "http://mygilabinstance.org/service/foobar", "pr-check"
+        "http://mygilabinstance.org/service/foobar/", "pr-check"
     )
     assert job["name"] == gitlab_job_fixture["name"]
 
 
+def test_get_job_by_repo_url_not_found(patch_jjb):
+    jjb = JJB(None)
+    with pytest.raises(ValueError):
+        jjb.get_job_by_repo_url("http://mygilabinstance.org/service/foobar", "build")
+
+
 def test_get_trigger_phrases_regex(patch_jjb, gitlab_job_fixture):
     jjb = JJB(None)
     assert jjb.get_trigger_phrases_regex(gitlab_job_fixture) == "my_trigger_regex.*"
+
+
+def test_jobs_parsed_once(patch_jjb, github_job_fixture, gitlab_job_fixture):
+    jjb = JJB(None)
+    assert jjb.get_all_jobs(job_types=["build"]) == {"ci": [github_job_fixture]}
+    assert jjb.get_all_jobs(job_types=["pr-check"]) == {"ci": [gitlab_job_fixture]}
+    assert jjb.get_repos() == {
+        "http://github.com",
+        "http://mygilabinstance.org/service/foobar",
+    }
+    jjb.get_job_by_repo_url("http://mygilabinstance.org/service/foobar", "pr-check")
+    patch_jjb.assert_called_once_with(jjb, "/tmp/ci", "ci")
+
+
+def test_job_index_get_jobs_by_type():
+    jobs = [
+        {"name": "service-build"},
+        {"name": "service-build-test"},
+        {"name": "service-pr-check"},
+        {"name": "openshift-saas-deploy-build"},
+    ]
+    index = JobIndex(jobs)
+    assert index.get_jobs_by_type(["build"]) == [jobs[0]]
+    assert index.get_jobs_by_type(["build"], include_test=True) == jobs[:2]
+    assert index.get_jobs_by_type(["build", "pr-check"]) == [jobs[0], jobs[2]]
+    assert index.get_jobs_by_type([]) == []
+    assert index.jobs_without_repo_url == [j["name"] for j in jobs]
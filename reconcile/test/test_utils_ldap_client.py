@@ -1,9 +1,15 @@
 import ldap3
 import pytest
 
+from reconcile.utils import ldap_client as ldap_client_module
 from reconcile.utils.ldap_client import LdapClient
 
 
+@pytest.fixture(autouse=True)
+def clear_found_users(mocker):
+    mocker.patch.object(ldap_client_module, "_found_users", {})
+
+
 @pytest.fixture
 def connection_search_result():
     result = [
@@ -48,4 +54,115 @@ def test_ldap_client_get_users(mocker, connection_search_result):
         "test",
         "(&(objectclass=person)(|(uid=user1)(uid=user2)(uid=user3)))",
         attributes=["uid"],
+        paged_size=ldap_client_module.LDAP_PAGE_SIZE,
+        paged_cookie=None,
+    )
+
+
+def test_ldap_client_get_users_chunks(mocker):
+    mocker.patch.object(ldap_client_module, "LDAP_CHUNK_SIZE", 2)
+    connections = [mocker.Mock(spec=ldap3.Connection) for _ in range(2)]
+    for c in connections:
+        c.search.side_effect = lambda base_dn, search_filter, **kwargs: (
+            None,
+            None,
+            [{"attributes": {"uid": ["user1"]}}] if "user1" in search_filter else [],
+            None,
+        )
+
+    with LdapClient("test", connections[0], pool=connections[1:]) as ldap_client:
+        users = ldap_client.get_users(["user1", "user2", "user3", "user(4)"])
+
+    assert users == {"user1"}
+    filters = sorted(
+        call.args[1] for c in connections for call in c.search.call_args_list
+    )
+    assert filters == [
+        "(&(objectclass=person)(|(uid=user1)(uid=user2)))",
+        "(&(objectclass=person)(|(uid=user3)(uid=user\\284\\29)))",
+    ]
+    for c in connections:
+        c.bind.assert_called_once_with()
+        c.unbind.assert_called_once_with()
+
+
+def test_ldap_client_get_users_paged(mocker):
+    mocked_connection = mocker.Mock(spec=ldap3.Connection)
+    controls = {ldap_client_module.PAGED_RESULTS_CONTROL: {"value": {"cookie": b"c"}}}
+    mocked_connection.search.side_effect = [
+        (None, {"controls": controls}, [{"attributes": {"uid": ["user1"]}}], None),
+        (None, {"controls": {}}, [{"attributes": {"uid": ["user2"]}}], None),
+    ]
+
+    with LdapClient("test", mocked_connection) as ldap_client:
+        assert ldap_client.get_users(["user1", "user2"]) == {"user1", "user2"}
+
+    assert mocked_connection.search.call_args.kwargs["paged_cookie"] == b"c"
+
+
+def test_ldap_client_get_users_cached(mocker, connection_search_result):
+    mocker.patch.object(ldap_client_module, "LDAP_CACHE_TTL", 3600)
+    mocked_connection = mocker.Mock(spec=ldap3.Connection)
+    mocked_connection.search.side_effect = lambda base_dn, search_filter, **kwargs: (
+        None,
+        None,
+        [
+            r
+            for r in connection_search_result
+            if f"(uid={r['attributes']['uid'][0]})" in search_filter
+        ],
+        None,
+    )
+
+    with LdapClient("test", mocked_connection) as ldap_client:
+        ldap_client.get_users(["user1", "user2", "user3", "user4"])
+        mocked_connection.search.reset_mock()
+        users = ldap_client.get_users(["user1", "user4"])
+
+    # user1 is cached, user4 was not found and is looked up again
+    assert users == {"user1"}
+    mocked_connection.search.assert_called_once()
+    assert (
+        mocked_connection.search.call_args.args[1]
+        == "(&(objectclass=person)(|(uid=user4)))"
     )
+
+
+def test_ldap_client_get_users_cache_expired(mocker, connection_search_result):
+    mocker.patch.object(ldap_client_module, "LDAP_CACHE_TTL", 3600)
+    mocked_connection = mocker.Mock(spec=ldap3.Connection)
+    mocked_connection.search.return_value = None, None, connection_search_result, None
+    mocked_time = mocker.patch.object(ldap_client_module.time, "time")
+    mocked_time.return_value = 0
+
+    with LdapClient("test", mocked_connection) as ldap_client:
+        ldap_client.get_users(["user1"])
+        mocked_time.return_value = ldap_client_module.LDAP_CACHE_TTL + 1
+        ldap_client.get_users(["user1"])
+
+    assert mocked_connection.search.call_count == 2
+
+
+def test_ldap_client_get_users_cached_case_insensitive(
+    mocker, connection_search_result
+):
+    mocker.patch.object(ldap_client_module, "LDAP_CACHE_TTL", 3600)
+    mocked_connection = mocker.Mock(spec=ldap3.Connection)
+    mocked_connection.search.return_value = None, None, connection_search_result, None
+
+    with LdapClient("test", mocked_connection) as ldap_client:
+        ldap_client.get_users(["User1"])
+        assert ldap_client.get_users(["USER1"]) == {"USER1"}
+
+    mocked_connection.search.assert_called_once()
+
+
+def test_ldap_client_get_users_not_cached_by_default(mocker, connection_search_result):
+    mocked_connection = mocker.Mock(spec=ldap3.Connection)
+    mocked_connection.search.return_value = None, None, connection_search_result, None
+
+    with LdapClient("test", mocked_connection) as ldap_client:
+        ldap_client.get_users(["user1"])
+        ldap_client.get_users(["user1"])
+
+    assert mocked_connection.search.call_count == 2
@@ -7,6 +7,7 @@ from reconcile.test.fixtures import Fixtures
 from reconcile.utils.oc import (
     OC,
     ApiClient,
+    OCDeprecated,
     StatusCodeError,
 )
 
@@ -56,3 +57,43 @@ class TestOCNative(TestCase):
         kind = "Project.test.io"
         with self.assertRaises(StatusCodeError):
             oc._parse_kind(kind)
+
+    @patch.dict(os.environ, {"USE_NATIVE_CLIENT": "True"}, clear=True)
+    @patch("reconcile.utils.oc.Popen")
+    @patch.object(ApiClient, "request")
+    def test_oc_native_does_not_fork_oc(self, mock_request, mock_popen):
+        mock_request.side_effect = request
+
+        oc = OC("cluster", "server", "token", init_projects=True)
+
+        self.assertEqual(oc.get_version(), fixture["server"]["version"])
+        self.assertTrue(oc.project_exists("default"))
+        mock_popen.assert_not_called()
+
+    @patch.dict(os.environ, {"USE_NATIVE_CLIENT": "True"}, clear=True)
+    @patch.object(OCDeprecated, "project_exists")
+    @patch.object(ApiClient, "request")
+    def test_oc_native_namespace_index(self, mock_request, mock_project_exists):
+        mock_request.side_effect = request
+        mock_project_exists.return_value = False
+
+        oc = OC("cluster", "server", "token", local=True)
+
+        self.assertTrue(oc.project_exists("default"))
+        self.assertTrue(oc.project_exists("dedicated-admin"))
+        self.assertFalse(oc.project_exists("missing"))
+        projects_requests = [
+            c for c in mock_request.call_args_list if c[0][1].endswith("/projects")
+        ]
+        self.assertEqual(len(projects_requests), 1)
+        mock_project_exists.assert_called_once_with("missing")
+
+        with patch.object(OCDeprecated, "delete_project"):
+            oc.delete_project("default")
+        mock_project_exists.reset_mock()
+        self.assertFalse(oc.project_exists("default"))
+        mock_project_exists.assert_called_once_with("default")
+
+        with patch.object(OCDeprecated, "new_project"):
+            oc.new_project("new")
+        self.assertTrue(oc.project_exists("new"))
@@ -0,0 +1,146 @@
+import re
+
+import pytest
+
+from reconcile.utils.oc_template import (
+    TemplateProcessingError,
+    generate_expression_value,
+    process_template,
+)
+
+
+def template(objects, parameters, labels=None):
+    t = {
+        "apiVersion": "template.openshift.io/v1",
+        "kind": "Template",
+        "metadata": {"name": "t"},
+        "objects": objects,
+        "parameters": parameters,
+    }
+    if labels:
+        t["labels"] = labels
+    return t
+
+
+def config_map(data, namespace=None):
+    cm = {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {"name": "cm"},
+        "data": data,
+    }
+    if namespace:
+        cm["metadata"]["namespace"] = namespace
+    return cm
+
+
+def test_process_template_string_parameters():
+    t = template(
+        [config_map({"a": "${A}-${B}", "c": "${UNKNOWN}", "${B}": "key"})],
+        [{"name": "A", "value": "default"}, {"name": "B"}],
+    )
+
+    objects = process_template(t, {"B": "b", "C": "ignored"})
+
+    assert objects == [
+        config_map({"a": "default-b", "c": "${UNKNOWN}", "b": "key"}),
+    ]
+    # the template is not modified
+    assert t["objects"][0]["data"]["a"] == "${A}-${B}"
+
+
+def test_process_template_non_string_parameters():
+    t = template(
+        [
+            {
+                "apiVersion": "apps/v1",
+                "kind": "Deployment",
+                "metadata": {"name": "d"},
+                "spec": {"replicas": "${{REPLICAS}}", "paused": "${{PAUSED}}"},
+            }
+        ],
+        [{"name": "REPLICAS", "value": "1"}, {"name": "PAUSED", "value": "false"}],
+    )
+
+    objects = process_template(t, {"REPLICAS": 3})
+
+    assert objects[0]["spec"] == {"replicas": 3, "paused": False}
+
+
+# values and the result of substituting them as ${{A}} with oc process
+@pytest.mark.parametrize(
+    "value,expected",
+    [
+        ("abc123", "abc123"),
+        ("not json", "not json"),
+        ("{broken", "{broken"),
+        ("1", 1),
+        ("1.5", 1.5),
+        ("true", True),
+        ("null", None),
+        ('{"a": [1]}', {"a": [1]}),
+        ('"quoted"', "quoted"),
+    ],
+)
+def test_process_template_non_string_parameter_values(value, expected):
+    t = template([config_map({"a": "${{A}}"})], [{"name": "A", "value": value}])
+
+    objects = process_template(t, {})
+
+    assert objects[0]["data"]["a"] == expected
+
+
+def test_process_template_required_parameter():
+    t = template([config_map({"a": "${A}"})], [{"name": "A", "required": True}])
+
+    with pytest.raises(TemplateProcessingError):
+        process_template(t, {})
+    assert process_template(t, {"A": "a"}) == [config_map({"a": "a"})]
+
+
+def test_process_template_generated_parameter():
+    t = template(
+        [config_map({"a": "${A}", "b": "${B}"})],
+        [
+            {"name": "A", "generate": "expression", "from": "[a-z0-9]{12}"},
+            {"name": "B", "generate": "expression", "from": "[a-z]{3}"},
+        ],
+    )
+
+    objects = process_template(t, {"B": "given"})
+
+    assert re.fullmatch(r"[a-z0-9]{12}", objects[0]["data"]["a"])
+    assert objects[0]["data"]["b"] == "given"
+
+
+def test_process_template_namespace():
+    t = template(
+        [config_map({}, namespace="hardcoded"), config_map({}, namespace="${NS}")],
+        [{"name": "NS", "value": "ns"}],
+    )
+
+    objects = process_template(t, {})
+
+    assert "namespace" not in objects[0]["metadata"]
+    assert objects[1]["metadata"]["namespace"] == "ns"
+
+
+def test_process_template_labels():
+    cm = config_map({})
+    cm["metadata"]["labels"] = {"app": "object", "keep": "me"}
+    t = template([cm], [{"name": "APP", "value": "tmpl"}], labels={"app": "${APP}"})
+
+    objects = process_template(t, {})
+
+    assert objects[0]["metadata"]["labels"] == {"app": "tmpl", "keep": "me"}
+
+
+def test_generate_expression_value():
+    value = generate_expression_value(r"pre-[A-Z]{4}-[\d]{2}")
+
+    assert re.fullmatch(r"pre-[A-Z]{4}-[0-9]{2}", value)
+
+
+def test_generate_expression_value_invalid_length():
+    with pytest.raises(TemplateProcessingError):
+        generate_expression_value("[a-z]{256}")
@@ -0,0 +1,130 @@
+import os
+import subprocess
+from collections import OrderedDict
+
+import pytest
+
+from reconcile.utils import promtool
+
+RULE_OK = {"groups": [{"name": "ok", "rules": [{"alert": "A", "expr": "up"}]}]}
+RULE_BAD = {"groups": [{"name": "bad", "rules": [{"alert": "B", "expr": "up("}]}]}
+
+
+def fake_check_rules(cmd, **kwargs):
+    """Behaves like promtool check rules, files containing 'up(' fail"""
+    if cmd == ["promtool", "--version"]:
+        return subprocess.CompletedProcess(cmd, 0, b"promtool, version 2.0.0", b"")
+    stdout = ""
+    stderr = ""
+    for path in cmd[3:]:
+        stdout += f"Checking {path}\n"
+        with open(path) as f:
+            if "up(" in f.read():
+                stderr += f"  FAILED:\n{path}: parse error\n"
+            else:
+                stdout += "  SUCCESS: 1 rules found\n\n"
+    if stderr:
+        raise subprocess.CalledProcessError(1, cmd, stdout.encode(), stderr.encode())
+    return subprocess.CompletedProcess(cmd, 0, stdout.encode(), b"")
+
+
+@pytest.fixture
+def run(mocker):
+    mocker.patch.object(promtool, "_results", OrderedDict())
+    mocker.patch.object(promtool, "PROMTOOL_CACHE_DIR", None)
+    promtool._promtool_version.cache_clear()
+    yield mocker.patch.object(promtool.subprocess, "run", side_effect=fake_check_rules)
+    promtool._promtool_version.cache_clear()
+
+
+def check_rules_calls(run):
+    return [c for c in run.call_args_list if c.args[0][1:3] == ["check", "rules"]]
+
+
+def test_check_rules_batches_files(run, mocker):
+    mocker.patch.object(promtool, "PROMTOOL_BATCH_SIZE", 2)
+    specs = [
+        {"groups": [{"name": str(i), "rules": [{"alert": "A", "expr": "up"}]}]}
+        for i in range(5)
+    ]
+
+    results = promtool.check_rules(specs)
+
+    assert all(results)
+    assert [len(c.args[0]) - 3 for c in check_rules_calls(run)] == [2, 2, 1]
+    assert "SUCCESS: 1 rules found" in results[0].message
+
+
+def test_check_rules_attributes_failures(run):
+    results = promtool.check_rules([RULE_OK, RULE_BAD, RULE_OK])
+
+    assert [bool(r) for r in results] == [True, False, True]
+    assert "parse error" in results[1].message
+    # the failed file is checked again on its own for its message
+    assert [len(c.args[0]) - 3 for c in check_rules_calls(run)] == [2, 1]
+
+
+def test_check_rules_cached_by_content(run):
+    promtool.check_rules([RULE_OK, RULE_BAD])
+    run.reset_mock()
+
+    results = promtool.check_rules([RULE_BAD, RULE_OK, RULE_OK])
+
+    assert [bool(r) for r in results] == [False, True, True]
+    assert check_rules_calls(run) == []
+
+
+def test_check_rules_results_cache_bounded(run, mocker):
+    mocker.patch.object(promtool, "PROMTOOL_RESULTS_CACHE_SIZE", 1)
+
+    results = promtool.check_rules([RULE_OK, RULE_BAD])
+
+    assert [bool(r) for r in results] == [True, False]
+    assert len(promtool._results) == 1
+
+
+def test_check_rules_persistent_cache(run, mocker, tmp_path):
+    mocker.patch.object(promtool, "PROMTOOL_CACHE_DIR", str(tmp_path))
+    promtool.check_rules([RULE_BAD])
+    mocker.patch.object(promtool, "_results", OrderedDict())
+    run.reset_mock()
+
+    results = promtool.check_rules([RULE_BAD])
+
+    assert not results[0]
+    assert "parse error" in results[0].message
+    assert check_rules_calls(run) == []
+
+
+def test_check_rules_persistent_cache_bounded(run, mocker, tmp_path):
+    mocker.patch.object(promtool, "PROMTOOL_CACHE_DIR", str(tmp_path))
+    mocker.patch.object(promtool, "PROMTOOL_CACHE_DIR_MAX_FILES", 1)
+    old = tmp_path / "old.json"
+    old.write_text('{"is_ok": true, "message": ""}')
+    os.utime(old, (0, 0))
+
+    promtool.check_rules([RULE_BAD])
+
+    assert not old.exists()
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_check_rules_cache_depends_on_promtool_version(run):
+    promtool.check_rules([RULE_OK])
+    promtool._promtool_version.cache_clear()
+    run.side_effect = lambda cmd, **kwargs: (
+        subprocess.CompletedProcess(cmd, 0, b"promtool, version 2.1.0", b"")
+        if cmd == ["promtool", "--version"]
+        else fake_check_rules(cmd, **kwargs)
+    )
+    run.reset_mock()
+
+    assert promtool.check_rule(RULE_OK)
+    assert len(check_rules_calls(run)) == 1
+
+
+def test_run_tests_missing_rule_file(run):
+    result = promtool.run_test({"rule_files": ["missing.yml"]}, {})
+
+    assert not result
+    assert result.message == "missing.yml not in rule_files dict"
@@ -0,0 +1,96 @@
+from collections import OrderedDict
+
+import pytest
+import requests
+
+from reconcile.utils import raw_github_api
+from reconcile.utils.raw_github_api import (
+    GithubGraphQLError,
+    RawGithubApi,
+)
+
+
+def response(mocker, status_code=200, json=None, headers=None):
+    res = mocker.Mock(spec=requests.Response)
+    res.status_code = status_code
+    res.json.return_value = json
+    res.headers = headers or {}
+    res.links = {}
+    return res
+
+
+@pytest.fixture(autouse=True)
+def etag_cache(mocker):
+    return mocker.patch.object(RawGithubApi, "_etag_cache", OrderedDict())
+
+
+def test_query_conditional_request(mocker):
+    get = mocker.patch("reconcile.utils.raw_github_api.requests.get")
+    get.side_effect = [
+        response(mocker, json=[{"login": "user1"}], headers={"ETag": '"abc"'}),
+        response(mocker, status_code=304),
+    ]
+    api = RawGithubApi("token")
+
+    assert api.org_invitations("org") == ["user1"]
+    assert api.org_invitations("org") == ["user1"]
+
+    assert "If-None-Match" not in get.call_args_list[0].kwargs["headers"]
+    assert get.call_args_list[1].kwargs["headers"]["If-None-Match"] == '"abc"'
+
+
+def test_query_etag_cache_bounded(mocker, etag_cache):
+    mocker.patch.object(raw_github_api, "RAW_GITHUB_API_ETAG_CACHE_SIZE", 1)
+    get = mocker.patch("reconcile.utils.raw_github_api.requests.get")
+    get.side_effect = [
+        response(mocker, json=[{"login": "user1"}], headers={"ETag": '"abc"'}),
+        response(mocker, json=[{"login": "user2"}], headers={"ETag": '"def"'}),
+    ]
+    api = RawGithubApi("token")
+
+    api.org_invitations("org1")
+    api.org_invitations("org2")
+
+    assert list(etag_cache.values()) == [('"def"', [{"login": "user2"}], {})]
+    assert all("token" not in key for key in etag_cache)
+
+
+def test_org_teams_paginated(mocker):
+    page_info = {"hasNextPage": False, "endCursor": None}
+    team = {
+        "name": "Team 1",
+        "slug": "team-1",
+        "members": {
+            "pageInfo": {"hasNextPage": True, "endCursor": "m1"},
+            "nodes": [{"login": "user1"}],
+        },
+        "invitations": {
+            "pageInfo": page_info,
+            "nodes": [{"invitee": {"login": "user3"}}, {"invitee": None}],
+        },
+    }
+    graphql = mocker.patch.object(RawGithubApi, "graphql", autospec=True)
+    graphql.side_effect = [
+        {"organization": {"teams": {"pageInfo": page_info, "nodes": [team]}}},
+        {
+            "organization": {
+                "team": {
+                    "members": {"pageInfo": page_info, "nodes": [{"login": "user2"}]}
+                }
+            }
+        },
+    ]
+
+    teams = RawGithubApi("token").org_teams("org")
+
+    assert teams == {"Team 1": ["user1", "user2", "user3"]}
+    assert graphql.call_args.args[2] == {"org": "org", "slug": "team-1", "cursor": "m1"}
+
+
+def test_graphql_errors(mocker):
+    post = mocker.patch("reconcile.utils.raw_github_api.requests.post")
+    post.return_value = response(mocker, json={"errors": [{"message": "boom"}]})
+    mocker.patch("sretoolbox.utils.retry.time.sleep")
+
+    with pytest.raises(GithubGraphQLError):
+        RawGithubApi("token").graphql("query { viewer { login } }")
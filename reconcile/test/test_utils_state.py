@@ -1,8 +1,11 @@
+import json
+
 import boto3
 import pytest
 from botocore.errorfactory import ClientError
 from moto import mock_s3
 
+from reconcile.utils import state as state_module
 from reconcile.utils.state import (
     State,
     StateInaccessibleException,
@@ -169,3 +172,130 @@ def test_exists_for_forbidden(accounts, s3_client, mocker):
 
     with pytest.raises(StateInaccessibleException, match=r".*403.*"):
         state.exists("some-key")
+
+
+@pytest.fixture
+def snapshot_state(accounts, s3_client, mocker):
+    mocker.patch.object(state_module, "_fetched_values", {})
+    s3_client.create_bucket(Bucket="some-bucket")
+    for key, value in [("a", 1), ("nested/b", {"x": 2}), ("invalid", "{")]:
+        body = value if isinstance(value, str) else json.dumps(value)
+        s3_client.put_object(
+            Bucket="some-bucket", Key=f"state/integration/{key}", Body=body
+        )
+
+    mock_aws_api = mocker.patch("reconcile.utils.state.AWSApi", autospec=True)
+    mock_aws_api.return_value.get_session.return_value.client.return_value = s3_client
+    state = State("integration", accounts)
+    get_object = mocker.spy(s3_client, "get_object")
+    return state, get_object
+
+
+def test_snapshot_serves_reads(snapshot_state, mocker):
+    state, get_object = snapshot_state
+
+    with state.snapshot():
+        assert get_object.call_count == 3
+        head_object = mocker.spy(state.client, "head_object")
+        assert state["a"] == 1
+        assert state.get("missing", None) is None
+        assert state.exists("invalid")
+        assert state.get("invalid", "default") == "default"
+        assert state.get_all("nested") == {"b": {"x": 2}}
+        assert state.ls() == ["/a", "/invalid", "/nested/b"]
+
+    assert get_object.call_count == 3
+    head_object.assert_not_called()
+
+
+def test_snapshot_buffers_writes(snapshot_state, s3_client):
+    state, _ = snapshot_state
+
+    with state.snapshot():
+        state["c"] = (1, 2)
+        state.add("d", "value")
+        state.rm("a")
+        assert state["c"] == [1, 2]
+        assert not state.exists("a")
+        assert "Contents" in s3_client.list_objects_v2(
+            Bucket="some-bucket", Prefix="state/integration/a"
+        )
+
+    assert state["c"] == [1, 2]
+    assert state["d"] == "value"
+    assert not state.exists("a")
+
+
+def test_snapshot_refetches_changed_values_only(snapshot_state, s3_client):
+    state, get_object = snapshot_state
+    with state.snapshot():
+        pass
+    s3_client.put_object(
+        Bucket="some-bucket", Key="state/integration/a", Body=json.dumps(3)
+    )
+    get_object.reset_mock()
+
+    with state.snapshot():
+        assert state["a"] == 3
+        assert state["nested/b"] == {"x": 2}
+
+    assert [c.kwargs["Key"] for c in get_object.call_args_list] == [
+        "state/integration/a"
+    ]
+
+
+def test_get_all_lists_path_only(snapshot_state, s3_client, mocker):
+    state, get_object = snapshot_state
+    s3_client.put_object(
+        Bucket="some-bucket", Key="state/integration/nested/c", Body=json.dumps(3)
+    )
+    list_objects = mocker.spy(s3_client, "list_objects_v2")
+
+    assert state.get_all("nested", thread_pool_size=2) == {"b": {"x": 2}, "c": 3}
+    assert list_objects.call_args.kwargs["Prefix"] == "state/integration/nested"
+    assert get_object.call_count == 2
+    # only snapshots remember values
+    assert state_module._fetched_values == {}
+
+
+def test_iter_all_fetches_page_by_page(snapshot_state, mocker):
+    state, get_object = snapshot_state
+    mocker.patch.object(
+        state,
+        "_list_object_pages",
+        return_value=iter(
+            [
+                [{"Key": "state/integration/nested/b", "ETag": "1"}],
+                # deleted after it was listed
+                [{"Key": "state/integration/nested/gone", "ETag": "2"}],
+            ]
+        ),
+    )
+
+    items = state.iter_all("nested")
+
+    assert next(items) == ("b", {"x": 2})
+    assert get_object.call_count == 1
+    assert list(items) == []
+
+
+def test_get_all_invalid_value(snapshot_state):
+    state, _ = snapshot_state
+
+    with pytest.raises(KeyError):
+        state.get_all("")
+
+
+def test_prefetch_without_buffered_writes(snapshot_state, s3_client):
+    state, _ = snapshot_state
+
+    state.prefetch(buffer_writes=False)
+    state["c"] = 1
+    state.rm("a")
+
+    assert state["c"] == 1
+    keys = [
+        o["Key"] for o in s3_client.list_objects_v2(Bucket="some-bucket")["Contents"]
+    ]
+    assert "state/integration/c" in keys
+    assert "state/integration/a" not in keys
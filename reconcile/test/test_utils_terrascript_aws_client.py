@@ -274,3 +274,31 @@ def test_terraform_state_when_not_present_error(ts):
         )
     except ValueError:
         pass
+
+
+def test_init_populate_specs_prefetches_resources(ts, mocker):
+    get_api = mocker.patch("reconcile.utils.gql.get_api", autospec=True)
+    get_resources = get_api.return_value.get_resources
+    get_resources.return_value = {
+        "/defaults.yml": {"path": "/defaults.yml", "content": "a: b"},
+        "/pg.yml": tsclient.gql.GqlGetResourceError("/pg.yml", "not found"),
+    }
+    p = "aws"
+    pa = {"name": "a"}
+    ra = {
+        "identifier": "a",
+        "provider": "rds",
+        "defaults": "/defaults.yml",
+        "parameter_group": "/pg.yml",
+    }
+    ns1 = {
+        "name": "ns1",
+        "managedExternalResources": True,
+        "externalResources": [{"provider": p, "provisioner": pa, "resources": [ra]}],
+        "cluster": {"name": "c"},
+    }
+    ts.init_populate_specs([ns1], None)
+
+    assert set(get_resources.call_args[0][0]) == {"/defaults.yml", "/pg.yml"}
+    assert ts.get_values("/defaults.yml") == {"a": "b"}
+    assert "/pg.yml" not in ts._resource_cache
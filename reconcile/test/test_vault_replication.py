@@ -357,7 +357,7 @@ def test_deep_copy_versions_exception(
 def test_copy_vault_secret_forbidden_access(mocker):
     dry_run = True
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
-    vault_client.read_all_with_version.side_effect = SecretAccessForbidden()
+    vault_client.read_current_version.side_effect = SecretAccessForbidden()
 
     with pytest.raises(SecretAccessForbidden):
         integ.copy_vault_secret(
@@ -368,11 +368,26 @@ def test_copy_vault_secret_forbidden_access(mocker):
         )
 
 
+def test_copy_vault_secret_no_versions(mocker):
+    vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
+    vault_client.read_current_version.side_effect = SecretNotFound()
+    deep_copy_versions = mocker.patch(
+        "reconcile.vault_replication.deep_copy_versions", autospec=True
+    )
+
+    integ.copy_vault_secret(
+        dry_run=False, source_vault=vault_client, dest_vault=vault_client, path="path"
+    )
+    vault_client.read_current_version.assert_called_once_with("path")
+    deep_copy_versions.assert_not_called()
+    vault_client.write.assert_not_called()
+
+
 def test_copy_vault_secret_not_found_v2(mocker):
     dry_run = True
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
 
-    vault_client.read_all_with_version.side_effect = [["secret", 2], SecretNotFound()]
+    vault_client.read_current_version.side_effect = [2, SecretNotFound()]
     deep_copy_versions = mocker.patch(
         "reconcile.vault_replication.deep_copy_versions", autospec=True
     )
@@ -380,18 +395,25 @@ def test_copy_vault_secret_not_found_v2(mocker):
     integ.copy_vault_secret(
         dry_run=dry_run, source_vault=vault_client, dest_vault=vault_client, path="path"
     )
-    vault_client.read_all_with_version.assert_called()
-    deep_copy_versions.assert_called()
+    vault_client.read_all_with_version.assert_not_called()
+    deep_copy_versions.assert_called_once_with(
+        dry_run=dry_run,
+        source_vault=vault_client,
+        dest_vault=vault_client,
+        current_dest_version=0,
+        current_source_version=2,
+        path="path",
+    )
 
 
 @pytest.mark.parametrize("dry_run, path", [[False, "path"], [True, "path"]])
 def test_copy_vault_secret_not_found_v1(dry_run, path, mocker):
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
 
+    vault_client.read_current_version.return_value = None
     vault_client.read_all_with_version.side_effect = [
         ["secret", None],
         SecretNotFound(),
-        ["secret", None],
     ]
     deep_copy_versions = mocker.patch(
         "reconcile.vault_replication.deep_copy_versions", autospec=True
@@ -400,23 +422,21 @@ def test_copy_vault_secret_not_found_v1(dry_run, path, mocker):
     integ.copy_vault_secret(
         dry_run=dry_run, source_vault=vault_client, dest_vault=vault_client, path="path"
     )
+    assert vault_client.read_all_with_version.call_count == 2
+    deep_copy_versions.assert_not_called()
     if not dry_run:
-        vault_client.read_all_with_version.assert_called()
         vault_client.write.assert_called_once_with(
-            {"path": path, "data": "secret"}, False, True
+            secret={"path": path, "data": "secret"}, decode_base64=False, force=True
         )
-        deep_copy_versions.assert_not_called()
     else:
-        vault_client.read_all_with_version.assert_called()
         vault_client.write.assert_not_called()
-        deep_copy_versions.assert_not_called()
 
 
 def test_copy_vault_secret_found_v2(mocker):
     dry_run = True
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
 
-    vault_client.read_all_with_version.side_effect = [["secret", 2], ["secret", 1]]
+    vault_client.read_current_version.side_effect = [2, 1]
     deep_copy_versions = mocker.patch(
         "reconcile.vault_replication.deep_copy_versions", autospec=True
     )
@@ -424,9 +444,14 @@ def test_copy_vault_secret_found_v2(mocker):
     integ.copy_vault_secret(
         dry_run=dry_run, source_vault=vault_client, dest_vault=vault_client, path="path"
     )
-    vault_client.read_all_with_version.assert_called()
+    vault_client.read_all_with_version.assert_not_called()
     deep_copy_versions.assert_called_once_with(
-        dry_run, vault_client, vault_client, 1, 2, "path"
+        dry_run=dry_run,
+        source_vault=vault_client,
+        dest_vault=vault_client,
+        current_dest_version=1,
+        current_source_version=2,
+        path="path",
     )
 
 
@@ -434,7 +459,7 @@ def test_copy_vault_secret_found_same_version_v2(mocker):
     dry_run = True
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
 
-    vault_client.read_all_with_version.side_effect = [["secret", 2], ["secret", 2]]
+    vault_client.read_current_version.side_effect = [2, 2]
     deep_copy_versions = mocker.patch(
         "reconcile.vault_replication.deep_copy_versions", autospec=True
     )
@@ -442,21 +467,19 @@ def test_copy_vault_secret_found_same_version_v2(mocker):
     integ.copy_vault_secret(
         dry_run=dry_run, source_vault=vault_client, dest_vault=vault_client, path="path"
     )
-    vault_client.read_all_with_version.assert_called()
+    vault_client.read_all_with_version.assert_not_called()
     deep_copy_versions.assert_not_called()
 
 
-@pytest.mark.parametrize(
-    "dry_run, path, return_values",
-    [
-        [False, "path", [["secret2", None], ["secret", None], ["secret", None]]],
-        [True, "path", [["secret2", None], ["secret", None], ["secret", None]]],
-    ],
-)
-def test_copy_vault_secret_found_v1(dry_run, path, return_values, mocker):
+@pytest.mark.parametrize("dry_run, path", [[False, "path"], [True, "path"]])
+def test_copy_vault_secret_found_v1(dry_run, path, mocker):
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
 
-    vault_client.read_all_with_version.side_effect = return_values
+    vault_client.read_current_version.return_value = None
+    vault_client.read_all_with_version.side_effect = [
+        ["secret2", None],
+        ["secret", None],
+    ]
     deep_copy_versions = mocker.patch(
         "reconcile.vault_replication.deep_copy_versions", autospec=True
     )
@@ -464,38 +487,43 @@ def test_copy_vault_secret_found_v1(dry_run, path, return_values, mocker):
     integ.copy_vault_secret(
         dry_run=dry_run, source_vault=vault_client, dest_vault=vault_client, path="path"
     )
+    deep_copy_versions.assert_not_called()
     if not dry_run:
-        vault_client.read_all_with_version.assert_called()
         vault_client.write.assert_called_once_with(
-            {"path": path, "data": "secret"}, False, True
+            secret={"path": path, "data": "secret2"}, decode_base64=False, force=True
         )
-        deep_copy_versions.assert_not_called()
     else:
-        vault_client.read_all_with_version.assert_called()
         vault_client.write.assert_not_called()
 
 
-@pytest.mark.parametrize(
-    "dry_run, path, return_values",
-    [
-        [False, "path", [["secret", None], ["secret", None], ["secret", None]]],
-        [True, "path", [["secret", None], ["secret", None], ["secret", None]]],
-    ],
-)
-def test_copy_vault_secret_found_v1_same_value(dry_run, path, return_values, mocker):
+@pytest.mark.parametrize("dry_run", [False, True])
+def test_copy_vault_secret_found_v1_same_value(dry_run, mocker):
     vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
 
-    vault_client.read_all_with_version.side_effect = return_values
+    vault_client.read_current_version.return_value = None
+    vault_client.read_all_with_version.side_effect = [
+        ["secret", None],
+        ["secret", None],
+    ]
 
     integ.copy_vault_secret(
         dry_run=dry_run, source_vault=vault_client, dest_vault=vault_client, path="path"
     )
-    if not dry_run:
-        vault_client.read_all_with_version.assert_called()
-        vault_client.write.assert_not_called()
-    else:
-        vault_client.read_all_with_version.assert_called()
-        vault_client.write.assert_not_called()
+    assert vault_client.read_all_with_version.call_count == 2
+    vault_client.write.assert_not_called()
+
+
+def test_copy_vault_secrets_once_per_path(mocker):
+    vault_client = mocker.patch("reconcile.utils.vault._VaultClient", autospec=True)
+    copy_vault_secret = mocker.patch(
+        "reconcile.vault_replication.copy_vault_secret", autospec=True
+    )
+
+    integ.copy_vault_secrets(
+        True, vault_client, vault_client, ["a", "b", "a"], thread_pool_size=2
+    )
+
+    assert sorted(c.args[3] for c in copy_vault_secret.call_args_list) == ["a", "b"]
 
 
 def test_get_policy_secret_list(mocker):
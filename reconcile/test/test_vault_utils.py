@@ -1,12 +1,15 @@
 import importlib
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import (
     MagicMock,
     patch,
 )
 
 import pytest
+from cryptography.fernet import Fernet
 
 from reconcile.utils import vault
 
@@ -45,3 +48,154 @@ class TestVaultUtils:
 
         with pytest.raises(SleepCalled):
             client._auto_refresh_client_auth()
+
+
+def test_list_all_keeps_tree_order(mocker):
+    tree = {
+        "secret/": ["a/", "b", "c/"],
+        "secret/a/": ["a1", "a2/"],
+        "secret/a/a2/": ["x"],
+        "secret/c/": ["c1"],
+    }
+    client = testVaultClient()
+    mocker.patch.object(client, "list", side_effect=lambda path: tree[path])
+
+    assert client.list_all("secret/", thread_pool_size=3) == [
+        "secret/a/a1",
+        "secret/a/a2/x",
+        "secret/b",
+        "secret/c/c1",
+    ]
+
+
+def test_read_current_version(mocker):
+    client = testVaultClient()
+    client._client = MagicMock()
+    mocker.patch.object(client, "_get_mount_version", return_value=2)
+    read_metadata = client._client.secrets.kv.v2.read_secret_metadata
+    read_metadata.return_value = {"data": {"current_version": 3}}
+
+    assert client.read_current_version("secret/path/to") == 3
+    read_metadata.assert_called_once_with(mount_point="secret", path="path/to")
+
+    read_metadata.side_effect = vault.InvalidPath()
+    with pytest.raises(vault.SecretNotFound):
+        client.read_current_version("secret/path/to")
+
+
+def test_read_current_version_v1(mocker):
+    client = testVaultClient()
+    client._client = MagicMock()
+    mocker.patch.object(client, "_get_mount_version", return_value=1)
+
+    assert client.read_current_version("secret/path/to") is None
+    client._client.secrets.kv.v2.read_secret_metadata.assert_not_called()
+
+
+CACHE_KEY = Fernet.generate_key().decode()
+
+
+@pytest.fixture
+def v2_client(mocker, tmp_path):
+    client = testVaultClient()
+    client._client = MagicMock()
+    client._secret_cache = vault.SecretCache(
+        "https://vault", 10, str(tmp_path), CACHE_KEY
+    )
+    client._reads = vault.SingleFlight()
+    read_version = client._client.secrets.kv.v2.read_secret_version
+    read_version.side_effect = lambda mount_point, path, version: {
+        "data": {"data": {"v": version}, "metadata": {"version": version or 5}}
+    }
+    return client
+
+
+def test_read_all_v2_cached(v2_client):
+    read_version = v2_client._client.secrets.kv.v2.read_secret_version
+
+    assert v2_client._read_all_v2("secret/a", 3) == ({"v": 3}, 3)
+    assert v2_client._read_all_v2("secret/a", "3") == ({"v": 3}, 3)
+    assert read_version.call_count == 1
+
+
+def test_read_all_v2_disk_cache_is_encrypted(v2_client, tmp_path):
+    v2_client._read_all_v2("secret/a", 3)
+    v2_client._read_all_v2("secret/a", vault.SECRET_VERSION_LATEST)
+
+    # only the pinned version is written to disk, and not in plain text
+    files = list(tmp_path.iterdir())
+    assert len(files) == 1
+    assert b'"v"' not in files[0].read_bytes()
+
+    # a new cache, e.g. in the next run, reads the entry from disk
+    v2_client._secret_cache = vault.SecretCache(
+        "https://vault", 10, str(tmp_path), CACHE_KEY
+    )
+    v2_client._client.secrets.kv.v2.read_secret_version.reset_mock()
+
+    assert v2_client._read_all_v2("secret/a", 3) == ({"v": 3}, 3)
+    v2_client._client.secrets.kv.v2.read_secret_version.assert_not_called()
+
+
+def test_read_all_v2_latest_invalidated_on_write(v2_client):
+    read_version = v2_client._client.secrets.kv.v2.read_secret_version
+    v2_client._read_all_v2("secret/a", vault.SECRET_VERSION_LATEST)
+
+    v2_client._write_v2("secret/a", {"v": "new"})
+    v2_client._read_all_v2("secret/a", vault.SECRET_VERSION_LATEST)
+
+    # the read before the write is answered from the cache
+    assert read_version.call_count == 2
+
+
+def test_single_flight_coalesces_concurrent_calls():
+    single_flight = vault.SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        leader = executor.submit(single_flight.do, "key", slow)
+        started.wait(5)
+        followers = [executor.submit(single_flight.do, "key", slow) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+
+        assert leader.result() == ("value", False)
+        assert [f.result() for f in followers] == [("value", True)] * 4
+    assert len(calls) == 1
+
+
+def test_secret_cache_prunes_disk_tier(tmp_path):
+    cache = vault.SecretCache("https://vault", 10, str(tmp_path), CACHE_KEY)
+    for version in ["1", "2", "3"]:
+        cache.set("secret/a", version, ({"v": version}, version))
+    paths = {v: cache._path("secret/a", v) for v in ["1", "2", "3"]}
+    os.utime(paths["1"], (0, 0))
+    os.utime(paths["2"], (time.time() - 10, time.time() - 10))
+
+    # the expired entry is removed, and the oldest one beyond max_size
+    cache = vault.SecretCache("https://vault", 1, str(tmp_path), CACHE_KEY)
+
+    assert [os.path.exists(paths[v]) for v in ["1", "2", "3"]] == [
+        False,
+        False,
+        True,
+    ]
+    assert cache.get("secret/a", "3") == ({"v": "3"}, "3")
+
+
+def test_secret_cache_ignores_expired_entries(tmp_path, mocker):
+    cache = vault.SecretCache("https://vault", 10, str(tmp_path), CACHE_KEY, ttl=60)
+    cache.set("secret/a", "1", ({"v": 1}, 1))
+    cache = vault.SecretCache("https://vault", 10, str(tmp_path), CACHE_KEY, ttl=60)
+    mocker.patch("time.time", return_value=time.time() + 120)
+
+    assert cache.get("secret/a", "1") is None
+    assert list(tmp_path.iterdir()) == []
@@ -56,7 +56,9 @@ def terrascript(accounts, secret, mocker):
     mock_secret_reader = mocker.patch(
         "reconcile.utils.terrascript_aws_client.SecretReader", autospec=True
     )
-    mock_secret_reader.return_value.read_all.return_value = secret
+    mock_secret_reader.return_value.read_all_many.return_value = {
+        ("path", None): secret
+    }
     return TerrascriptClient("", "", 1, accounts)
 
 
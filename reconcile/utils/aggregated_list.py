@@ -7,21 +7,32 @@ class RunnerException(Exception):
 
 
 class AggregatedList:
+    """
+    Groups of unique items by params. Items keep the order they were added
+    in and must be hashable, a set per group is kept next to the list of
+    items to check for existing items in constant time.
+    """
+
     def __init__(self):
         self._dict = {}
+        self._item_sets = {}
 
     def add(self, params, new_items):
         params_hash = self.hash_params(params)
 
         if self._dict.get(params_hash) is None:
             self._dict[params_hash] = {"params": params, "items": []}
+            self._item_sets[params_hash] = set()
 
         if not isinstance(new_items, list):
             new_items = [new_items]
 
+        items = self._dict[params_hash]["items"]
+        item_set = self._item_sets[params_hash]
         for item in new_items:
-            if item not in self._dict[params_hash]["items"]:
-                self._dict[params_hash]["items"].append(item)
+            if item not in item_set:
+                item_set.add(item)
+                items.append(item)
 
     def get(self, params):
         return self._dict[self.hash_params(params)]
@@ -55,11 +66,12 @@ class AggregatedList:
             left = self.get_by_params_hash(p)
             right = right_state.get_by_params_hash(p)
 
-            l_items = left["items"]
-            r_items = right["items"]
+            l_items = self._item_sets[p]
+            r_items = right_state._item_sets[p]
 
-            update_insert = [i for i in r_items if i not in l_items]
-            update_delete = [i for i in l_items if i not in r_items]
+            # iterate the lists to keep the order of the items
+            update_insert = [i for i in right["items"] if i not in l_items]
+            update_delete = [i for i in left["items"] if i not in r_items]
 
             if update_insert:
                 diff["update-insert"].append(
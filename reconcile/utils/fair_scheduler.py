@@ -0,0 +1,87 @@
+import functools
+from collections import (
+    Counter,
+    deque,
+)
+from collections.abc import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import (
+    Any,
+    Optional,
+)
+
+
+def run_fair(
+    func: Callable,
+    iterable: Iterable[Any],
+    key: Callable[[Any], Hashable],
+    thread_pool_size: int,
+    max_per_key: Optional[int] = None,
+    **kwargs: Any,
+) -> Iterator[tuple[int, Any]]:
+    """
+    Executes func for each item of iterable and yields (index, result)
+    tuples as the calls complete.
+
+    Items are grouped by key and dispatched round-robin across groups, so
+    that a group with many or slow items can not starve the others. At most
+    thread_pool_size calls run at the same time, and at most max_per_key
+    calls of the same group if it is set.
+
+    Like threaded.run, every item is executed even if calls raise. The
+    first exception raised by func is re-raised to the consumer once all
+    calls have finished, results of the other calls are yielded before.
+    """
+    queues: dict[Hashable, deque[tuple[int, Any]]] = {}
+    for index, item in enumerate(iterable):
+        queues.setdefault(key(item), deque()).append((index, item))
+
+    rotation = deque(queues.keys())
+    running: Counter[Hashable] = Counter()
+    func_partial = functools.partial(func, **kwargs)
+    error: Optional[BaseException] = None
+
+    with ThreadPoolExecutor(max_workers=thread_pool_size) as executor:
+        futures: dict[Future, tuple[int, Hashable]] = {}
+
+        def dispatch() -> None:
+            while len(futures) < thread_pool_size:
+                for _ in range(len(rotation)):
+                    k = rotation[0]
+                    rotation.rotate(-1)
+                    if max_per_key and running[k] >= max_per_key:
+                        continue
+                    index, item = queues[k].popleft()
+                    if not queues[k]:
+                        rotation.remove(k)
+                    running[k] += 1
+                    futures[executor.submit(func_partial, item)] = (index, k)
+                    break
+                else:
+                    # nothing left to dispatch or all groups are at their limit
+                    return
+
+        dispatch()
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, k = futures.pop(future)
+                running[k] -= 1
+                exception = future.exception()
+                if exception is None:
+                    yield index, future.result()
+                elif error is None:
+                    error = exception
+            dispatch()
+    if error is not None:
+        raise error
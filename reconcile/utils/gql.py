@@ -1,5 +1,14 @@
+import atexit
 import logging
+import os
+import queue
 import textwrap
+import threading
+from collections.abc import (
+    Iterable,
+    Iterator,
+)
+from contextlib import contextmanager
 from datetime import (
     datetime,
     timezone,
@@ -7,6 +16,7 @@ from datetime import (
 from typing import (
     Any,
     Optional,
+    Union,
 )
 from urllib.parse import urlparse
 
@@ -23,9 +33,21 @@ from sretoolbox.utils import retry
 
 from reconcile.status import RunningState
 from reconcile.utils.config import get_config
+from reconcile.utils.gql_query_cache import get_query_cache
+from reconcile.utils.metrics import (
+    gql_transport_created,
+    gql_transport_reused,
+)
 
 _gqlapi = None
 
+INTEGRATION_NAME = os.getenv("INTEGRATION_NAME", "")
+
+# Number of idle clients (and thus open HTTP sessions) kept per endpoint.
+# Thread pools larger than this still work, the surplus clients are simply
+# closed when they are handed back.
+GQL_CLIENT_POOL_SIZE = int(os.getenv("GQL_CLIENT_POOL_SIZE", 20))
+
 INTEGRATIONS_QUERY = """
 {
     integrations: integrations_v1 {
@@ -86,6 +108,8 @@ class GqlGetResourceError(Exception):
 
 
 class GqlApi:
+    RESOURCES_BATCH_SIZE = 50
+
     _valid_schemas: list[str] = []
     _queried_schemas: set[Any] = set()
 
@@ -104,6 +128,7 @@ class GqlApi:
         self.validate_schemas = validate_schemas
         self.commit = commit
         self.commit_timestamp = commit_timestamp
+        self.sha = _get_bundle_sha(url)
 
         if validate_schemas and not int_name:
             raise Exception(
@@ -125,26 +150,15 @@ class GqlApi:
     def query(
         self, query: str, variables=None, skip_validation=False
     ) -> Optional[dict[str, Any]]:
-
-        # Here we are recreating client on purpose as some integrations such as `openshift-resource` require multiple
-        # queries in separate threads. With RequestsHTTPTransport that is currently not possible as it expects
-        # session to be reused and thus throws `Transport is already connected` error.
-        # Adding a synchronization mechanism would lead to increase wait time given some of our integrations are not
-        # sharded and thread pool capacity is also large for those.
-        # Hence, we are recreating client for every query.
-        client = _init_gql_client(self.url, self.token)
-        try:
-            result = client.execute(
-                gql(query), variables, get_execution_result=True
-            ).formatted
-        except requests.exceptions.ConnectionError as e:
-            raise GqlApiError("Could not connect to GraphQL server ({})".format(e))
-        except TransportQueryError as e:
-            raise GqlApiError("`error` returned with GraphQL response {}".format(e))
-        except AssertionError:
-            raise GqlApiError("`data` field missing from GraphQL response payload")
-        except Exception as e:
-            raise GqlApiError("Unexpected error occurred") from e
+        # results are immutable for a pinned bundle sha
+        cache = get_query_cache() if self.sha else None
+        result = None
+        if cache and self.sha:
+            result = cache.get(self.sha, query, variables)
+        if result is None:
+            result = self._execute(query, variables)
+            if cache and self.sha and result.get("data") is not None:
+                cache.set(self.sha, query, variables, result)
 
         # show schemas if log level is debug
         query_schemas = result.get("extensions", {}).get("schemas", [])
@@ -167,6 +181,26 @@ class GqlApi:
 
         return result["data"]
 
+    def _execute(self, query: str, variables=None):
+        # A RequestsHTTPTransport can only serve one query at a time, but
+        # integrations such as `openshift-resources` run queries from many
+        # threads. Each query checks out a client from a pool for the
+        # duration of the request, so that concurrent queries never share a
+        # transport, while sequential ones reuse its keep-alive session.
+        try:
+            with get_client_pool(self.url, self.token).client(self.url) as client:
+                return client.execute(
+                    gql(query), variables, get_execution_result=True
+                ).formatted
+        except requests.exceptions.ConnectionError as e:
+            raise GqlApiError("Could not connect to GraphQL server ({})".format(e))
+        except TransportQueryError as e:
+            raise GqlApiError("`error` returned with GraphQL response {}".format(e))
+        except AssertionError:
+            raise GqlApiError("`data` field missing from GraphQL response payload")
+        except Exception as e:
+            raise GqlApiError("Unexpected error occurred") from e
+
     def get_resource(self, path: str) -> dict[str, Any]:
         query = """
         query Resource($path: String) {
@@ -184,14 +218,72 @@ class GqlApi:
             resources = self.query(query, {"path": path}, skip_validation=True)[
                 "resources"
             ]
-        except GqlApiError:
-            raise GqlGetResourceError(path, "Resource not found.")
+        except GqlApiError as e:
+            raise GqlGetResourceError(path, f"Resource not found. {e}") from e
 
         if len(resources) != 1:
             raise GqlGetResourceError(path, "Expecting one and only one resource.")
 
         return resources[0]
 
+    def get_resources(
+        self, paths: Iterable[str], return_errors: bool = False
+    ) -> dict[str, Union[dict[str, Any], GqlGetResourceError]]:
+        """Return resources (resources_v1) for many paths at once.
+
+        Paths are fetched in batches of RESOURCES_BATCH_SIZE aliased
+        fields per query instead of one query per path.
+
+        :param paths: paths of the resources to fetch
+        :param return_errors: if set, a path that could not be fetched is
+            mapped to its GqlGetResourceError instead of raising it
+        :return: mapping of path to resource
+        """
+        unique_paths = list(dict.fromkeys(paths))
+        results: dict[str, Union[dict[str, Any], GqlGetResourceError]] = {}
+        for i in range(0, len(unique_paths), self.RESOURCES_BATCH_SIZE):
+            batch = unique_paths[i : i + self.RESOURCES_BATCH_SIZE]
+            results.update(self._get_resources_batch(batch))
+
+        if not return_errors:
+            for result in results.values():
+                if isinstance(result, GqlGetResourceError):
+                    raise result
+        return results
+
+    def _get_resources_batch(
+        self, paths: list[str]
+    ) -> dict[str, Union[dict[str, Any], GqlGetResourceError]]:
+        variables = {f"path{i}": path for i, path in enumerate(paths)}
+        definitions = ", ".join(f"${v}: String" for v in variables)
+        fields = "\n".join(
+            f"r{i}: resources_v1 (path: ${v}) {{ path content sha256sum }}"
+            for i, v in enumerate(variables)
+        )
+        query = f"query Resources({definitions}) {{\n{fields}\n}}"
+
+        try:
+            # Do not validate schema in resources since schema support in the
+            # resources is not complete.
+            data = self.query(query, variables, skip_validation=True)
+        except GqlApiError as e:
+            # the query fails as a whole, also on connection or server errors
+            return {
+                path: GqlGetResourceError(path, f"Resource not found. {e}")
+                for path in paths
+            }
+
+        results: dict[str, Union[dict[str, Any], GqlGetResourceError]] = {}
+        for i, path in enumerate(paths):
+            resources = data[f"r{i}"]
+            if len(resources) != 1:
+                results[path] = GqlGetResourceError(
+                    path, "Expecting one and only one resource."
+                )
+            else:
+                results[path] = resources[0]
+        return results
+
     def get_resources_by_schema(self, schema: str) -> list[dict[str, str]]:
         """Return all resources (resources_v1) filtered by given schema."""
         query = """
@@ -246,13 +338,127 @@ def get_resource(path: str) -> dict[str, Any]:
     return get_api().get_resource(path)
 
 
+def get_resources(
+    paths: Iterable[str], return_errors: bool = False
+) -> dict[str, Union[dict[str, Any], GqlGetResourceError]]:
+    return get_api().get_resources(paths, return_errors=return_errors)
+
+
+class PersistentRequestsHTTPTransport(RequestsHTTPTransport):
+    """RequestsHTTPTransport that keeps its HTTP session open.
+
+    `Client.execute` connects and closes the transport around every single
+    query, which means a new TCP/TLS connection each time. This transport
+    only opens a session on the first connect and keeps it (and its
+    keep-alive connection pool) around until `shutdown` is called.
+    """
+
+    def connect(self) -> None:
+        if self.session is None:
+            super().connect()
+            gql_transport_created.labels(integration=INTEGRATION_NAME).inc()
+        else:
+            gql_transport_reused.labels(integration=INTEGRATION_NAME).inc()
+
+    def close(self) -> None:
+        # called by Client.execute after every query, see connect()
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+class GqlClientPool:
+    """Bounded pool of gql clients for a single server.
+
+    A client is handed out to exactly one thread at a time. Clients are
+    created on demand and at most `size` idle clients are kept around.
+    Clients can be pointed to any endpoint of the server, e.g. to the
+    /graphqlsha/<sha> of a new bundle, and keep their sessions meanwhile.
+    """
+
+    def __init__(self, url: str, token: Optional[str], size: int) -> None:
+        self.url = url
+        self.token = token
+        self._idle: queue.LifoQueue[Client] = queue.LifoQueue(maxsize=size)
+
+    @contextmanager
+    def client(self, url: Optional[str] = None) -> Iterator[Client]:
+        try:
+            client = self._idle.get_nowait()
+        except queue.Empty:
+            client = _init_gql_client(self.url, self.token)
+        if isinstance(client.transport, RequestsHTTPTransport):
+            client.transport.url = url or self.url
+        try:
+            yield client
+        except Exception:
+            # the connection may be in an undefined state after an error
+            _shutdown_gql_client(client)
+            raise
+        try:
+            self._idle.put_nowait(client)
+        except queue.Full:
+            _shutdown_gql_client(client)
+
+    def close(self) -> None:
+        while True:
+            try:
+                _shutdown_gql_client(self._idle.get_nowait())
+            except queue.Empty:
+                return
+
+
+_client_pools: dict[tuple[str, Optional[str]], GqlClientPool] = {}
+_client_pools_lock = threading.Lock()
+
+
+def get_client_pool(url: str, token: Optional[str]) -> GqlClientPool:
+    # pools are shared by all endpoints of a server, so that pinning
+    # another bundle sha does not create a new pool
+    origin = urlparse(url)._replace(path="", params="", query="", fragment="")
+    key = (origin.geturl(), token)
+    with _client_pools_lock:
+        pool = _client_pools.get(key)
+        if pool is None:
+            pool = GqlClientPool(url, token, GQL_CLIENT_POOL_SIZE)
+            _client_pools[key] = pool
+        return pool
+
+
+# pools are kept across integration runs in the same process
+@atexit.register
+def close_client_pools() -> None:
+    with _client_pools_lock:
+        pools = list(_client_pools.values())
+        _client_pools.clear()
+    for pool in pools:
+        pool.close()
+
+
+def _get_bundle_sha(url: str) -> Optional[str]:
+    """Returns the bundle sha if the url is pinned to /graphqlsha/<sha>"""
+    path = urlparse(url).path.strip("/").split("/")
+    if len(path) == 2 and path[0] == "graphqlsha":
+        return path[1]
+    return None
+
+
 def _init_gql_client(url: str, token: Optional[str]) -> Client:
     req_headers = None
     if token:
         # The token stored in vault is already in the format 'Basic ...'
         req_headers = {"Authorization": token}
     # Here we are explicitly using sync strategy
-    return Client(transport=RequestsHTTPTransport(url, headers=req_headers, timeout=30))
+    return Client(
+        transport=PersistentRequestsHTTPTransport(url, headers=req_headers, timeout=30)
+    )
+
+
+def _shutdown_gql_client(client: Client) -> None:
+    transport = client.transport
+    if isinstance(transport, PersistentRequestsHTTPTransport):
+        transport.shutdown()
 
 
 @retry(exceptions=requests.exceptions.HTTPError, max_attempts=5)
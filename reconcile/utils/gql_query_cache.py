@@ -0,0 +1,177 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Optional,
+)
+
+from reconcile.utils.metrics import (
+    gql_query_cache_hits,
+    gql_query_cache_misses,
+)
+
+INTEGRATION_NAME = os.getenv("INTEGRATION_NAME", "")
+
+# Total bytes of serialized query results kept in memory, 0 disables the cache
+GQL_QUERY_CACHE_MAX_BYTES = int(os.getenv("GQL_QUERY_CACHE_MAX_BYTES", 64 * 1024**2))
+# Directory for the on-disk tier, disabled if not set
+GQL_QUERY_CACHE_DIR = os.getenv("GQL_QUERY_CACHE_DIR")
+# Number of bundle shas the on-disk tier keeps entries for
+GQL_QUERY_CACHE_SHAS = int(os.getenv("GQL_QUERY_CACHE_SHAS", 3))
+
+
+class GqlQueryCache:
+    """Cache for results of GraphQL queries against a pinned bundle.
+
+    A bundle is immutable for a given sha, so are all query results for
+    it. Entries are keyed by (sha, query, variables) and kept in an
+    in-memory LRU of at most max_bytes serialized bytes. If a cache directory is given, entries are also
+    written to disk so they survive process restarts. Only the entries of
+    the max_shas most recently written shas are kept on disk.
+
+    Results are stored serialized and deserialized on every hit, so
+    callers are free to mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        cache_dir: Optional[str] = None,
+        max_shas: int = GQL_QUERY_CACHE_SHAS,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.max_shas = max_shas
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._size = 0
+        self._written_shas: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(sha: str, query: str, variables: Optional[dict[str, Any]]) -> str:
+        content = json.dumps([sha, query, variables], sort_keys=True)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(
+        self, sha: str, query: str, variables: Optional[dict[str, Any]]
+    ) -> Optional[dict[str, Any]]:
+        key = self.key(sha, query, variables)
+        with self._lock:
+            serialized = self._entries.get(key)
+            if serialized is not None:
+                self._entries.move_to_end(key)
+        if serialized is not None:
+            gql_query_cache_hits.labels(
+                integration=INTEGRATION_NAME, tier="memory"
+            ).inc()
+            return json.loads(serialized)
+
+        serialized = self._read_file(sha, key)
+        if serialized is not None:
+            gql_query_cache_hits.labels(integration=INTEGRATION_NAME, tier="disk").inc()
+            self._remember(key, serialized)
+            return json.loads(serialized)
+
+        gql_query_cache_misses.labels(integration=INTEGRATION_NAME).inc()
+        return None
+
+    def set(
+        self,
+        sha: str,
+        query: str,
+        variables: Optional[dict[str, Any]],
+        result: dict[str, Any],
+    ) -> None:
+        key = self.key(sha, query, variables)
+        serialized = json.dumps(result)
+        self._remember(key, serialized)
+        self._write_file(sha, key, serialized)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key: str, serialized: str) -> None:
+        # serialized results are ascii only, so their length is their size
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            if len(serialized) > self.max_bytes:
+                return
+            self._entries[key] = serialized
+            self._size += len(serialized)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _path(self, sha: str, key: str) -> str:
+        assert self.cache_dir
+        return os.path.join(self.cache_dir, sha, f"{key}.json")
+
+    def _read_file(self, sha: str, key: str) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(sha, key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logging.debug(f"could not read gql cache entry {key}: {e}")
+            return None
+
+    def _write_file(self, sha: str, key: str, serialized: str) -> None:
+        if not self.cache_dir:
+            return
+        path = self._path(sha, key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self._lock:
+                new_sha = sha not in self._written_shas
+                self._written_shas.add(sha)
+            if new_sha:
+                self._prune_shas(sha)
+            # write to a temporary file first so that concurrent readers
+            # never see a partially written entry
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(serialized)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logging.debug(f"could not write gql cache entry {key}: {e}")
+
+    def _prune_shas(self, current_sha: str) -> None:
+        """Removes the entries of all but the most recently written shas."""
+        assert self.cache_dir
+        try:
+            entries = [e for e in os.scandir(self.cache_dir) if e.is_dir()]
+            entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        except OSError as e:
+            logging.debug(f"could not list gql cache directory: {e}")
+            return
+        old = [e for e in entries if e.name != current_sha]
+        for entry in old[max(self.max_shas - 1, 0) :]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+_query_cache: Optional[GqlQueryCache] = None
+_query_cache_lock = threading.Lock()
+
+
+def get_query_cache() -> Optional[GqlQueryCache]:
+    """Returns the process wide query cache or None if it is disabled."""
+    global _query_cache
+    if GQL_QUERY_CACHE_MAX_BYTES <= 0:
+        return None
+    with _query_cache_lock:
+        if _query_cache is None:
+            _query_cache = GqlQueryCache(GQL_QUERY_CACHE_MAX_BYTES, GQL_QUERY_CACHE_DIR)
+        return _query_cache
@@ -1,6 +1,10 @@
+import copy
+import hashlib
 import json
+import os
 import tempfile
 from collections.abc import Mapping
+from functools import lru_cache
 from subprocess import (
     PIPE,
     CalledProcessError,
@@ -10,20 +14,63 @@ from typing import Any
 
 import yaml
 
+CHART_PATH = "./helm/qontract-reconcile"
+
+# Number of rendered templates kept in memory, 0 disables the cache
+HELM_TEMPLATE_CACHE_SIZE = int(os.getenv("HELM_TEMPLATE_CACHE_SIZE", 128))
+
 
 class HelmTemplateError(Exception):
     pass
 
 
 def template(values: Mapping[str, Any]) -> Mapping[str, Any]:
+    """
+    Renders the qontract-reconcile chart with the given values.
+
+    Rendered templates are cached by the values and the content of the
+    chart, so helm is only run if either of them changed. The chart is
+    hashed once per process, it does not change at runtime.
+    """
+    values_json = json.dumps(values, sort_keys=True)
+    if HELM_TEMPLATE_CACHE_SIZE <= 0:
+        return _template(values_json)
+    return copy.deepcopy(_template_cached(values_json, _chart_sha256sum(CHART_PATH)))
+
+
+def chart_sha256sum(chart_path: str) -> str:
+    """Returns a hash over the names and contents of all files of a chart."""
+    m = hashlib.sha256()
+    for root, dirs, files in os.walk(chart_path):
+        dirs.sort()
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            m.update(os.path.relpath(path, chart_path).encode("utf-8"))
+            with open(path, "rb") as f:
+                m.update(f.read())
+    return m.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _chart_sha256sum(chart_path: str) -> str:
+    return chart_sha256sum(chart_path)
+
+
+@lru_cache(maxsize=max(HELM_TEMPLATE_CACHE_SIZE, 1))
+def _template_cached(values_json: str, chart_sha: str) -> Mapping[str, Any]:
+    # chart_sha is only part of the cache key
+    return _template(values_json)
+
+
+def _template(values_json: str) -> Mapping[str, Any]:
     try:
         with tempfile.NamedTemporaryFile(mode="w+") as values_file:
-            values_file.write(json.dumps(values))
+            values_file.write(values_json)
             values_file.flush()
             cmd = [
                 "helm",
                 "template",
-                "./helm/qontract-reconcile",
+                CHART_PATH,
                 "-n",
                 "qontract-reconcile",
                 "-f",
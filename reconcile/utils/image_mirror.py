@@ -0,0 +1,301 @@
+"""
+Shared execution of the work done by the image mirroring integrations.
+
+Comparing images and copying them is done on a bounded thread pool. Work
+is scheduled round-robin across the source registries with a limit of
+parallel requests per registry, so that a single registry is not hit too
+hard and its rate limits do not slow down the mirroring of other ones.
+
+Manifest responses are cached across runs, so that unchanged images are
+not fetched from the registries again.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Hashable,
+    Iterable,
+    Iterator,
+    MutableMapping,
+)
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Optional,
+    TypeVar,
+)
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from sretoolbox.container import (
+    Image,
+    Skopeo,
+)
+from sretoolbox.container.skopeo import SkopeoCmdError
+
+from reconcile.utils import metrics
+from reconcile.utils.fair_scheduler import run_fair
+
+_LOG = logging.getLogger(__name__)
+
+INTEGRATION_NAME = os.environ.get("INTEGRATION_NAME", "")
+
+MIRROR_THREAD_POOL_SIZE = int(os.environ.get("MIRROR_THREAD_POOL_SIZE", 10))
+# Maximum number of parallel compares or copies per source registry
+MIRROR_REGISTRY_CONCURRENCY = int(os.environ.get("MIRROR_REGISTRY_CONCURRENCY", 4))
+
+# Number of manifest responses kept in memory
+IMAGE_MANIFEST_CACHE_SIZE = int(os.environ.get("IMAGE_MANIFEST_CACHE_SIZE", 10000))
+# Seconds after which a cached manifest response is fetched again
+IMAGE_MANIFEST_CACHE_TTL = int(os.environ.get("IMAGE_MANIFEST_CACHE_TTL", 86400))
+# Directory for the on-disk tier, disabled if not set
+IMAGE_MANIFEST_CACHE_DIR = os.environ.get("IMAGE_MANIFEST_CACHE_DIR")
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class CopyTask:
+    src_image: str
+    dst_image: str
+    src_creds: Optional[str] = None
+    dest_creds: Optional[str] = None
+
+
+class ManifestCache(MutableMapping):
+    """
+    Cache for image manifest responses, to be passed as response_cache
+    to sretoolbox Images.
+
+    Images key their entries by manifest url (registry, repository and tag)
+    and user name, so entries are never shared between different
+    credentials. Entries expire after ttl seconds, and the least recently
+    used ones are evicted once max_size is reached. If a cache directory is
+    given, entries are also written to disk so they survive restarts, and
+    removed from it when they expire or are evicted.
+    """
+
+    def __init__(
+        self, max_size: int, ttl: int, cache_dir: Optional[str] = None
+    ) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self._entries: OrderedDict[
+            Hashable, tuple[float, requests.Response]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        self._remove_expired_files()
+
+    def __getitem__(self, key: Hashable) -> requests.Response:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self._expired(entry[0]):
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+                self._count_eviction("ttl")
+
+        entry = self._read_file(key)
+        if entry is None:
+            raise KeyError(key)
+        if self._expired(entry[0]):
+            self._remove_file(key)
+            raise KeyError(key)
+        self._remember(key, entry)
+        return entry[1]
+
+    def __setitem__(self, key: Hashable, response: requests.Response) -> None:
+        entry = (time.time(), response)
+        self._remember(key, entry)
+        self._write_file(key, entry)
+
+    def __delitem__(self, key: Hashable) -> None:
+        with self._lock:
+            del self._entries[key]
+        self._remove_file(key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, timestamp: float) -> bool:
+        return time.time() - timestamp > self.ttl
+
+    def _remember(self, key: Hashable, entry: tuple[float, requests.Response]) -> None:
+        evicted = []
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted.append(self._entries.popitem(last=False)[0])
+                self._count_eviction("size")
+        for evicted_key in evicted:
+            self._remove_file(evicted_key)
+
+    @staticmethod
+    def _count_eviction(reason: str) -> None:
+        metrics.image_manifest_cache_evictions.labels(
+            integration=INTEGRATION_NAME, reason=reason
+        ).inc()
+
+    def _path(self, key: Hashable) -> str:
+        assert self.cache_dir
+        name = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def _remove_file(self, key: Hashable) -> None:
+        if not self.cache_dir:
+            return
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _remove_expired_files(self) -> None:
+        # entries are written when they are stored, so the modification
+        # time of a file is the time of its entry
+        if not self.cache_dir:
+            return
+        try:
+            files = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for f in files:
+            try:
+                if f.is_file() and self._expired(f.stat().st_mtime):
+                    os.remove(f.path)
+                    self._count_eviction("ttl")
+            except OSError as e:
+                _LOG.debug(f"could not remove manifest cache entry: {e}")
+
+    def _read_file(self, key: Hashable) -> Optional[tuple[float, requests.Response]]:
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            _LOG.debug(f"could not read manifest cache entry: {e}")
+            return None
+        response = requests.Response()
+        response.status_code = data["status_code"]
+        response.headers = CaseInsensitiveDict(data["headers"])
+        response.url = data["url"]
+        response.encoding = data["encoding"]
+        response._content = base64.b64decode(data["content"])
+        return data["timestamp"], response
+
+    def _write_file(
+        self, key: Hashable, entry: tuple[float, requests.Response]
+    ) -> None:
+        if not self.cache_dir:
+            return
+        timestamp, response = entry
+        data = {
+            "timestamp": timestamp,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "url": response.url,
+            "encoding": response.encoding,
+            "content": base64.b64encode(response.content).decode("utf-8"),
+        }
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # write to a temporary file first so that concurrent readers
+            # never see a partially written entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            _LOG.debug(f"could not write manifest cache entry: {e}")
+
+
+def new_manifest_cache() -> ManifestCache:
+    return ManifestCache(
+        IMAGE_MANIFEST_CACHE_SIZE, IMAGE_MANIFEST_CACHE_TTL, IMAGE_MANIFEST_CACHE_DIR
+    )
+
+
+def registry(image_url: str) -> str:
+    return Image(str(image_url)).registry
+
+
+def run_per_registry(
+    func: Callable[[T], Any],
+    items: Iterable[T],
+    image_url: Callable[[T], str],
+    task: str,
+    thread_pool_size: int = MIRROR_THREAD_POOL_SIZE,
+    max_per_registry: int = MIRROR_REGISTRY_CONCURRENCY,
+) -> list[Any]:
+    """
+    Executes func for each item and returns the results in the order of
+    items. Items are scheduled by the registry of image_url(item) and the
+    duration of each call is recorded under the given task name.
+    """
+
+    def timed(item: T) -> Any:
+        start = time.monotonic()
+        try:
+            return func(item)
+        finally:
+            metrics.mirror_task_time.labels(
+                integration=INTEGRATION_NAME,
+                task=task,
+                registry=registry(image_url(item)),
+            ).observe(time.monotonic() - start)
+
+    results = dict(
+        run_fair(
+            timed,
+            items,
+            key=lambda item: registry(image_url(item)),
+            thread_pool_size=thread_pool_size,
+            max_per_key=max_per_registry,
+        )
+    )
+    return [results[i] for i in sorted(results)]
+
+
+def copy_images(
+    skopeo_cli: Skopeo,
+    tasks: Iterable[CopyTask],
+    thread_pool_size: int = MIRROR_THREAD_POOL_SIZE,
+    max_per_registry: int = MIRROR_REGISTRY_CONCURRENCY,
+) -> None:
+    """Copies images with skopeo, errors of single copies are logged."""
+
+    def copy(task: CopyTask) -> None:
+        try:
+            skopeo_cli.copy(
+                src_image=task.src_image,
+                src_creds=task.src_creds,
+                dst_image=task.dst_image,
+                dest_creds=task.dest_creds,
+            )
+        except SkopeoCmdError as details:
+            _LOG.error("skopeo command error message: '%s'", details)
+
+    run_per_registry(
+        copy,
+        tasks,
+        image_url=lambda task: task.src_image,
+        task="copy",
+        thread_pool_size=thread_pool_size,
+        max_per_registry=max_per_registry,
+    )
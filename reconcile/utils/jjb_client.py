@@ -7,7 +7,12 @@ import re
 import shutil
 import subprocess
 import tempfile
+import threading
 import xml.etree.ElementTree as et
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
 from os import path
 from subprocess import (
     PIPE,
@@ -24,13 +29,18 @@ from jenkins_jobs.builder import JenkinsManager
 from jenkins_jobs.errors import JenkinsJobsException
 from jenkins_jobs.parser import YamlParser
 from jenkins_jobs.registry import ModuleRegistry
-from sretoolbox.utils import retry
+from sretoolbox.utils import (
+    retry,
+    threaded,
+)
 
 from reconcile.utils import throughput
-from reconcile.utils.helpers import toggle_logger
 
 JJB_INI = "[jenkins]\nurl = https://JENKINS_URL"
 
+# Number of instances to generate job definitions for in parallel
+JJB_THREAD_POOL_SIZE = int(os.environ.get("JJB_THREAD_POOL_SIZE", 10))
+
 
 class JJB:  # pylint: disable=too-many-public-methods
     """Wrapper around Jenkins Jobs"""
@@ -89,6 +99,8 @@ class JJB:  # pylint: disable=too-many-public-methods
         self.instances = instances
         self.instance_urls = instance_urls
         self.working_dirs = working_dirs
+        self.job_indexes: dict[str, JobIndex] = {}
+        self._job_indexes_lock = threading.Lock()
 
     def overwrite_configs(self, configs):
         """This function will override the existing
@@ -98,6 +110,8 @@ class JJB:  # pylint: disable=too-many-public-methods
             config_path = "{}/config.yaml".format(wd)
             with open(config_path, "w") as f:
                 f.write(configs[name])
+        with self._job_indexes_lock:
+            self.job_indexes = {}
 
     def sort(self, configs):
         configs.sort(key=self.sort_by_name)
@@ -137,29 +151,47 @@ class JJB:  # pylint: disable=too-many-public-methods
 
         return configs
 
-    def generate(self, io_dir, fetch_state):
+    def generate(self, io_dir, fetch_state, thread_pool_size=JJB_THREAD_POOL_SIZE):
         """
         Generates job definitions from JJB configs
 
         :param io_dir: Input/output directory
         :param fetch_state: subdirectory to use ('desired' or 'current')
+        :param thread_pool_size: number of instances to generate in parallel
         """
-        for name, wd in self.working_dirs.items():
-            ini_path = "{}/{}.ini".format(wd, name)
-            config_path = "{}/config.yaml".format(wd)
+        threaded.run(
+            self._generate_instance,
+            self.working_dirs.items(),
+            thread_pool_size,
+            io_dir=io_dir,
+            fetch_state=fetch_state,
+        )
+        throughput.change_files_ownership(io_dir)
+
+    def _generate_instance(self, instance, io_dir, fetch_state):
+        name, wd = instance
+        ini_path = "{}/{}.ini".format(wd, name)
+        config_path = "{}/config.yaml".format(wd)
 
-            output_dir = path.join(io_dir, "jjb", fetch_state, name)
-            args = [
-                "--conf",
-                ini_path,
-                "test",
-                config_path,
-                "-o",
-                output_dir,
-                "--config-xml",
-            ]
-            self.execute(args)
-            throughput.change_files_ownership(io_dir)
+        output_dir = path.join(io_dir, "jjb", fetch_state, name)
+        # run in a separate process, parsing the configs is cpu bound
+        cmd = [
+            "jenkins-jobs",
+            "--conf",
+            ini_path,
+            "test",
+            config_path,
+            "-o",
+            output_dir,
+            "--config-xml",
+        ]
+        try:
+            subprocess.run(
+                cmd, check=True, stdout=PIPE, stderr=STDOUT, encoding="utf-8"
+            )
+        except CalledProcessError as ex:
+            logging.error(ex.stdout)
+            raise
 
     def print_diffs(self, io_dir, instance_name=None):
         """Print the diffs between the current and
@@ -248,11 +280,6 @@ class JJB:  # pylint: disable=too-many-public-methods
 
         return JenkinsJobs(args)
 
-    def execute(self, args):
-        jjb = self.get_jjb(args)
-        with toggle_logger():
-            jjb.execute()
-
     def modify_logger(self):
         yaml.warnings({"YAMLLoadWarning": False})
         formatter = logging.Formatter("%(levelname)s: %(message)s")
@@ -278,12 +305,19 @@ class JJB:  # pylint: disable=too-many-public-methods
 
         return jobs
 
+    def get_job_index(self, name: str) -> "JobIndex":
+        """Returns the expanded jobs of an instance, they are parsed only once"""
+        with self._job_indexes_lock:
+            index = self.job_indexes.get(name)
+            if index is None:
+                index = JobIndex(self.get_jobs(self.working_dirs[name], name))
+                self.job_indexes[name] = index
+            return index
+
     def get_job_webhooks_data(self):
         job_webhooks_data = {}
-        for name, wd in self.working_dirs.items():
-            jobs = self.get_jobs(wd, name)
-
-            for job in jobs:
+        for name in self.working_dirs:
+            for job in self.get_job_index(name).jobs:
                 try:
                     project_url_raw = job["properties"][0]["github"]["url"]
                     if "https://github.com" in project_url_raw:
@@ -308,21 +342,17 @@ class JJB:  # pylint: disable=too-many-public-methods
 
     def get_repos(self):
         repos = set()
-        for name, wd in self.working_dirs.items():
-            jobs = self.get_jobs(wd, name)
-            for job in jobs:
-                job_name = job["name"]
-                try:
-                    repos.add(self.get_repo_url(job))
-                except KeyError:
-                    logging.debug("missing github url: {}".format(job_name))
+        for name in self.working_dirs:
+            index = self.get_job_index(name)
+            repos.update(index.repo_urls)
+            for job_name in index.jobs_without_repo_url:
+                logging.debug("missing github url: {}".format(job_name))
         return repos
 
     def get_admins(self):
         admins = set()
-        for name, wd in self.working_dirs.items():
-            jobs = self.get_jobs(wd, name)
-            for j in jobs:
+        for name in self.working_dirs:
+            for j in self.get_job_index(name).jobs:
                 try:
                     admins_list = j["triggers"][0]["github-pull-request"]["admin-list"]
                     admins.update(admins_list)
@@ -347,33 +377,23 @@ class JJB:  # pylint: disable=too-many-public-methods
         if job_types is None:
             job_types = []
         all_jobs: dict[str, list[dict]] = {}
-        for name, wd in self.working_dirs.items():
+        for name in self.working_dirs:
             if instance_name and name != instance_name:
                 continue
             logging.debug(f"getting jobs from {name}")
-            all_jobs[name] = []
-            jobs = self.get_jobs(wd, name)
-            for job in jobs:
-                job_name = job["name"]
-                if not any(job_type in job_name for job_type in job_types):
-                    continue
-                if not include_test and "test" in job_name:
-                    continue
-                # temporarily ignore openshift-saas-deploy jobs
-                if job_name.startswith("openshift-saas-deploy"):
-                    continue
-                all_jobs[name].append(job)
+            all_jobs[name] = list(
+                self.get_job_index(name).get_jobs_by_type(job_types, include_test)
+            )
 
         return all_jobs
 
     def print_jobs(self, job_name=None):
         all_jobs = {}
         found = False
-        for name, wd in self.working_dirs.items():
+        for name in self.working_dirs:
             logging.debug(f"getting jobs from {name}")
             all_jobs[name] = []
-            jobs = self.get_jobs(wd, name)
-            for job in jobs:
+            for job in self.get_job_index(name).jobs:
                 if job_name is not None and job_name not in job["name"]:
                     continue
                 all_jobs[name].append(job)
@@ -383,14 +403,10 @@ class JJB:  # pylint: disable=too-many-public-methods
         print(json.dumps(all_jobs, indent=2))
 
     def get_job_by_repo_url(self, repo_url: str, job_type: str) -> dict[str, Any]:
-        for jobs in self.get_all_jobs(job_types=[job_type]).values():
-            for job in jobs:
-                try:
-                    if self.get_repo_url(job).lower() == repo_url.rstrip("/").lower():
-                        return job
-                except KeyError:
-                    # something wrong here. ignore this job
-                    pass
+        for name in self.working_dirs:
+            for job in self.get_job_index(name).get_jobs_by_repo_url(repo_url):
+                if JobIndex.matches_types(job["name"], [job_type]):
+                    return job
         raise ValueError(f"job with {job_type=} and {repo_url=} not found")
 
     @staticmethod
@@ -401,3 +417,57 @@ class JJB:  # pylint: disable=too-many-public-methods
             if "github-pull-request" in trigger:
                 return trigger["github-pull-request"].get("trigger-phrase")
         return None
+
+
+class JobIndex:
+    """
+    Expanded jobs of a Jenkins instance, indexed by repo url and job
+    type. Returned jobs are shared between lookups and must not be modified.
+    """
+
+    def __init__(self, jobs: list[dict]):
+        self.jobs = jobs
+        self.repo_urls: set[str] = set()
+        self.jobs_without_repo_url: list[str] = []
+        self._jobs_by_repo_url: dict[str, list[dict]] = {}
+        self._jobs_by_type: dict[tuple[tuple[str, ...], bool], list[dict]] = {}
+
+        for job in jobs:
+            try:
+                repo_url = JJB.get_repo_url(job)
+            except KeyError:
+                # something wrong here. ignore this job
+                self.jobs_without_repo_url.append(job["name"])
+                continue
+            self.repo_urls.add(repo_url)
+            self._jobs_by_repo_url.setdefault(repo_url.lower(), []).append(job)
+
+    @staticmethod
+    def matches_types(
+        job_name: str, job_types: Iterable[str], include_test: bool = False
+    ) -> bool:
+        if not any(job_type in job_name for job_type in job_types):
+            return False
+        if not include_test and "test" in job_name:
+            return False
+        # temporarily ignore openshift-saas-deploy jobs
+        if job_name.startswith("openshift-saas-deploy"):
+            return False
+        return True
+
+    def get_jobs_by_type(
+        self, job_types: Sequence[str], include_test: bool = False
+    ) -> list[dict]:
+        key = (tuple(job_types), include_test)
+        jobs = self._jobs_by_type.get(key)
+        if jobs is None:
+            jobs = [
+                j
+                for j in self.jobs
+                if self.matches_types(j["name"], job_types, include_test)
+            ]
+            self._jobs_by_type[key] = jobs
+        return jobs
+
+    def get_jobs_by_repo_url(self, repo_url: str) -> list[dict]:
+        return self._jobs_by_repo_url.get(repo_url.rstrip("/").lower(), [])
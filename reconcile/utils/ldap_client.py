@@ -1,4 +1,11 @@
-from collections.abc import Iterable
+import os
+import threading
+import time
+from collections.abc import (
+    Iterable,
+    Sequence,
+)
+from queue import Queue
 
 from ldap3 import (
     ALL,
@@ -6,6 +13,23 @@ from ldap3 import (
     Connection,
     Server,
 )
+from ldap3.utils.conv import escape_filter_chars
+from sretoolbox.utils import threaded
+
+# Number of uids looked up by a single search
+LDAP_CHUNK_SIZE = int(os.environ.get("LDAP_CHUNK_SIZE", 100))
+# Number of entries returned per page of a search
+LDAP_PAGE_SIZE = int(os.environ.get("LDAP_PAGE_SIZE", 500))
+# Number of connections searches run on concurrently
+LDAP_POOL_SIZE = int(os.environ.get("LDAP_POOL_SIZE", 4))
+# Seconds a found user is not looked up again, 0 disables the cache
+LDAP_CACHE_TTL = int(os.environ.get("LDAP_CACHE_TTL", 0))
+
+PAGED_RESULTS_CONTROL = "1.2.840.113556.1.4.319"
+
+# users found in previous lookups, by (base_dn, lowercased uid)
+_found_users: dict[tuple[str, str], float] = {}
+_found_users_lock = threading.Lock()
 
 
 class LdapClient:
@@ -14,34 +38,103 @@ class LdapClient:
     and exposes through its own method. The client should be used
     `with` statement to allow context manager to release connection resource
     appropriately.
+
+    Connections passed as pool are used in addition to connection to run
+    searches concurrently.
     """
 
-    def __init__(self, base_dn: str, connection: Connection):
+    def __init__(
+        self, base_dn: str, connection: Connection, pool: Sequence[Connection] = ()
+    ):
         self.base_dn = base_dn
         self.connection = connection
+        self.connections = [connection, *pool]
+        self._idle_connections: Queue[Connection] = Queue()
+        for c in self.connections:
+            self._idle_connections.put(c)
 
     def __enter__(self):
-        self.connection.bind()
+        for c in self.connections:
+            c.bind()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.connection.unbind()
+        for c in self.connections:
+            c.unbind()
 
     def get_users(self, uids: Iterable[str]) -> set[str]:
-        user_filter = "".join((f"(uid={u})" for u in uids))
-        _, _, results, _ = self.connection.search(
-            self.base_dn, f"(&(objectclass=person)(|{user_filter}))", attributes=["uid"]
-        )
-        return set(r["attributes"]["uid"][0] for r in results)
+        """
+        Returns the uids that exist. Uids are looked up in chunks of
+        LDAP_CHUNK_SIZE, users found within LDAP_CACHE_TTL seconds are not
+        looked up again. Uids are matched case-insensitively against the cache.
+        """
+        users: set[str] = set()
+        missing = []
+        now = time.time()
+        with _found_users_lock:
+            for uid in dict.fromkeys(uids):
+                found = _found_users.get((self.base_dn, uid.lower()))
+                if found is not None and now - found <= LDAP_CACHE_TTL:
+                    users.add(uid)
+                else:
+                    missing.append(uid)
+
+        chunks = [
+            missing[i : i + LDAP_CHUNK_SIZE]
+            for i in range(0, len(missing), LDAP_CHUNK_SIZE)
+        ]
+        found_users: set[str] = set()
+        for chunk_users in threaded.run(
+            self._search_users, chunks, len(self.connections)
+        ):
+            found_users.update(chunk_users)
+
+        if LDAP_CACHE_TTL > 0:
+            now = time.time()
+            with _found_users_lock:
+                for uid in found_users:
+                    _found_users[(self.base_dn, uid.lower())] = now
+        return users | found_users
+
+    def _search_users(self, uids: Sequence[str]) -> set[str]:
+        user_filter = "".join(f"(uid={escape_filter_chars(u)})" for u in uids)
+        search_filter = f"(&(objectclass=person)(|{user_filter}))"
+
+        connection = self._idle_connections.get()
+        try:
+            users: set[str] = set()
+            cookie = None
+            while True:
+                _, result, response, _ = connection.search(
+                    self.base_dn,
+                    search_filter,
+                    attributes=["uid"],
+                    paged_size=LDAP_PAGE_SIZE,
+                    paged_cookie=cookie,
+                )
+                users.update(r["attributes"]["uid"][0] for r in response)
+                cookie = (
+                    ((result or {}).get("controls") or {})
+                    .get(PAGED_RESULTS_CONTROL, {})
+                    .get("value", {})
+                    .get("cookie")
+                )
+                if not cookie:
+                    return users
+        finally:
+            self._idle_connections.put(connection)
 
     @classmethod
     def from_settings(cls, settings: dict) -> "LdapClient":
         """Requires a nested dictionary with key 'ldap' in addition sub keys 'serverUrl' and 'baseDn'."""
-        connection = Connection(
-            Server(settings["ldap"]["serverUrl"], get_info=ALL),
-            None,
-            None,
-            client_strategy=SAFE_SYNC,
-        )
+        connections = [
+            Connection(
+                Server(settings["ldap"]["serverUrl"], get_info=ALL),
+                None,
+                None,
+                client_strategy=SAFE_SYNC,
+            )
+            for _ in range(max(LDAP_POOL_SIZE, 1))
+        ]
         base_dn = settings["ldap"]["baseDn"]
-        return cls(base_dn, connection)
+        return cls(base_dn, connections[0], pool=connections[1:])
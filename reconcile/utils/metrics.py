@@ -64,3 +64,80 @@ gitlab_request = Counter(
     documentation="Number of calls made to Gitlab API",
     labelnames=["integration"],
 )
+
+gql_transport_created = Counter(
+    name="qontract_reconcile_gql_transport_created_total",
+    documentation="Number of HTTP sessions opened to the GraphQL server",
+    labelnames=["integration"],
+)
+
+gql_transport_reused = Counter(
+    name="qontract_reconcile_gql_transport_reused_total",
+    documentation="Number of GraphQL queries served by an already open HTTP session",
+    labelnames=["integration"],
+)
+
+gql_query_cache_hits = Counter(
+    name="qontract_reconcile_gql_query_cache_hits_total",
+    documentation="Number of GraphQL queries answered from the bundle sha cache",
+    labelnames=["integration", "tier"],
+)
+
+gql_query_cache_misses = Counter(
+    name="qontract_reconcile_gql_query_cache_misses_total",
+    documentation="Number of GraphQL queries not found in the bundle sha cache",
+    labelnames=["integration"],
+)
+
+oc_namespace_cache_hits = Counter(
+    name="qontract_reconcile_oc_namespace_cache_hits_total",
+    documentation="Number of namespace existence checks answered from the client cache",
+    labelnames=["cluster_name"],
+)
+
+oc_namespace_cache_misses = Counter(
+    name="qontract_reconcile_oc_namespace_cache_misses_total",
+    documentation="Number of namespace existence checks that queried the cluster",
+    labelnames=["cluster_name"],
+)
+
+openshift_apply_time = Histogram(
+    name="qontract_reconcile_openshift_apply_seconds",
+    documentation="Time taken to apply a resource to a cluster",
+    labelnames=["cluster_name"],
+)
+
+mirror_task_time = Histogram(
+    name="qontract_reconcile_mirror_task_seconds",
+    documentation="Time taken by image mirroring tasks, e.g. comparing or copying",
+    labelnames=["integration", "task", "registry"],
+)
+
+image_manifest_cache_evictions = Counter(
+    name="qontract_reconcile_image_manifest_cache_evictions_total",
+    documentation="Number of image manifest responses evicted from the cache",
+    labelnames=["integration", "reason"],
+)
+
+vault_secret_cache_hits = Counter(
+    name="qontract_reconcile_vault_secret_cache_hits_total",
+    documentation="Number of versioned vault secret reads answered from the cache",
+    labelnames=["tier"],
+)
+
+vault_secret_cache_misses = Counter(
+    name="qontract_reconcile_vault_secret_cache_misses_total",
+    documentation="Number of versioned vault secret reads not found in the cache",
+)
+
+vault_coalesced_reads = Counter(
+    name="qontract_reconcile_vault_coalesced_reads_total",
+    documentation="Number of vault secret reads that waited for an identical read in flight",
+    labelnames=["kv_version"],
+)
+
+state_s3_calls = Counter(
+    name="qontract_reconcile_state_s3_calls_total",
+    documentation="Number of S3 API calls made to the state bucket",
+    labelnames=["integration", "operation"],
+)
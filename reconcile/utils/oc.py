@@ -56,8 +56,16 @@ from reconcile.utils.jump_host import (
     JumphostParameters,
     JumpHostSSH,
 )
-from reconcile.utils.metrics import reconcile_time
+from reconcile.utils.metrics import (
+    oc_namespace_cache_hits,
+    oc_namespace_cache_misses,
+    reconcile_time,
+)
 from reconcile.utils.oc_connection_parameters import OCConnectionParameters
+from reconcile.utils.oc_template import (
+    TemplateProcessingError,
+    process_template,
+)
 from reconcile.utils.secret_reader import (
     SecretNotFound,
     SecretReader,
@@ -68,6 +76,12 @@ urllib3.disable_warnings()
 
 GET_REPLICASET_MAX_ATTEMPTS = 20
 
+# Size of the keep-alive connection pool of each native client.
+# Defaults to the kubernetes client default (5 * number of CPUs).
+OC_NATIVE_CONNECTION_POOL_MAXSIZE = int(
+    os.environ.get("OC_NATIVE_CONNECTION_POOL_MAXSIZE", 0)
+)
+
 
 class StatusCodeError(Exception):
     pass
@@ -464,7 +478,9 @@ class OCDeprecated:  # pylint: disable=too-many-public-methods
     def get_items(self, kind, **kwargs):
         cmd = ["get", kind, "-o", "json"]
 
-        if "namespace" in kwargs:
+        if kwargs.get("all_namespaces"):
+            cmd.append("--all-namespaces")
+        elif "namespace" in kwargs:
             namespace = kwargs["namespace"]
             # for cluster scoped integrations
             # currently only openshift-clusterrolebindings
@@ -534,18 +550,11 @@ class OCDeprecated:  # pylint: disable=too-many-public-methods
         )
 
     def process(self, template, parameters=None):
-        if parameters is None:
-            parameters = {}
-        parameters_to_process = [f"{k}={v}" for k, v in parameters.items()]
-        cmd = [
-            "process",
-            "--local",
-            "--ignore-unknown-parameters",
-            "-f",
-            "-",
-        ] + parameters_to_process
-        result = self._run(cmd, stdin=json.dumps(template, sort_keys=True))
-        return json.loads(result)["items"]
+        # processed in-process instead of running `oc process --local`
+        try:
+            return process_template(template, parameters or {})
+        except TemplateProcessingError as e:
+            raise StatusCodeError(f"[{self.server}]: {e}")
 
     def release_mirror(self, from_release, to, to_release, dockerconfig):
         with tempfile.NamedTemporaryFile() as fp:
@@ -1229,7 +1238,9 @@ class OCNative(OCDeprecated):
             settings,
             init_projects=False,
             init_api_resources=False,
-            local=local,
+            # do not fork `oc version` to check if the cluster is reachable,
+            # this is done with the native client below
+            local=True,
             insecure_skip_tls_verify=insecure_skip_tls_verify,
             connection_parameters=connection_parameters,
         )
@@ -1243,6 +1254,9 @@ class OCNative(OCDeprecated):
 
         if server:
             self.client = self._get_client(server, token)
+            # calling get_version to check if cluster is reachable
+            if not local:
+                self.get_version()
             self.api_resources = self.get_api_resources()
 
         else:
@@ -1252,11 +1266,11 @@ class OCNative(OCDeprecated):
 
         self.init_projects = init_projects
         if self.init_projects:
-            if self.is_kind_supported("Project"):
-                kind = "Project.project.openshift.io"
-            else:
-                kind = "Namespace"
-            self.projects = [p["metadata"]["name"] for p in self.get_all(kind)["items"]]
+            self.projects = self._get_project_names()
+
+        # index of existing namespaces, populated on first use
+        self._namespaces: Optional[set[str]] = None
+        self._namespaces_lock = threading.Lock()
 
     @retry(exceptions=(ServerTimeoutError, InternalServerError, ForbiddenError))
     def _get_client(self, server, token):
@@ -1267,6 +1281,10 @@ class OCNative(OCDeprecated):
             # default timeout seems to be 1+ minutes
             retries=5,
         )
+        if OC_NATIVE_CONNECTION_POOL_MAXSIZE:
+            # connections beyond the pool size are discarded after use,
+            # which means a new TLS handshake for every further request
+            opts["connection_pool_maxsize"] = OC_NATIVE_CONNECTION_POOL_MAXSIZE
         if self.jump_host:
             # the ports could be parameterized, but at this point
             # we only have need of 1 tunnel for 1 service
@@ -1289,6 +1307,60 @@ class OCNative(OCDeprecated):
         except urllib3.exceptions.MaxRetryError as e:
             raise StatusCodeError(f"[{self.server}]: {e}")
 
+    def _get_project_names(self) -> list[str]:
+        if self.is_kind_supported("Project"):
+            kind = "Project.project.openshift.io"
+        else:
+            kind = "Namespace"
+        return [p["metadata"]["name"] for p in self.get_all(kind)["items"]]
+
+    def project_exists(self, name):
+        if self.init_projects:
+            return name in self.projects
+
+        with self._namespaces_lock:
+            if self._namespaces is None:
+                try:
+                    self._namespaces = set(self._get_project_names())
+                except (StatusCodeError, ForbiddenError) as e:
+                    # not allowed to list namespaces, check them one by one
+                    logging.debug(f"[{self.cluster_name}] no namespace index: {e}")
+                    self._namespaces = set()
+            if name in self._namespaces:
+                oc_namespace_cache_hits.labels(cluster_name=self.cluster_name).inc()
+                return True
+
+        # the namespace may have been created since the index was populated
+        oc_namespace_cache_misses.labels(cluster_name=self.cluster_name).inc()
+        exists = super().project_exists(name)
+        if exists:
+            with self._namespaces_lock:
+                if self._namespaces is not None:
+                    self._namespaces.add(name)
+        return exists
+
+    def new_project(self, namespace):
+        result = super().new_project(namespace)
+        with self._namespaces_lock:
+            if self._namespaces is not None:
+                self._namespaces.add(namespace)
+        return result
+
+    def delete_project(self, namespace):
+        result = super().delete_project(namespace)
+        with self._namespaces_lock:
+            if self._namespaces is not None:
+                self._namespaces.discard(namespace)
+        return result
+
+    def get_version(self):
+        try:
+            return self.client.request(
+                "get", "/version", serializer=lambda _, serialized: serialized
+            )
+        except urllib3.exceptions.MaxRetryError as e:
+            raise StatusCodeError(f"[{self.server}]: {e}")
+
     def _get_obj_client(self, kind, group_version):
         key = f"{kind}.{group_version}"
         if key not in self.object_clients:
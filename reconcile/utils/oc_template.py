@@ -0,0 +1,165 @@
+"""
+In-process implementation of `oc process --local --ignore-unknown-parameters`.
+
+Follows the template processing of openshift/library-go, so that the
+processed objects are the same as the ones returned by oc.
+"""
+import copy
+import json
+import re
+import secrets
+import string
+from collections.abc import Mapping
+from typing import Any
+
+STRING_PARAMETER_RE = re.compile(r"\$\{([a-zA-Z0-9\_]+?)\}")
+NON_STRING_PARAMETER_RE = re.compile(r"^\$\{\{([a-zA-Z0-9\_]+)\}\}$")
+
+GENERATOR_RE = re.compile(r"\[([a-zA-Z0-9\-\\]+)\](\{(\w+)\})")
+GENERATOR_RANGE_RE = re.compile(r"([\\]?[a-zA-Z0-9]\-?[a-zA-Z0-9]?)")
+GENERATOR_MAX_LENGTH = 255
+GENERATOR_SYMBOLS = "~!@#$%^&*()-_+={}[]\\|<,>.?/\"';:`"
+
+
+class TemplateProcessingError(Exception):
+    pass
+
+
+def process_template(
+    template: Mapping[str, Any], parameters: Mapping[str, Any]
+) -> list[dict[str, Any]]:
+    """
+    Processes an OpenShift Template and returns the resulting objects.
+
+    Parameters that are not defined in the template are ignored. Values
+    are converted to strings, as they would be on the oc command line.
+    The template itself is not modified.
+    """
+    params: dict[str, dict[str, Any]] = {}
+    for index, param in enumerate(template.get("parameters") or []):
+        param = dict(param)
+        if not isinstance(param.get("value", ""), str):
+            raise TemplateProcessingError(
+                f"template.parameters[{index}]: value of parameter "
+                f"{param.get('name')} must be a string"
+            )
+        if param.get("name") in parameters:
+            param["value"] = str(parameters[param["name"]])
+            param["generate"] = ""
+        if not param.get("value") and param.get("generate"):
+            if param["generate"] != "expression":
+                raise TemplateProcessingError(
+                    f"template.parameters[{index}]: unknown generator "
+                    f"{param['generate']}"
+                )
+            param["value"] = generate_expression_value(param.get("from") or "")
+        if not param.get("value") and param.get("required"):
+            raise TemplateProcessingError(
+                f"template.parameters[{index}]: parameter {param.get('name')} "
+                "is required and must be specified"
+            )
+        params[param["name"]] = param
+
+    values = {name: param.get("value") or "" for name, param in params.items()}
+
+    labels = {}
+    for k, v in (template.get("labels") or {}).items():
+        labels[_substitute(values, k)[0]] = _substitute(values, v)[0]
+
+    objects = []
+    for obj in template.get("objects") or []:
+        obj = copy.deepcopy(obj)
+        _strip_namespace(obj)
+        obj = _substitute_object(values, obj)
+        if labels:
+            metadata = obj.setdefault("metadata", {})
+            metadata["labels"] = {**(metadata.get("labels") or {}), **labels}
+        objects.append(obj)
+    return objects
+
+
+def _strip_namespace(obj: dict[str, Any]) -> None:
+    # hardcoded namespaces are removed, references to parameters are kept
+    metadata = obj.get("metadata") or {}
+    namespace = metadata.get("namespace")
+    if namespace and not STRING_PARAMETER_RE.search(namespace):
+        metadata.pop("namespace")
+
+
+def _substitute(values: Mapping[str, str], value: str) -> tuple[str, bool]:
+    """
+    Substitutes parameter references in value. The second element of the
+    result is False if value was a ${{PARAM}} reference, whose substitution
+    has to be used as a non-string value.
+    """
+    match = NON_STRING_PARAMETER_RE.match(value)
+    if match and match.group(1) in values:
+        return values[match.group(1)], False
+
+    def replace(match: re.Match) -> str:
+        return values.get(match.group(1), match.group(0))
+
+    return STRING_PARAMETER_RE.sub(replace, value), True
+
+
+def _substitute_object(values: Mapping[str, str], obj: Any) -> Any:
+    if isinstance(obj, dict):
+        return {
+            _substitute(values, k)[0]: _substitute_object(values, v)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_substitute_object(values, v) for v in obj]
+    if isinstance(obj, str):
+        substituted, as_string = _substitute(values, obj)
+        if as_string:
+            return substituted
+        try:
+            value = json.loads(substituted)
+        except ValueError:
+            # oc keeps values that are not valid json as strings
+            return substituted
+        # numbers are floats after decoding in oc
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        return value
+    return obj
+
+
+def generate_expression_value(expression: str) -> str:
+    """
+    Replaces all generator expressions like [a-zA-Z0-9]{16} in expression
+    with random characters of the given ranges and length.
+    """
+    while match := GENERATOR_RE.search(expression):
+        ranges = match.group(1)
+        length = int(match.group(3)) if match.group(3).isdigit() else 0
+        if not 0 < length <= GENERATOR_MAX_LENGTH:
+            raise TemplateProcessingError(
+                f"range must be within [1-{GENERATOR_MAX_LENGTH}] characters "
+                f"({length})"
+            )
+        alphabet = ""
+        for r in GENERATOR_RANGE_RE.findall(ranges):
+            alphabet += _generator_alphabet(r)
+        # keep the first occurrence of every character
+        alphabet = "".join(dict.fromkeys(alphabet))
+        generated = "".join(secrets.choice(alphabet) for _ in range(length))
+        expression = expression.replace(match.group(0), generated, 1)
+    return expression
+
+
+def _generator_alphabet(r: str) -> str:
+    if r == r"\w":
+        return string.ascii_letters + string.digits + "_"
+    if r == r"\d":
+        return string.digits
+    if r == r"\a":
+        return string.ascii_letters
+    if r == r"\A":
+        return GENERATOR_SYMBOLS
+    if len(r) == 3 and r[1] == "-":
+        if r[0] > r[2]:
+            raise TemplateProcessingError(f"invalid range specified: {r}")
+        return "".join(chr(c) for c in range(ord(r[0]), ord(r[2]) + 1))
+    return r.replace("\\", "").replace("-", "")
@@ -4,6 +4,7 @@ import datetime
 import hashlib
 import json
 import re
+import sys
 from collections.abc import Mapping
 from threading import Lock
 from typing import (
@@ -51,6 +52,15 @@ CONTROLLER_MANAGED_LABELS: dict[str, set[Union[str, re.Pattern]]] = {
 
 
 class OpenshiftResource:
+    __slots__ = (
+        "_body",
+        "_sha256sum",
+        "integration",
+        "integration_version",
+        "error_details",
+        "caller_name",
+    )
+
     def __init__(
         self,
         body,
@@ -68,6 +78,15 @@ class OpenshiftResource:
         if validate_k8s_object:
             self.verify_valid_k8s_object()
 
+    @property
+    def body(self):
+        return self._body
+
+    @body.setter
+    def body(self, body):
+        self._body = body
+        self._sha256sum = None
+
     def __eq__(self, other):
         return self.obj_intersect_equal(self.body, other.body)
 
@@ -324,9 +343,7 @@ class OpenshiftResource:
                 annotations.
         """
 
-        # calculate sha256sum of canonical body
-        canonical_body = self.canonicalize(self.body)
-        sha256sum = self.calculate_sha256sum(self.serialize(canonical_body))
+        sha256sum = self.sha256sum()
 
         # create new body object
         body = copy.deepcopy(self.body)
@@ -347,44 +364,67 @@ class OpenshiftResource:
         if self.caller_name:
             annotations["qontract.caller_name"] = self.caller_name
 
-        return OpenshiftResource(body, self.integration, self.integration_version)
+        annotated = OpenshiftResource(body, self.integration, self.integration_version)
+        # the qontract annotations are not part of the canonical body,
+        # so the annotated resource hashes to the same sum
+        annotated._sha256sum = sha256sum
+        return annotated
 
     def sha256sum(self):
-        body = self.annotate().body
+        """
+        Returns the sha256sum of the canonical body.
 
-        annotations = body["metadata"]["annotations"]
-        return annotations["qontract.sha256sum"]
+        The result is memoized per instance and recalculated when the body
+        is replaced. Changing the body in place after the sum has been
+        calculated requires assigning it again.
+        """
+        if self._sha256sum is None:
+            canonical_body = self.canonicalize(self.body)
+            self._sha256sum = self.calculate_sha256sum(self.serialize(canonical_body))
+        return self._sha256sum
 
     def toJSON(self):
         return self.serialize(self.body)
 
     @staticmethod
     def canonicalize(body):
-        body = copy.deepcopy(body)
+        """
+        Returns the canonical form of a resource body, which is what the
+        sha256sum is calculated from.
+
+        The input body is never modified. Instead of deep copying it, only
+        the parts that are changed during canonicalization are copied, so
+        the result shares all other subtrees with the input.
+        """
+        body = dict(body)
+        metadata = body["metadata"] = dict(body["metadata"])
 
         # create annotations if not present
-        body["metadata"].setdefault("annotations", {})
-        if body["metadata"]["annotations"] is None:
-            body["metadata"]["annotations"] = {}
-        annotations = body["metadata"]["annotations"]
+        annotations = metadata["annotations"] = dict(metadata.get("annotations") or {})
 
         # remove openshift specific params
-        body["metadata"].pop("creationTimestamp", None)
-        body["metadata"].pop("resourceVersion", None)
-        body["metadata"].pop("generation", None)
-        body["metadata"].pop("selfLink", None)
-        body["metadata"].pop("uid", None)
-        body["metadata"].pop("namespace", None)
-        body["metadata"].pop("managedFields", None)
+        metadata.pop("creationTimestamp", None)
+        metadata.pop("resourceVersion", None)
+        metadata.pop("generation", None)
+        metadata.pop("selfLink", None)
+        metadata.pop("uid", None)
+        metadata.pop("namespace", None)
+        metadata.pop("managedFields", None)
         annotations.pop("kubectl.kubernetes.io/last-applied-configuration", None)
 
         # remove status
         body.pop("status", None)
 
         # remove controller managed labels
-        labels = body["metadata"].get("labels", {})
-        for label in set(labels.keys()):
-            if OpenshiftResource.is_controller_managed_label(body["kind"], label):
+        labels = metadata.get("labels", {})
+        managed_labels = [
+            label
+            for label in labels.keys()
+            if OpenshiftResource.is_controller_managed_label(body["kind"], label)
+        ]
+        if managed_labels:
+            labels = metadata["labels"] = dict(labels)
+            for label in managed_labels:
                 labels.pop(label)
 
         # Default fields for specific resource types
@@ -395,7 +435,7 @@ class OpenshiftResource:
         if body["kind"] == "Secret":
             string_data = body.pop("stringData", None)
             if string_data:
-                body.setdefault("data", {})
+                body["data"] = dict(body.get("data") or {})
                 for k, v in string_data.items():
                     v = base64.b64encode(str(v).encode()).decode("utf-8")
                     body["data"][k] = v
@@ -404,8 +444,9 @@ class OpenshiftResource:
             annotations.pop("deployment.kubernetes.io/revision", None)
 
         if body["kind"] == "Route":
-            if body["spec"].get("wildcardPolicy") == "None":
-                body["spec"].pop("wildcardPolicy")
+            spec = body["spec"] = dict(body["spec"])
+            if spec.get("wildcardPolicy") == "None":
+                spec.pop("wildcardPolicy")
             # remove tls-acme specific params from Route
             if "kubernetes.io/tls-acme" in annotations:
                 annotations.pop(
@@ -414,13 +455,13 @@ class OpenshiftResource:
                 annotations.pop(
                     "kubernetes.io/tls-acme-awaiting-authorization-at-url", None
                 )
-                if "tls" in body["spec"]:
-                    tls = body["spec"]["tls"]
+                if "tls" in spec:
+                    tls = spec["tls"] = dict(spec["tls"])
                     tls.pop("key", None)
                     tls.pop("certificate", None)
-            subdomain = body["spec"].get("subdomain", None)
+            subdomain = spec.get("subdomain", None)
             if subdomain == "":
-                body["spec"].pop("subdomain", None)
+                spec.pop("subdomain", None)
 
         if body["kind"] == "ServiceAccount":
             if "imagePullSecrets" in body:
@@ -436,18 +477,22 @@ class OpenshiftResource:
                 body.pop("secrets")
 
         if body["kind"] == "Role":
+            rules = []
             for rule in body["rules"]:
+                rule = dict(rule)
                 if "resources" in rule:
-                    rule["resources"].sort()
+                    rule["resources"] = sorted(rule["resources"])
 
                 if "verbs" in rule:
-                    rule["verbs"].sort()
+                    rule["verbs"] = sorted(rule["verbs"])
 
                 if (
                     "attributeRestrictions" in rule
                     and not rule["attributeRestrictions"]
                 ):
                     rule.pop("attributeRestrictions")
+                rules.append(rule)
+            body["rules"] = rules
             # TODO: remove this once we have no 3.11 clusters
             if body["apiVersion"] == "authorization.openshift.io/v1":
                 body["apiVersion"] = "rbac.authorization.k8s.io/v1"
@@ -461,14 +506,16 @@ class OpenshiftResource:
             if "userNames" in body:
                 body.pop("userNames")
             if "roleRef" in body:
-                roleRef = body["roleRef"]
+                roleRef = body["roleRef"] = dict(body["roleRef"])
                 if "namespace" in roleRef:
                     roleRef.pop("namespace")
                 if "apiGroup" in roleRef and roleRef["apiGroup"] in body["apiVersion"]:
                     roleRef.pop("apiGroup")
                 if "kind" in roleRef:
                     roleRef.pop("kind")
+            subjects = []
             for subject in body["subjects"]:
+                subject = dict(subject)
                 if "namespace" in subject:
                     subject.pop("namespace")
                 if "apiGroup" in subject and (
@@ -476,6 +523,8 @@ class OpenshiftResource:
                     or subject["apiGroup"] in body["apiVersion"]
                 ):
                     subject.pop("apiGroup")
+                subjects.append(subject)
+            body["subjects"] = subjects
             # TODO: remove this once we have no 3.11 clusters
             if body["apiVersion"] == "rbac.authorization.k8s.io/v1":
                 body["apiVersion"] = "authorization.openshift.io/v1"
@@ -487,7 +536,7 @@ class OpenshiftResource:
             if "userNames" in body:
                 body.pop("userNames")
             if "roleRef" in body:
-                roleRef = body["roleRef"]
+                roleRef = body["roleRef"] = dict(body["roleRef"])
                 if "apiGroup" in roleRef and roleRef["apiGroup"] in body["apiVersion"]:
                     roleRef.pop("apiGroup")
                 if "kind" in roleRef:
@@ -495,7 +544,7 @@ class OpenshiftResource:
             if "groupNames" in body:
                 body.pop("groupNames")
         if body["kind"] == "Service":
-            spec = body["spec"]
+            spec = body["spec"] = dict(body["spec"])
             if spec.get("sessionAffinity") == "None":
                 spec.pop("sessionAffinity")
             if spec.get("type") == "ClusterIP":
@@ -529,19 +578,54 @@ def fully_qualified_kind(kind: str, api_version: str) -> str:
         return kind
 
 
+class ResourceTypeState:
+    """
+    Current and desired state of a resource type in a namespace.
+
+    Supports item access by state name (``state["desired"]``) for
+    compatibility with the dict it replaces.
+    """
+
+    __slots__ = ("current", "desired", "use_admin_token")
+
+    def __init__(self) -> None:
+        self.current: dict[str, OpenshiftResource] = {}
+        self.desired: dict[str, OpenshiftResource] = {}
+        self.use_admin_token: dict[str, bool] = {}
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__slots__
+
+
 class ResourceInventory:
     def __init__(self):
         self._clusters = {}
         self._error_registered = False
         self._error_registered_clusters = {}
         self._lock = Lock()
+        # one lock per cluster, so that threads working on different
+        # clusters do not contend for the same lock
+        self._cluster_locks = {}
 
     def initialize_resource_type(self, cluster, namespace, resource_type):
-        self._clusters.setdefault(cluster, {})
-        self._clusters[cluster].setdefault(namespace, {})
-        self._clusters[cluster][namespace].setdefault(
-            resource_type, {"current": {}, "desired": {}, "use_admin_token": {}}
-        )
+        # cluster, namespace and kind names are repeated across many
+        # inventories and resources, share a single copy of each
+        cluster = sys.intern(cluster)
+        namespace = sys.intern(namespace)
+        resource_type = sys.intern(resource_type)
+        with self._lock:
+            if cluster not in self._cluster_locks:
+                self._cluster_locks[cluster] = Lock()
+            self._clusters.setdefault(cluster, {})
+        with self._cluster_locks[cluster]:
+            self._clusters[cluster].setdefault(namespace, {})
+            if resource_type not in self._clusters[cluster][namespace]:
+                self._clusters[cluster][namespace][resource_type] = ResourceTypeState()
 
     def is_cluster_present(self, cluster: str) -> bool:
         return cluster in self._clusters
@@ -575,15 +659,12 @@ class ResourceInventory:
         # state-specs that lead up to add_desired calls. while this is a
         # mismatch between schema and implementation for now, it will enable
         # us to implement per-resource configuration in the future
-        with self._lock:
-            desired = self._clusters[cluster][namespace][resource_type]["desired"]
-            if name in desired:
+        state = self._clusters[cluster][namespace][resource_type]
+        with self._cluster_locks[cluster]:
+            if name in state.desired:
                 raise ResourceKeyExistsError(name)
-            desired[name] = value
-            admin_token_usage = self._clusters[cluster][namespace][resource_type][
-                "use_admin_token"
-            ]
-            admin_token_usage[name] = privileged
+            state.desired[name] = value
+            state.use_admin_token[name] = privileged
 
     def get_desired(self, cluster, namespace, resource_type, name):
         try:
@@ -604,9 +685,9 @@ class ResourceInventory:
             return None
 
     def add_current(self, cluster, namespace, resource_type, name, value):
-        with self._lock:
-            current = self._clusters[cluster][namespace][resource_type]["current"]
-            current[name] = value
+        state = self._clusters[cluster][namespace][resource_type]
+        with self._cluster_locks[cluster]:
+            state.current[name] = value
 
     def __iter__(self):
         for cluster_name, cluster in self._clusters.items():
@@ -624,6 +705,46 @@ class ResourceInventory:
             return self._error_registered_clusters.get(cluster, False)
         return self._error_registered
 
+    def memory_report(self) -> dict[str, dict[str, int]]:
+        """
+        Returns the number of resources held per cluster and an estimate
+        of the memory used by their bodies in bytes.
+
+        Walks all resource bodies, so it is meant for occasional reporting
+        rather than for hot paths.
+        """
+        report = {}
+        for cluster_name, cluster in self._clusters.items():
+            with self._cluster_locks[cluster_name]:
+                namespaces = len(cluster)
+                resource_types = desired = current = size = 0
+                for namespace in cluster.values():
+                    resource_types += len(namespace)
+                    for state in namespace.values():
+                        desired += len(state.desired)
+                        current += len(state.current)
+                        for item in (*state.desired.values(), *state.current.values()):
+                            size += sys.getsizeof(item) + _deep_getsizeof(item.body)
+            report[cluster_name] = {
+                "namespaces": namespaces,
+                "resource_types": resource_types,
+                "desired": desired,
+                "current": current,
+                "bytes": size,
+            }
+        return report
+
+
+def _deep_getsizeof(obj) -> int:
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            size += _deep_getsizeof(k) + _deep_getsizeof(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            size += _deep_getsizeof(v)
+    return size
+
 
 def build_secret(
     name: str,
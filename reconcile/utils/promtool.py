@@ -1,17 +1,58 @@
-import copy
+import hashlib
+import json
+import logging
 import os
 import subprocess
 import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Iterable,
+    Mapping,
+    Sequence,
+)
+from functools import lru_cache
+from typing import (
+    Any,
+    Optional,
+)
 
 import yaml
+from sretoolbox.utils import threaded
 
-from reconcile.utils.defer import defer
 from reconcile.utils.structs import CommandExecutionResult
 
+# Number of rule or test files checked by a single promtool invocation
+PROMTOOL_BATCH_SIZE = int(os.environ.get("PROMTOOL_BATCH_SIZE", 50))
+# Directory to persist results in, only kept in memory if not set
+PROMTOOL_CACHE_DIR = os.environ.get("PROMTOOL_CACHE_DIR")
+# Number of results kept in PROMTOOL_CACHE_DIR, least recently used are removed
+PROMTOOL_CACHE_DIR_MAX_FILES = int(
+    os.environ.get("PROMTOOL_CACHE_DIR_MAX_FILES", 10000)
+)
+# Number of results kept in memory, least recently used are dropped first
+PROMTOOL_RESULTS_CACHE_SIZE = int(os.environ.get("PROMTOOL_RESULTS_CACHE_SIZE", 10000))
+
+_results: OrderedDict[str, CommandExecutionResult] = OrderedDict()
+_results_lock = threading.Lock()
+
 
 def check_rule(yaml_spec):
     """Run promtool check rules on the given yaml spec given as dict"""
-    return _run_yaml_spec_cmd(cmd=["promtool", "check", "rules"], yaml_spec=yaml_spec)
+    return check_rules([yaml_spec])[0]
+
+
+def check_rules(
+    yaml_specs: Sequence[Mapping[str, Any]], thread_pool_size: int = 1
+) -> list[CommandExecutionResult]:
+    """Run promtool check rules on the given yaml specs
+
+    Specs are checked in batches of PROMTOOL_BATCH_SIZE files per promtool
+    run and results are cached by the content of the spec.
+    """
+    contents = [yaml.dump(spec) for spec in yaml_specs]
+    return _run_cached("check", contents, contents, _check_rules, thread_pool_size)
 
 
 def run_test(test_yaml_spec, rule_files):
@@ -23,61 +64,257 @@ def run_test(test_yaml_spec, rule_files):
 
     rule_files: dict indexed by rule path containing rule files yaml dicts
     """
-    temp_rule_files = {}
-    try:
-        for rule_file, yaml_spec in rule_files.items():
-            with tempfile.NamedTemporaryFile(delete=False) as fp:
-                fp.write(yaml.dump(yaml_spec).encode())
-                temp_rule_files[rule_file] = fp.name
-    except Exception as e:
-        return CommandExecutionResult(False, f"Error building temp rule files: {e}")
+    return run_tests([(test_yaml_spec, rule_files)])[0]
+
 
-    # build a test yaml prometheus files that uses the temp files created
-    new_rule_files = []
-    for rule_file in test_yaml_spec["rule_files"]:
-        if rule_file not in temp_rule_files:
-            raise CommandExecutionResult(False, f"{rule_file} not in rule_files dict")
+def run_tests(
+    tests: Sequence[tuple[Mapping[str, Any], Mapping[str, Any]]],
+    thread_pool_size: int = 1,
+) -> list[CommandExecutionResult]:
+    """Run promtool test rules on (test_yaml_spec, rule_files) tuples
 
-        new_rule_files.append(temp_rule_files[rule_file])
+    Tests are run in batches of PROMTOOL_BATCH_SIZE files per promtool
+    run and results are cached by the content of the test and rule files.
+    """
+    contents = [
+        yaml.dump({"test": test, "rule_files": rule_files})
+        for test, rule_files in tests
+    ]
+    return _run_cached("test", list(tests), contents, _run_tests, thread_pool_size)
 
-    temp_test_yaml_spec = copy.deepcopy(test_yaml_spec)
-    temp_test_yaml_spec["rule_files"] = new_rule_files
 
-    defer(lambda: _cleanup(temp_rule_files.values()))
+def _run_cached(
+    kind: str,
+    units: Sequence[Any],
+    contents: Sequence[str],
+    run_batch: Callable[[Sequence[Any]], list[CommandExecutionResult]],
+    thread_pool_size: int,
+) -> list[CommandExecutionResult]:
+    version = _promtool_version()
+    keys = [
+        hashlib.sha256(f"{kind}\n{version}\n{content}".encode()).hexdigest()
+        for content in contents
+    ]
 
-    return _run_yaml_spec_cmd(
-        cmd=["promtool", "test", "rules"], yaml_spec=temp_test_yaml_spec
+    # results of this call, kept apart from _results to survive evictions
+    found: dict[str, CommandExecutionResult] = {}
+    # run every distinct content that is not cached yet once
+    pending: dict[str, Any] = {}
+    for key, unit in zip(keys, units):
+        if key in found or key in pending:
+            continue
+        cached = _get_result(key)
+        if cached is None:
+            pending[key] = unit
+        else:
+            found[key] = cached
+
+    pending_keys = list(pending)
+    batches = [
+        pending_keys[i : i + PROMTOOL_BATCH_SIZE]
+        for i in range(0, len(pending_keys), PROMTOOL_BATCH_SIZE)
+    ]
+    batch_results = threaded.run(
+        lambda batch: run_batch([pending[key] for key in batch]),
+        batches,
+        thread_pool_size,
     )
+    for batch, results in zip(batches, batch_results):
+        for key, result in zip(batch, results):
+            _set_result(key, result)
+            found[key] = result
+    if pending:
+        _prune_cache_dir()
 
+    return [found[key] for key in keys]
 
-def _run_yaml_spec_cmd(cmd, yaml_spec):
-    with tempfile.NamedTemporaryFile() as fp:
-        try:
-            fp.write(yaml.dump(yaml_spec).encode())
-            fp.flush()
-            cmd.append(fp.name)
-        except Exception as e:
-            return CommandExecutionResult(False, f"Error creating temporary file: {e}")
 
-        try:
-            result = subprocess.run(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+def _check_rules(contents: Sequence[str]) -> list[CommandExecutionResult]:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        for i, content in enumerate(contents):
+            path = os.path.join(tmp_dir, f"{i}.yml")
+            with open(path, "w") as f:
+                f.write(content)
+            paths.append(path)
+
+        return _run_batch(["promtool", "check", "rules"], "Checking ", paths)
+
+
+def _run_tests(
+    tests: Sequence[tuple[Mapping[str, Any], Mapping[str, Any]]]
+) -> list[CommandExecutionResult]:
+    results: dict[int, CommandExecutionResult] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        paths = []
+        indexes = []
+        for i, (test_yaml_spec, rule_files) in enumerate(tests):
+            # write the rule files and a test yaml spec that uses them
+            temp_rule_files = {}
+            for j, (rule_file, yaml_spec) in enumerate(rule_files.items()):
+                temp_rule_files[rule_file] = os.path.join(tmp_dir, f"{i}-rule-{j}.yml")
+                with open(temp_rule_files[rule_file], "w") as f:
+                    f.write(yaml.dump(yaml_spec))
+
+            missing = [r for r in test_yaml_spec["rule_files"] if r not in rule_files]
+            if missing:
+                results[i] = CommandExecutionResult(
+                    False, f"{missing[0]} not in rule_files dict"
+                )
+                continue
+
+            temp_test_yaml_spec = {
+                **test_yaml_spec,
+                "rule_files": [
+                    temp_rule_files[r] for r in test_yaml_spec["rule_files"]
+                ],
+            }
+            path = os.path.join(tmp_dir, f"{i}.yml")
+            with open(path, "w") as f:
+                f.write(yaml.dump(temp_test_yaml_spec))
+            paths.append(path)
+            indexes.append(i)
+
+        if paths:
+            batch_results = _run_batch(
+                ["promtool", "test", "rules"], "Unit Testing: ", paths
             )
-        except subprocess.CalledProcessError as e:
-            msg = f'Error running promtool command [{" ".join(cmd)}]'
-            if e.stdout:
-                msg += f" {e.stdout.decode()}"
-            if e.stderr:
-                msg += f" {e.stderr.decode()}"
+            for i, result in zip(indexes, batch_results):
+                results[i] = result
+
+    return [results[i] for i in range(len(tests))]
 
-            return CommandExecutionResult(False, msg)
 
-    return CommandExecutionResult(True, result.stdout.decode())
+def _run_batch(
+    cmd: list[str], section_prefix: str, paths: Sequence[str]
+) -> list[CommandExecutionResult]:
+    """
+    Runs cmd once for all paths and attributes the outcome to every path by
+    the section promtool prints for it. Paths that failed in a batch are run
+    again on their own to get their error message.
+    """
+    result, stdout = _run(cmd + list(paths))
+    if len(paths) == 1:
+        return [result]
 
+    sections = _split_sections(stdout, section_prefix, paths)
+    results = []
+    for path in paths:
+        section = sections.get(path, "")
+        if result or "SUCCESS" in section:
+            results.append(CommandExecutionResult(True, section))
+        else:
+            results.append(_run(cmd + [path])[0])
+    return results
 
-def _cleanup(paths):
+
+def _split_sections(
+    stdout: str, section_prefix: str, paths: Iterable[str]
+) -> dict[str, str]:
+    paths = set(paths)
+    sections: dict[str, list[str]] = {}
+    current: Optional[list[str]] = None
+    for line in stdout.splitlines(keepends=True):
+        if (
+            line.startswith(section_prefix)
+            and line[len(section_prefix) :].strip() in paths
+        ):
+            current = sections.setdefault(line[len(section_prefix) :].strip(), [])
+        if current is not None:
+            current.append(line)
+    return {path: "".join(lines) for path, lines in sections.items()}
+
+
+def _run(cmd: list[str]) -> tuple[CommandExecutionResult, str]:
+    try:
+        result = subprocess.run(
+            cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+        )
+    except subprocess.CalledProcessError as e:
+        msg = f'Error running promtool command [{" ".join(cmd)}]'
+        if e.stdout:
+            msg += f" {e.stdout.decode()}"
+        if e.stderr:
+            msg += f" {e.stderr.decode()}"
+
+        return CommandExecutionResult(False, msg), (e.stdout or b"").decode()
+
+    stdout = result.stdout.decode()
+    return CommandExecutionResult(True, stdout), stdout
+
+
+@lru_cache(maxsize=1)
+def _promtool_version() -> str:
+    # results are only valid for the promtool version that produced them
+    try:
+        result = subprocess.run(
+            ["promtool", "--version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return result.stdout.decode()
+
+
+def _get_result(key: str) -> Optional[CommandExecutionResult]:
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+    if not PROMTOOL_CACHE_DIR:
+        return None
+    path = os.path.join(PROMTOOL_CACHE_DIR, f"{key}.json")
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        # the modification time is the last use, see _prune_cache_dir
+        os.utime(path)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logging.debug(f"could not read promtool result {key}: {e}")
+        return None
+    result = CommandExecutionResult(data["is_ok"], data["message"])
+    _remember(key, result)
+    return result
+
+
+def _remember(key: str, result: CommandExecutionResult) -> None:
+    with _results_lock:
+        _results[key] = result
+        _results.move_to_end(key)
+        while len(_results) > PROMTOOL_RESULTS_CACHE_SIZE:
+            _results.popitem(last=False)
+
+
+def _set_result(key: str, result: CommandExecutionResult) -> None:
+    _remember(key, result)
+    if not PROMTOOL_CACHE_DIR:
+        return
     try:
-        for path in paths:
-            os.unlink(path)
-    except Exception:
-        pass
+        os.makedirs(PROMTOOL_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=PROMTOOL_CACHE_DIR)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"is_ok": result.is_ok, "message": result.message}, f)
+        os.replace(tmp_path, os.path.join(PROMTOOL_CACHE_DIR, f"{key}.json"))
+    except OSError as e:
+        logging.debug(f"could not write promtool result {key}: {e}")
+
+
+def _prune_cache_dir() -> None:
+    """Removes the least recently used results beyond PROMTOOL_CACHE_DIR_MAX_FILES"""
+    if not PROMTOOL_CACHE_DIR:
+        return
+    try:
+        files = [f for f in os.scandir(PROMTOOL_CACHE_DIR) if f.is_file()]
+        files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+    except OSError as e:
+        logging.debug(f"could not list promtool cache directory: {e}")
+        return
+    for f in files[PROMTOOL_CACHE_DIR_MAX_FILES:]:
+        try:
+            os.remove(f.path)
+        except OSError as e:
+            logging.debug(f"could not remove promtool result {f.name}: {e}")
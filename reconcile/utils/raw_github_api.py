@@ -1,23 +1,127 @@
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Iterator,
+    Mapping,
+)
+from typing import (
+    Any,
+    Optional,
+)
 
 import requests
 from sretoolbox.utils import retry
 
+# Number of responses kept to make conditional requests
+RAW_GITHUB_API_ETAG_CACHE_SIZE = int(
+    os.environ.get("RAW_GITHUB_API_ETAG_CACHE_SIZE", 1000)
+)
+
+ORG_MEMBERS_QUERY = """
+query ($org: String!, $cursor: String) {
+  organization(login: $org) {
+    membersWithRole(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { login }
+    }
+  }
+}
+"""
+
+ORG_PENDING_MEMBERS_QUERY = """
+query ($org: String!, $cursor: String) {
+  organization(login: $org) {
+    pendingMembers(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { login }
+    }
+  }
+}
+"""
+
+ORG_TEAMS_QUERY = """
+query ($org: String!, $cursor: String) {
+  organization(login: $org) {
+    teams(first: 50, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        name
+        slug
+        members(first: 100) {
+          pageInfo { hasNextPage endCursor }
+          nodes { login }
+        }
+        invitations(first: 100) {
+          pageInfo { hasNextPage endCursor }
+          nodes { invitee { login } }
+        }
+      }
+    }
+  }
+}
+"""
+
+TEAM_MEMBERS_QUERY = """
+query ($org: String!, $slug: String!, $cursor: String) {
+  organization(login: $org) {
+    team(slug: $slug) {
+      members(first: 100, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { login }
+      }
+    }
+  }
+}
+"""
+
+TEAM_INVITATIONS_QUERY = """
+query ($org: String!, $slug: String!, $cursor: String) {
+  organization(login: $org) {
+    team(slug: $slug) {
+      invitations(first: 100, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { invitee { login } }
+      }
+    }
+  }
+}
+"""
+
+
+class GithubGraphQLError(Exception):
+    pass
+
 
 class RawGithubApi:
     """
-    REST based GH interface
+    REST and GraphQL based GH interface
 
     Unfortunately this needs to be used because PyGithub does not yet support
     checking pending invitations
+
+    GET requests are conditional on the ETag of previous responses, requests
+    answered with 304 Not Modified do not count against the rate limit.
     """
 
     BASE_URL = os.environ.get("GITHUB_API", "https://api.github.com")
+    # https://api.github.com/graphql or https://<host>/api/graphql
+    GRAPHQL_URL = os.environ.get(
+        "GITHUB_GRAPHQL_API", BASE_URL.removesuffix("/v3") + "/graphql"
+    )
     BASE_HEADERS = {
         "Accept": "application/vnd.github.v3+json,"
         "application/vnd.github.dazzler-preview+json"
     }
 
+    # ETag, body and links of the last response per (token hash, url)
+    _etag_cache: OrderedDict[
+        tuple[str, str], tuple[str, Any, dict[str, Any]]
+    ] = OrderedDict()
+    _etag_cache_lock = threading.Lock()
+
     def __init__(self, password):
         self.password = password
 
@@ -34,14 +138,34 @@ class RawGithubApi:
         res.raise_for_status()
         return res
 
+    def get(self, url, headers) -> tuple[Any, dict[str, Any]]:
+        """Returns the decoded body and the links of a response"""
+        key = (hashlib.sha256(self.password.encode()).hexdigest(), url)
+        with self._etag_cache_lock:
+            cached = self._etag_cache.get(key)
+            if cached is not None:
+                self._etag_cache.move_to_end(key)
+        if cached is not None:
+            headers = {**headers, "If-None-Match": cached[0]}
+        res = requests.get(url, headers=headers, timeout=60)
+        if res.status_code == 304 and cached is not None:
+            return cached[1], cached[2]
+        res.raise_for_status()
+        body, links = res.json(), res.links
+        if "ETag" in res.headers:
+            with self._etag_cache_lock:
+                self._etag_cache[key] = (res.headers["ETag"], body, links)
+                self._etag_cache.move_to_end(key)
+                while len(self._etag_cache) > RAW_GITHUB_API_ETAG_CACHE_SIZE:
+                    self._etag_cache.popitem(last=False)
+        return body, links
+
     @retry()
     def query(self, url, headers=None):
         if headers is None:
             headers = {}
         h = self.headers(headers)
-        res = requests.get(self.BASE_URL + url, headers=h, timeout=60)
-        res.raise_for_status()
-        result = res.json()
+        result, links = self.get(self.BASE_URL + url, h)
 
         if isinstance(result, list):
             elements = []
@@ -49,22 +173,20 @@ class RawGithubApi:
             for element in result:
                 elements.append(element)
 
-            while "last" in res.links and "next" in res.links:
-                if res.links["last"]["url"] == res.links["next"]["url"]:
-                    req_url = res.links["next"]["url"]
-                    res = requests.get(req_url, headers=h, timeout=60)
-                    res.raise_for_status()
+            while "last" in links and "next" in links:
+                if links["last"]["url"] == links["next"]["url"]:
+                    req_url = links["next"]["url"]
+                    page, links = self.get(req_url, h)
 
-                    for element in res.json():
+                    for element in page:
                         elements.append(element)
 
                     return elements
                 else:
-                    req_url = res.links["next"]["url"]
-                    res = requests.get(req_url, headers=h, timeout=60)
-                    res.raise_for_status()
+                    req_url = links["next"]["url"]
+                    page, links = self.get(req_url, h)
 
-                    for element in res.json():
+                    for element in page:
                         elements.append(element)
 
             return elements
@@ -91,6 +213,91 @@ class RawGithubApi:
             if login is not None
         ]
 
+    @retry()
+    def graphql(
+        self, query: str, variables: Optional[Mapping[str, Any]] = None
+    ) -> dict[str, Any]:
+        res = requests.post(
+            self.GRAPHQL_URL,
+            json={"query": query, "variables": variables or {}},
+            headers=self.headers(),
+            timeout=60,
+        )
+        res.raise_for_status()
+        result = res.json()
+        if result.get("errors"):
+            raise GithubGraphQLError(result["errors"])
+        return result["data"]
+
+    def graphql_nodes(
+        self,
+        query: str,
+        variables: Mapping[str, Any],
+        connection: Callable[[dict[str, Any]], dict[str, Any]],
+        cursor: Optional[str] = None,
+    ) -> Iterator[dict[str, Any]]:
+        """Yields the nodes of the connection of all pages of a query"""
+        while True:
+            page = connection(self.graphql(query, {**variables, "cursor": cursor}))
+            yield from page["nodes"]
+            if not page["pageInfo"]["hasNextPage"]:
+                return
+            cursor = page["pageInfo"]["endCursor"]
+
+    def org_members(self, org: str) -> list[str]:
+        """Returns the members of an org including pending invitations"""
+        members = self.graphql_nodes(
+            ORG_MEMBERS_QUERY,
+            {"org": org},
+            lambda data: data["organization"]["membersWithRole"],
+        )
+        pending_members = self.graphql_nodes(
+            ORG_PENDING_MEMBERS_QUERY,
+            {"org": org},
+            lambda data: data["organization"]["pendingMembers"],
+        )
+        return [m["login"] for m in members] + [m["login"] for m in pending_members]
+
+    def org_teams(self, org: str) -> dict[str, list[str]]:
+        """
+        Returns the members of all teams of an org including pending
+        invitations, by team name. Only large teams need more than one
+        query per 50 teams.
+        """
+        teams: dict[str, list[str]] = {}
+        for team in self.graphql_nodes(
+            ORG_TEAMS_QUERY,
+            {"org": org},
+            lambda data: data["organization"]["teams"],
+        ):
+            members = [m["login"] for m in team["members"]["nodes"]]
+            if team["members"]["pageInfo"]["hasNextPage"]:
+                members.extend(
+                    m["login"]
+                    for m in self.graphql_nodes(
+                        TEAM_MEMBERS_QUERY,
+                        {"org": org, "slug": team["slug"]},
+                        lambda data: data["organization"]["team"]["members"],
+                        cursor=team["members"]["pageInfo"]["endCursor"],
+                    )
+                )
+            invitations = team["invitations"]["nodes"]
+            if team["invitations"]["pageInfo"]["hasNextPage"]:
+                invitations.extend(
+                    self.graphql_nodes(
+                        TEAM_INVITATIONS_QUERY,
+                        {"org": org, "slug": team["slug"]},
+                        lambda data: data["organization"]["team"]["invitations"],
+                        cursor=team["invitations"]["pageInfo"]["endCursor"],
+                    )
+                )
+            # invitations by email do not have an invitee
+            members.extend(
+                i["invitee"]["login"] for i in invitations if i.get("invitee")
+            )
+            teams[team["name"]] = members
+        return teams
+
     def repo_invitations(self):
         return self.query("/user/repository_invitations")
 
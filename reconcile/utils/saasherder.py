@@ -1349,6 +1349,11 @@ class SaasHerder:
         return promotion
 
     def get_diff(self, trigger_type, dry_run):
+        # the diffs read the state of every target, so read it all at once
+        with self.state.snapshot(self.thread_pool_size):
+            return self._get_diff(trigger_type, dry_run)
+
+    def _get_diff(self, trigger_type, dry_run):
         if trigger_type == TriggerTypes.MOVING_COMMITS:
             # TODO: replace error with actual error handling when needed
             error = False
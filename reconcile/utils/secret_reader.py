@@ -1,8 +1,12 @@
+import os
 from abc import (
     ABC,
     abstractmethod,
 )
-from collections.abc import Mapping
+from collections.abc import (
+    Iterable,
+    Mapping,
+)
 from typing import (
     Any,
     Optional,
@@ -11,7 +15,10 @@ from typing import (
 )
 
 from hvac.exceptions import Forbidden
-from sretoolbox.utils import retry
+from sretoolbox.utils import (
+    retry,
+    threaded,
+)
 
 from reconcile.utils import (
     config,
@@ -19,6 +26,18 @@ from reconcile.utils import (
 )
 from reconcile.utils.vault import VaultClient
 
+# Number of secrets read concurrently by read_all_many
+SECRET_READER_THREAD_POOL_SIZE = int(
+    os.environ.get("SECRET_READER_THREAD_POOL_SIZE", 10)
+)
+
+# identifies a secret by its path and version
+SecretKey = tuple[str, Optional[int]]
+
+
+def secret_key(secret: Mapping[str, Any]) -> SecretKey:
+    return secret.get("path", ""), secret.get("version")
+
 
 class VaultForbidden(Exception):
     pass
@@ -79,6 +98,28 @@ class SecretReaderBase(ABC):
             version=secret.get("version"),
         )
 
+    def read_all_many(
+        self,
+        secrets: Iterable[Mapping[str, Any]],
+        thread_pool_size: int = SECRET_READER_THREAD_POOL_SIZE,
+    ) -> dict[SecretKey, Union[dict[str, str], Exception]]:
+        """
+        Reads the given secrets concurrently, every path and version only
+        once. Returns the data of each secret by secret_key(secret), or the
+        exception reading it raised, so that a single failing secret does
+        not fail the others.
+        """
+        unique = {secret_key(secret): secret for secret in secrets}
+
+        def read_all(secret: Mapping[str, Any]) -> Union[dict[str, str], Exception]:
+            try:
+                return self.read_all(secret)
+            except Exception as e:
+                return e
+
+        results = threaded.run(read_all, list(unique.values()), thread_pool_size)
+        return dict(zip(unique, results))
+
     def read_secret(self, secret: HasSecret) -> str:
         return self._read(
             path=secret.path,
@@ -1,21 +1,42 @@
+import copy
 import json
 import os
+import threading
 from collections.abc import (
     Iterable,
+    Iterator,
     Mapping,
 )
+from contextlib import contextmanager
 from typing import (
     Any,
     Optional,
 )
 
+from botocore.config import Config
 from botocore.errorfactory import ClientError
 from jinja2 import Template
+from sretoolbox.utils import threaded
 
-from reconcile.utils import gql
+from reconcile.utils import (
+    gql,
+    metrics,
+)
 from reconcile.utils.aws_api import AWSApi
 from reconcile.utils.secret_reader import SecretReaderBase
 
+# Number of objects fetched or written concurrently
+STATE_THREAD_POOL_SIZE = int(os.environ.get("STATE_THREAD_POOL_SIZE", 10))
+
+# values fetched by snapshots with the ETag of their object, by bucket and key
+_fetched_values: dict[tuple[str, str], tuple[str, Any]] = {}
+_fetched_values_lock = threading.Lock()
+
+# marks a key that is deleted by a buffered write
+_DELETED = object()
+# marks a key whose object does not contain valid json
+_INVALID = object()
+
 
 class StateInaccessibleException(Exception):
     pass
@@ -56,6 +77,9 @@ class State:
     Good example: email-sender should only send each email once
     Bad example: openshift-resources' source of truth is the clusters
 
+    Within snapshot(), reads are served from an in-memory copy of the
+    whole state and writes are buffered until it is left.
+
     :param integration: name of calling integration
     :param accounts: Graphql AWS accounts query results
     :param settings: App Interface settings
@@ -72,6 +96,7 @@ class State:
         secret_reader: Optional[SecretReaderBase] = None,
     ) -> None:
         """Initiates S3 client from AWSApi."""
+        self.integration = integration
         self.state_path = f"state/{integration}" if integration else "state"
         self.bucket = os.environ["APP_INTERFACE_STATE_BUCKET"]
         account = os.environ["APP_INTERFACE_STATE_BUCKET_ACCOUNT"]
@@ -85,11 +110,20 @@ class State:
         )
         session = aws_api.get_session(account)
 
-        self.client = session.client("s3")
+        # values are fetched concurrently, allow a connection per thread
+        self.client = session.client(
+            "s3",
+            config=Config(max_pool_connections=max(STATE_THREAD_POOL_SIZE, 10)),
+        )
+        self._snapshot: Optional[dict[str, Any]] = None
+        self._pending: dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._thread_pool_size = STATE_THREAD_POOL_SIZE
+        self._buffer_writes = True
 
         # check if the bucket exists
         try:
-            self.client.head_bucket(Bucket=self.bucket)
+            self._call("head_bucket", Bucket=self.bucket)
         except ClientError as details:
             raise StateInaccessibleException(
                 f"Bucket {self.bucket} is not accessible - {str(details)}"
@@ -106,9 +140,12 @@ class State:
         :raises StateInaccessibleException: if the bucket is missing or
         permissions are insufficient or a general AWS error occurred
         """
+        if self._snapshot is not None:
+            return key in self._snapshot
+
         key_path = f"{self.state_path}/{key}"
         try:
-            self.client.head_object(Bucket=self.bucket, Key=key_path)
+            self._call("head_object", Bucket=self.bucket, Key=key_path)
             return True
         except ClientError as details:
             error_code = details.response.get("Error", {}).get("Code", None)
@@ -120,29 +157,27 @@ class State:
                     f"in bucket {self.bucket} - {str(details)}"
                 )
 
-    def ls(self):
+    def ls(self, path: str = ""):
         """
-        Returns a list of keys in the state
+        Returns a list of keys in the state, only the ones starting with
+        path if given
         """
-        objects = self.client.list_objects_v2(
-            Bucket=self.bucket, Prefix=f"{self.state_path}/"
-        )
-
-        if "Contents" not in objects:
-            return []
+        if self._snapshot is not None:
+            return [f"/{key}" for key in sorted(self._snapshot) if key.startswith(path)]
 
-        contents = objects["Contents"]
-
-        while objects["IsTruncated"]:
-            objects = self.client.list_objects_v2(
-                Bucket=self.bucket,
-                Prefix=f"{self.state_path}/",
-                ContinuationToken=objects["NextContinuationToken"],
-            )
+        return [c["Key"].replace(self.state_path, "") for c in self._list_objects(path)]
 
-            contents += objects["Contents"]
+    def _list_objects(self, path: str = "") -> list[dict[str, Any]]:
+        return [o for page in self._list_object_pages(path) for o in page]
 
-        return [c["Key"].replace(self.state_path, "") for c in contents]
+    def _list_object_pages(self, path: str = "") -> Iterator[list[dict[str, Any]]]:
+        kwargs = {"Bucket": self.bucket, "Prefix": f"{self.state_path}/{path}"}
+        while True:
+            objects = self._call("list_objects_v2", **kwargs)
+            yield objects.get("Contents", [])
+            if not objects.get("IsTruncated"):
+                return
+            kwargs["ContinuationToken"] = objects["NextContinuationToken"]
 
     def add(self, key, value=None, force=False):
         """
@@ -167,7 +202,15 @@ class State:
         """
         if not self.exists(key):
             raise KeyError(f"[state] key {key} does not exists in {self.state_path}")
-        self.client.delete_object(Bucket=self.bucket, Key=f"{self.state_path}/{key}")
+        if self._snapshot is not None:
+            with self._lock:
+                self._snapshot.pop(key, None)
+                if self._buffer_writes:
+                    self._pending[key] = _DELETED
+                    return
+            self._write((key, _DELETED))
+            return
+        self._call("delete_object", Bucket=self.bucket, Key=f"{self.state_path}/{key}")
 
     def get(self, key, *args):
         """
@@ -187,20 +230,49 @@ class State:
                 return args[0]
             raise
 
-    def get_all(self, path):
+    def get_all(self, path, thread_pool_size: int = STATE_THREAD_POOL_SIZE):
         """
         Gets all keys and values from the state in the specified path.
         """
-        return {
-            k.replace(f"{path}/", "").strip("/"): self.get(k.lstrip("/"))
-            for k in self.ls()
-            if k.startswith(f"/{path}")
-        }
+        return dict(self.iter_all(path, thread_pool_size))
+
+    def iter_all(
+        self, path: str, thread_pool_size: int = STATE_THREAD_POOL_SIZE
+    ) -> Iterator[tuple[str, Any]]:
+        """
+        Yields all keys and values from the state in the specified path.
+        Keys are listed page by page and the values of a page are fetched
+        concurrently before they are yielded.
+        """
+        if self._snapshot is not None:
+            for k in self.ls(path):
+                yield k.replace(f"{path}/", "").strip("/"), self[k.lstrip("/")]
+            return
+
+        for page in self._list_object_pages(path):
+            values = threaded.run(
+                self._fetch_value, page, thread_pool_size, remember=False
+            )
+            for obj, value in zip(page, values):
+                if value is _DELETED:
+                    continue
+                k = obj["Key"].replace(self.state_path, "")
+                if value is _INVALID:
+                    raise KeyError(k.lstrip("/"))
+                # values are shared with snapshots
+                yield k.replace(f"{path}/", "").strip("/"), copy.deepcopy(value)
 
     def __getitem__(self, item):
+        if self._snapshot is not None:
+            value = self._snapshot[item]
+            if value is _INVALID:
+                raise KeyError(item)
+            # values are shared with later snapshots
+            return copy.deepcopy(value)
+
         try:
-            response = self.client.get_object(
-                Bucket=self.bucket, Key=f"{self.state_path}/{item}"
+            response = self._call(
+                "get_object", Bucket=self.bucket, Key=f"{self.state_path}/{item}"
             )
             return json.loads(response["Body"].read())
         except ClientError as details:
@@ -211,6 +283,128 @@ class State:
             raise KeyError(item)
 
     def __setitem__(self, key, value):
-        self.client.put_object(
-            Bucket=self.bucket, Key=f"{self.state_path}/{key}", Body=json.dumps(value)
+        if self._snapshot is not None:
+            body = json.dumps(value)
+            with self._lock:
+                # keep the value as it would be read back from the bucket
+                self._snapshot[key] = json.loads(body)
+                if self._buffer_writes:
+                    self._pending[key] = body
+                    return
+            self._write((key, body))
+            return
+
+        self._call(
+            "put_object",
+            Bucket=self.bucket,
+            Key=f"{self.state_path}/{key}",
+            Body=json.dumps(value),
         )
+
+    @contextmanager
+    def snapshot(
+        self, thread_pool_size: int = STATE_THREAD_POOL_SIZE
+    ) -> Iterator["State"]:
+        """
+        Serves reads from an in-memory snapshot of the state and flushes
+        the writes buffered meanwhile when the context is left.
+        """
+        if self._snapshot is not None:
+            yield self
+            return
+
+        self.prefetch(thread_pool_size)
+        try:
+            yield self
+        finally:
+            try:
+                self.flush()
+            finally:
+                self._snapshot = None
+
+    def prefetch(
+        self, thread_pool_size: int = STATE_THREAD_POOL_SIZE, buffer_writes: bool = True
+    ) -> None:
+        """
+        Lists the state once and fetches all values concurrently into an
+        in-memory snapshot that reads are served from. Writes are buffered
+        until flush() is called, unless buffer_writes is False, e.g. for
+        integrations that must not repeat an action if they are killed
+        before flushing.
+
+        Values fetched before are only fetched again if the ETag of their
+        object changed.
+        """
+        self._thread_pool_size = thread_pool_size
+        self._buffer_writes = buffer_writes
+        objects = self._list_objects()
+        values = threaded.run(self._fetch_value, objects, thread_pool_size)
+        prefix = f"{self.state_path}/"
+        snapshot = {
+            o["Key"][len(prefix) :]: value
+            for o, value in zip(objects, values)
+            if value is not _DELETED
+        }
+
+        keys = {(self.bucket, o["Key"]) for o in objects}
+        with _fetched_values_lock:
+            for bucket, key in list(_fetched_values):
+                if bucket == self.bucket and key.startswith(prefix):
+                    if (bucket, key) not in keys:
+                        del _fetched_values[(bucket, key)]
+        self._snapshot = snapshot
+
+    def _fetch_value(self, obj: Mapping[str, Any], remember: bool = True) -> Any:
+        """
+        Fetches the value of a listed object. Values are only remembered for
+        later snapshots if remember is set, as only snapshots prune them.
+        """
+        cache_key = (self.bucket, obj["Key"])
+        with _fetched_values_lock:
+            fetched = _fetched_values.get(cache_key)
+        if fetched is not None and fetched[0] == obj["ETag"]:
+            return fetched[1]
+
+        try:
+            response = self._call("get_object", Bucket=self.bucket, Key=obj["Key"])
+        except ClientError as details:
+            # the object was deleted after it was listed
+            if details.response["Error"]["Code"] == "NoSuchKey":
+                return _DELETED
+            raise
+        try:
+            value = json.loads(response["Body"].read())
+        except json.decoder.JSONDecodeError:
+            value = _INVALID
+        if remember:
+            with _fetched_values_lock:
+                _fetched_values[cache_key] = (response["ETag"], value)
+        return value
+
+    def flush(self) -> None:
+        """Writes the writes buffered in snapshot mode concurrently."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        threaded.run(self._write, list(pending.items()), self._thread_pool_size)
+
+    def _write(self, item: tuple[str, Any]) -> None:
+        key, body = item
+        key_path = f"{self.state_path}/{key}"
+        if body is _DELETED:
+            self._call("delete_object", Bucket=self.bucket, Key=key_path)
+            with _fetched_values_lock:
+                _fetched_values.pop((self.bucket, key_path), None)
+            return
+
+        response = self._call("put_object", Bucket=self.bucket, Key=key_path, Body=body)
+        with _fetched_values_lock:
+            _fetched_values[(self.bucket, key_path)] = (
+                response["ETag"],
+                json.loads(body),
+            )
+
+    def _call(self, operation: str, **kwargs: Any) -> Any:
+        metrics.state_s3_calls.labels(
+            integration=self.integration, operation=operation
+        ).inc()
+        return getattr(self.client, operation)(**kwargs)
@@ -29,7 +29,6 @@ import anymarkup
 import requests
 from botocore.errorfactory import ClientError
 from github import Github
-from sretoolbox.utils import threaded
 
 # temporary to create aws_ecrpublic_repository
 from terrascript import (
@@ -170,7 +169,10 @@ from reconcile.utils.password_validator import (
     PasswordPolicy,
     PasswordValidator,
 )
-from reconcile.utils.secret_reader import SecretReader
+from reconcile.utils.secret_reader import (
+    SecretReader,
+    secret_key,
+)
 from reconcile.utils.terraform import safe_resource_id
 
 GH_BASE_URL = os.environ.get("GITHUB_API", "https://api.github.com")
@@ -571,15 +573,18 @@ class TerrascriptClient:  # pylint: disable=too-many-public-methods
         return filtered_accounts
 
     def populate_configs(self, accounts: Iterable[awsh.Account]):
-        results = threaded.run(
-            awsh.get_tf_secrets,
-            accounts,
+        secrets = self.secret_reader.read_all_many(
+            [account["automationToken"] for account in accounts],
             self.thread_pool_size,
-            secret_reader=self.secret_reader,
         )
         self.configs: dict[str, dict] = {}
-        for account_name, config in results:
-            account = awsh.get_account(accounts, account_name)
+        for account in accounts:
+            secret = secrets[secret_key(account["automationToken"])]
+            if isinstance(secret, Exception):
+                raise secret
+            account_name = account["name"]
+            # accounts may share a token, every account gets its own config
+            config = dict(secret)
             config["supportedDeploymentRegions"] = account["supportedDeploymentRegions"]
             config["resourcesDefaultRegion"] = account["resourcesDefaultRegion"]
             config["terraformState"] = account["terraformState"]
@@ -1198,6 +1203,8 @@ class TerrascriptClient:  # pylint: disable=too-many-public-methods
                 ).append(spec)
                 self.resource_spec_inventory[spec.id_object()] = spec
 
+        self.prefetch_spec_resources()
+
     def populate_tf_resources(self, spec, ocm_map=None):
         if spec.provision_provider != PROVIDER_AWS:
             raise UnknownProviderError(spec.provision_provider)
@@ -3808,6 +3815,33 @@ class TerrascriptClient:  # pylint: disable=too-many-public-methods
         gqlapi = gql.get_api()
         return {r["path"]: r for r in gqlapi.get_resources_by_schema(schema)}
 
+    def prefetch_spec_resources(self) -> None:
+        """Fetch all resource files referenced by the populated specs
+        (defaults, parameter groups) in batches instead of one by one."""
+        paths = set()
+        for spec in self.resource_spec_inventory.values():
+            resource = spec.resource
+            for key in ("defaults", "parameter_group", "old_parameter_group"):
+                if resource.get(key):
+                    paths.add(resource[key])
+            for spec_item in resource.get("specs") or []:
+                if spec_item.get("defaults"):
+                    paths.add(spec_item["defaults"])
+        paths -= self._resource_cache.keys()
+        if not paths:
+            return
+
+        gqlapi = gql.get_api()
+        resources = gqlapi.get_resources(paths, return_errors=True)
+        # errors are raised on access, see get_raw_values
+        self._resource_cache.update(
+            {
+                path: resource
+                for path, resource in resources.items()
+                if not isinstance(resource, gql.GqlGetResourceError)
+            }
+        )
+
     def get_raw_values(self, path) -> dict[str, str]:
         if path in self._resource_cache:
             return self._resource_cache[path]
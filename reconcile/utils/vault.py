@@ -1,23 +1,55 @@
 import base64
 import functools
+import hashlib
+import json
 import logging
 import os
+import tempfile
 import threading
 import time
-from collections.abc import Mapping
-from typing import Optional
+from collections import OrderedDict
+from collections.abc import (
+    Callable,
+    Hashable,
+    Iterator,
+    Mapping,
+)
+from concurrent.futures import Future
+from typing import (
+    Optional,
+    TypeVar,
+)
 
 import hvac
 import requests
+from cryptography.fernet import (
+    Fernet,
+    InvalidToken,
+)
 from hvac.exceptions import InvalidPath
 from requests.adapters import HTTPAdapter
-from sretoolbox.utils import retry
+from sretoolbox.utils import (
+    retry,
+    threaded,
+)
 
+from reconcile.utils import metrics
 from reconcile.utils.config import get_config
 
 LOG = logging.getLogger(__name__)
 VAULT_AUTO_REFRESH_INTERVAL = int(os.getenv("VAULT_AUTO_REFRESH_INTERVAL") or 600)
 
+# Number of versioned secrets kept in memory
+VAULT_SECRET_CACHE_SIZE = int(os.getenv("VAULT_SECRET_CACHE_SIZE") or 10000)
+# Directory for the on-disk tier of pinned secret versions, disabled if not set
+VAULT_SECRET_CACHE_DIR = os.getenv("VAULT_SECRET_CACHE_DIR")
+# Fernet key the on-disk tier is encrypted with, disabled if not set
+VAULT_SECRET_CACHE_KEY = os.getenv("VAULT_SECRET_CACHE_KEY")
+# Seconds a secret is kept in the on-disk tier
+VAULT_SECRET_CACHE_TTL = int(os.getenv("VAULT_SECRET_CACHE_TTL") or 86400)
+
+T = TypeVar("T")
+
 
 class PathAccessForbidden(Exception):
     pass
@@ -50,12 +82,192 @@ class VaultConnectionError(Exception):
 SECRET_VERSION_LATEST = "LATEST"
 
 
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key, so that only the first
+    caller runs the call and the others wait for and share its outcome.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> tuple[T, bool]:
+        """Returns the result of func and whether it was shared"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is None:
+                future = self._calls[key] = Future()
+                leader = True
+            else:
+                leader = False
+
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class SecretCache:
+    """
+    Cache for versioned secrets read from KV v2 engines, keyed by path and
+    version.
+
+    The least recently used entries are evicted once max_size is reached.
+    If a cache directory and a Fernet key are given, pinned versions are also
+    written to disk encrypted, so they survive restarts. Latest versions are
+    only kept in memory, as they change with every write. Entries on disk
+    expire after ttl seconds, e.g. in case a version is destroyed, and at
+    most max_size of them are kept.
+    """
+
+    def __init__(
+        self,
+        server: str,
+        max_size: int,
+        cache_dir: Optional[str] = None,
+        key: Optional[str] = None,
+        ttl: int = 86400,
+    ) -> None:
+        self.server = server
+        self.max_size = max_size
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self._fernet: Optional[Fernet] = None
+        if cache_dir and key:
+            try:
+                self._fernet = Fernet(key)
+            except ValueError as e:
+                LOG.error(f"invalid vault secret cache key, disk cache disabled: {e}")
+        self._entries: OrderedDict[
+            tuple[str, str], tuple[dict, Optional[str]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+        if self._fernet:
+            self._prune_files()
+
+    def get(self, path: str, version: str) -> Optional[tuple[dict, Optional[str]]]:
+        with self._lock:
+            entry = self._entries.get((path, version))
+            if entry is not None:
+                self._entries.move_to_end((path, version))
+        if entry is not None:
+            metrics.vault_secret_cache_hits.labels(tier="memory").inc()
+            return entry
+
+        if version != SECRET_VERSION_LATEST:
+            entry = self._read_file(path, version)
+            if entry is not None:
+                self._remember(path, version, entry)
+                metrics.vault_secret_cache_hits.labels(tier="disk").inc()
+                return entry
+
+        metrics.vault_secret_cache_misses.inc()
+        return None
+
+    def set(self, path: str, version: str, entry: tuple[dict, Optional[str]]) -> None:
+        self._remember(path, version, entry)
+        if version != SECRET_VERSION_LATEST:
+            self._write_file(path, version, entry)
+
+    def invalidate_latest(self, path: str) -> None:
+        with self._lock:
+            self._entries.pop((path, SECRET_VERSION_LATEST), None)
+
+    def _remember(
+        self, path: str, version: str, entry: tuple[dict, Optional[str]]
+    ) -> None:
+        with self._lock:
+            self._entries[(path, version)] = entry
+            self._entries.move_to_end((path, version))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def _path(self, path: str, version: str) -> str:
+        assert self.cache_dir
+        name = hashlib.sha256(f"{self.server}\n{path}\n{version}".encode()).hexdigest()
+        return os.path.join(self.cache_dir, name)
+
+    def _read_file(
+        self, path: str, version: str
+    ) -> Optional[tuple[dict, Optional[str]]]:
+        if not self._fernet:
+            return None
+        file_path = self._path(path, version)
+        try:
+            with open(file_path, "rb") as f:
+                data = json.loads(self._fernet.decrypt(f.read(), ttl=self.ttl))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, InvalidToken) as e:
+            # expired or unreadable, e.g. encrypted with another key
+            LOG.debug(f"could not read vault secret cache entry: {e}")
+            self._remove_file(file_path)
+            return None
+        return data["data"], data["version"]
+
+    @staticmethod
+    def _remove_file(file_path: str) -> None:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+    def _prune_files(self) -> None:
+        """Removes expired entries and the oldest ones beyond max_size."""
+        assert self.cache_dir
+        try:
+            files = [f for f in os.scandir(self.cache_dir) if f.is_file()]
+            files.sort(key=lambda f: f.stat().st_mtime, reverse=True)
+        except OSError:
+            return
+        now = time.time()
+        for i, f in enumerate(files):
+            try:
+                if i >= self.max_size or now - f.stat().st_mtime > self.ttl:
+                    os.remove(f.path)
+            except OSError as e:
+                LOG.debug(f"could not remove vault secret cache entry: {e}")
+
+    def _write_file(
+        self, path: str, version: str, entry: tuple[dict, Optional[str]]
+    ) -> None:
+        if not self._fernet:
+            return
+        assert self.cache_dir
+        data, secret_version = entry
+        token = self._fernet.encrypt(
+            json.dumps({"data": data, "version": secret_version}).encode()
+        )
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            # write to a temporary file first so that concurrent readers
+            # never see a partially written entry
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+            os.replace(tmp_path, self._path(path, version))
+        except OSError as e:
+            LOG.debug(f"could not write vault secret cache entry: {e}")
+
+
 class _VaultClient:
     """
     A class representing a Vault client. Allows read/write operations.
-    The client caches read requests in-memory if the request is made
-    to a versioned KV engine (v2), since that includes both a path
-    and a version (no invalidation required).
+    The client caches read requests if the request is made to a versioned
+    KV engine (v2), since that includes both a path and a version (no
+    invalidation required for pinned versions). Concurrent identical reads
+    are coalesced into a single request.
     """
 
     def __init__(
@@ -68,6 +280,14 @@ class _VaultClient:
         config = get_config()
 
         server = config["vault"]["server"] if server is None else server
+        self._secret_cache = SecretCache(
+            server,
+            VAULT_SECRET_CACHE_SIZE,
+            VAULT_SECRET_CACHE_DIR,
+            VAULT_SECRET_CACHE_KEY,
+            VAULT_SECRET_CACHE_TTL,
+        )
+        self._reads = SingleFlight()
         self.role_id = config["vault"]["role_id"] if role_id is None else role_id
         self.secret_id = (
             config["vault"]["secret_id"] if secret_id is None else secret_id
@@ -149,6 +369,32 @@ class _VaultClient:
         """
         return self.read_all_with_version(secret)[0]
 
+    @retry(no_retry_exceptions=(SecretNotFound, SecretAccessForbidden))
+    def read_current_version(self, path: str) -> Optional[int]:
+        """Returns the current version of a secret from its metadata, without
+        reading the data of the secret. V1 secrets have no versions, None is
+        returned for them without checking if the secret exists."""
+        if self._get_mount_version_by_secret_path(path) != 2:
+            return None
+
+        path_split = path.split("/")
+        mount_point = path_split[0]
+        read_path = "/".join(path_split[1:])
+        try:
+            metadata = self._client.secrets.kv.v2.read_secret_metadata(
+                mount_point=mount_point,
+                path=read_path,
+            )
+        except InvalidPath:
+            raise SecretNotFound(path)
+        except hvac.exceptions.Forbidden:
+            msg = f"permission denied accessing secret '{path}'"
+            raise SecretAccessForbidden(msg)
+        if metadata is None or "data" not in metadata:
+            raise SecretNotFound(path)
+
+        return metadata["data"]["current_version"]
+
     def _get_mount_version_by_secret_path(self, path):
         path_split = path.split("/")
         mount_point = path_split[0]
@@ -164,17 +410,39 @@ class _VaultClient:
 
         return version
 
-    @functools.lru_cache(maxsize=2048)
     def _read_all_v2(
         self, path: str, version: Optional[str]
     ) -> tuple[dict, Optional[str]]:
-        path_split = path.split("/")
-        mount_point = path_split[0]
-        read_path = "/".join(path_split[1:])
         if version is None:
             msg = "version can not be null " f"for secret with path '{path}'."
             raise SecretVersionIsNone(msg)
-        elif version == SECRET_VERSION_LATEST:
+        cache_version = str(version)
+        cached = self._secret_cache.get(path, cache_version)
+        if cached is not None:
+            return cached
+
+        def read() -> tuple[dict, Optional[str]]:
+            result = self._read_secret_version_v2(path, version)
+            self._secret_cache.set(path, cache_version, result)
+            return result
+
+        return self._coalesce(2, path, cache_version, read)
+
+    def _coalesce(
+        self, kv_version: int, path: str, version: Optional[str], func: Callable[[], T]
+    ) -> T:
+        result, shared = self._reads.do((kv_version, path, version), func)
+        if shared:
+            metrics.vault_coalesced_reads.labels(kv_version=str(kv_version)).inc()
+        return result
+
+    def _read_secret_version_v2(
+        self, path: str, version: Optional[str]
+    ) -> tuple[dict, Optional[str]]:
+        path_split = path.split("/")
+        mount_point = path_split[0]
+        read_path = "/".join(path_split[1:])
+        if version == SECRET_VERSION_LATEST:
             # https://github.com/hvac/hvac/blob/
             # ec048ded30d21c13c21cfa950d148c8bfc1467b0/
             # hvac/api/secrets_engines/kv_v2.py#L85
@@ -199,6 +467,11 @@ class _VaultClient:
         return data, secret_version
 
     def _read_all_v1(self, path):
+        # v1 secrets are not versioned and can not be cached, only
+        # concurrent reads of the same path are shared
+        return self._coalesce(1, path, None, lambda: self._read_secret_v1(path))
+
+    def _read_secret_v1(self, path):
         try:
             secret = self._client.read(path)
         except hvac.exceptions.Forbidden:
@@ -305,7 +578,7 @@ class _VaultClient:
                 path=write_path,
                 secret=data,
             )
-            self._read_all_v2.cache_clear()
+            self._secret_cache.invalidate_latest(path)
         except hvac.exceptions.Forbidden:
             msg = f"permission denied accessing secret '{path}'"
             raise SecretAccessForbidden(msg)
@@ -345,17 +618,30 @@ class _VaultClient:
 
         return path_list["data"]["keys"] or []
 
-    def list_all(self, path):
+    def list_all(self, path: str, thread_pool_size: int = 1):
         """Returns a list of secrets in a given path and
-        all its subpaths."""
-        secrets = []
-        for secret in self.list(path):
-            secret_path = f"{path}{secret}"
-            if secret.endswith("/"):
-                secrets.extend(self.list_all(secret_path))
-            else:
-                secrets.append(secret_path)
-        return secrets
+        all its subpaths. The folders of each level of the tree are
+        listed in parallel."""
+        listings: dict[str, list[str]] = {}
+        folders = [path]
+        while folders:
+            results = threaded.run(self.list, folders, thread_pool_size)
+            listings.update(zip(folders, results))
+            folders = [
+                f"{folder}{key}"
+                for folder, keys in zip(folders, results)
+                for key in keys
+                if key.endswith("/")
+            ]
+
+        def walk(folder: str) -> Iterator[str]:
+            for key in listings[folder]:
+                if key.endswith("/"):
+                    yield from walk(f"{folder}{key}")
+                else:
+                    yield f"{folder}{key}"
+
+        return list(walk(path))
 
 
 class VaultClient:
@@ -7,6 +7,8 @@ from typing import (
     cast,
 )
 
+from sretoolbox.utils import threaded
+
 from reconcile.gql_definitions.jenkins_configs import jenkins_configs
 from reconcile.gql_definitions.jenkins_configs.jenkins_configs import (
     JenkinsConfigsQueryData,
@@ -112,11 +114,11 @@ def write_dummy_versions(
 def copy_vault_secret(
     dry_run: bool, source_vault: _VaultClient, dest_vault: _VaultClient, path: str
 ) -> None:
-    """Copies a secret from the source vault to the destination vault"""
-    secret_dict = {"path": path, "version": "LATEST"}
-
+    """Copies a secret from the source vault to the destination vault. For V2
+    secrets only the current versions are compared, secret data is only read
+    for the versions that need to be copied."""
     try:
-        source_data, version = source_vault.read_all_with_version(secret_dict)
+        version = source_vault.read_current_version(path)
     except SecretAccessForbidden:
         # Raise exception if we can't read the secret from the source vault.
         # This is likely to be related to the approle permissions.
@@ -128,50 +130,76 @@ def copy_vault_secret(
         logging.error(["replicate_vault_secret", "no versions found for secret", path])
         return
 
+    if version is None:
+        # v1 secrets don't have versions, their data has to be compared
+        copy_vault_secret_v1(dry_run, source_vault, dest_vault, path)
+        return
+
     try:
-        dest_data, dest_version = dest_vault.read_all_with_version(secret_dict)
-        if dest_version is None and version is None:
-            # v1 secrets don't have version
-            if source_data == dest_data:
-                # If the secret is the same in both vaults, we don't need
-                # to copy it again
-                return
-
-            secret, _ = source_vault.read_all_with_version(secret_dict)
-            write_dict = {"path": path, "data": secret}
-            logging.info(["replicate_vault_secret", path])
-            if not dry_run:
-                # Using force=True to write the secret to force the vault client even
-                # if the data is the same as the previous version. This happens in
-                # some secrets even tho the library does not create it
-                dest_vault.write(secret=write_dict, decode_base64=False, force=True)
-        elif dest_version < version:
-            deep_copy_versions(
-                dry_run=dry_run,
-                source_vault=source_vault,
-                dest_vault=dest_vault,
-                current_dest_version=dest_version,
-                current_source_version=version,
-                path=path,
-            )
+        dest_version = dest_vault.read_current_version(path)
+    except SecretNotFound:
+        logging.info(["replicate_vault_secret", "Secret not found", path])
+        dest_version = 0
+
+    if (dest_version or 0) < version:
+        deep_copy_versions(
+            dry_run=dry_run,
+            source_vault=source_vault,
+            dest_vault=dest_vault,
+            current_dest_version=dest_version or 0,
+            current_source_version=version,
+            path=path,
+        )
+
+
+def copy_vault_secret_v1(
+    dry_run: bool, source_vault: _VaultClient, dest_vault: _VaultClient, path: str
+) -> None:
+    """Copies a V1 secret from the source vault to the destination vault if
+    the data of the secret differs"""
+    secret_dict = {"path": path}
+
+    try:
+        source_data, _ = source_vault.read_all_with_version(secret_dict)
+    except SecretAccessForbidden:
+        raise SecretAccessForbidden("Cannot read secret from source vault")
+    except SecretNotFound:
+        logging.error(["replicate_vault_secret", "secret not found", path])
+        return
+
+    try:
+        dest_data, _ = dest_vault.read_all_with_version(secret_dict)
+        if source_data == dest_data:
+            # If the secret is the same in both vaults, we don't need
+            # to copy it again
+            return
     except (SecretVersionNotFound, SecretNotFound):
         logging.info(["replicate_vault_secret", "Secret not found", path])
-        # Handle v1 secrets where version is None and we don't need to deep sync.
-        if version is None:
-            logging.info(["replicate_vault_secret", path])
-            if not dry_run:
-                secret, _ = source_vault.read_all_with_version(secret_dict)
-                write_dict = {"path": path, "data": secret}
-                dest_vault.write(secret=write_dict, decode_base64=False, force=True)
-        else:
-            deep_copy_versions(
-                dry_run=dry_run,
-                source_vault=source_vault,
-                dest_vault=dest_vault,
-                current_dest_version=0,
-                current_source_version=version,
-                path=path,
-            )
+
+    write_dict = {"path": path, "data": source_data}
+    logging.info(["replicate_vault_secret", path])
+    if not dry_run:
+        # Using force=True to write the secret to force the vault client even
+        # if the data is the same as the previous version. This happens in
+        # some secrets even tho the library does not create it
+        dest_vault.write(secret=write_dict, decode_base64=False, force=True)
+
+
+def copy_vault_secrets(
+    dry_run: bool,
+    source_vault: _VaultClient,
+    dest_vault: _VaultClient,
+    paths: Iterable[str],
+    thread_pool_size: int = 1,
+) -> None:
+    """Copies secrets from the source vault to the destination vault in
+    parallel. Every path is copied once by a single thread, as the versions
+    of a secret have to be written in order."""
+    threaded.run(
+        lambda path: copy_vault_secret(dry_run, source_vault, dest_vault, path),
+        list(dict.fromkeys(paths)),
+        thread_pool_size,
+    )
 
 
 def check_invalid_paths(
@@ -228,7 +256,9 @@ def get_policy_paths(
 
 
 def get_policy_secret_list(
-    vault_instance: _VaultClient, policy_paths: Iterable[str]
+    vault_instance: _VaultClient,
+    policy_paths: Iterable[str],
+    thread_pool_size: int = 1,
 ) -> list[str]:
     """Returns a list of secrets to be copied from the given policy"""
     secret_list = []
@@ -236,7 +266,9 @@ def get_policy_secret_list(
         # Remove the * at the end of the path because list method expects
         # a folder path without any secret or wilcard
         path = path[:-1] if path.endswith("*") else path
-        secret_list.extend(vault_instance.list_all(path))
+        secret_list.extend(
+            vault_instance.list_all(path, thread_pool_size=thread_pool_size)
+        )
 
     return secret_list
 
@@ -245,6 +277,7 @@ def get_jenkins_secret_list(
     vault_instance: _VaultClient,
     jenkins_instance: str,
     query_data: JenkinsConfigsQueryData,
+    thread_pool_size: int = 1,
 ) -> list[str]:
     """Returns a list of secrets used in a jenkins instance"""
     secret_list = []
@@ -267,7 +300,9 @@ def get_jenkins_secret_list(
                         secret_path = res.group(1)
                         if "{" in secret_path:
                             start, _ = _get_start_end_secret(secret_path)
-                            vault_list = vault_instance.list_all(start)
+                            vault_list = vault_instance.list_all(
+                                start, thread_pool_size=thread_pool_size
+                            )
                             template_expasion_list = get_secrets_from_templated_path(
                                 path=secret_path,
                                 vault_list=vault_list,
@@ -322,6 +357,9 @@ def replicate_paths(
     source_vault: _VaultClient,
     dest_vault: _VaultClient,
     replications: VaultReplicationConfigV1,
+    vault_query_data: VaultPoliciesQueryData,
+    jenkins_query_data: JenkinsConfigsQueryData,
+    thread_pool_size: int = 1,
 ) -> None:
     """For each path present in the definition of the vault instance, replicate
     the secrets from the source vault to the destination vault"""
@@ -333,7 +371,6 @@ def replicate_paths(
 
         if isinstance(path, VaultReplicationJenkinsV1):
             if path.policy is not None:
-                vault_query_data = vault_policies.query(query_func=gql.get_api().query)
                 policy_paths = get_policy_paths(
                     path.policy.name,
                     path.policy.instance.name,
@@ -342,16 +379,18 @@ def replicate_paths(
             else:
                 policy_paths = None
 
-            jenkins_query_data = jenkins_configs.query(query_func=gql.get_api().query)
             path_list = get_jenkins_secret_list(
-                source_vault, path.jenkins_instance.name, jenkins_query_data
+                source_vault,
+                path.jenkins_instance.name,
+                jenkins_query_data,
+                thread_pool_size=thread_pool_size,
             )
             check_invalid_paths(path_list, policy_paths)
-            for vault_path in path_list:
-                copy_vault_secret(dry_run, source_vault, dest_vault, vault_path)
+            copy_vault_secrets(
+                dry_run, source_vault, dest_vault, path_list, thread_pool_size
+            )
 
         elif isinstance(path, VaultReplicationPolicyV1):
-            vault_query_data = vault_policies.query(query_func=gql.get_api().query)
             if path.policy is None:
                 # Exit if the replication config is empty, this should never happen
                 # as policy is a required field in the schema but makes mypy happy.
@@ -363,9 +402,12 @@ def replicate_paths(
                 path.policy.instance.name,
                 vault_query_data,
             )
-            path_list = get_policy_secret_list(source_vault, policy_paths)
-            for vault_path in path_list:
-                copy_vault_secret(dry_run, source_vault, dest_vault, vault_path)
+            path_list = get_policy_secret_list(
+                source_vault, policy_paths, thread_pool_size=thread_pool_size
+            )
+            copy_vault_secrets(
+                dry_run, source_vault, dest_vault, path_list, thread_pool_size
+            )
 
 
 def _get_start_end_secret(path: str) -> tuple[str, str]:
@@ -418,9 +460,11 @@ def get_secrets_from_templated_path(path: str, vault_list: Iterable[str]) -> lis
     return secret_list
 
 
-def run(dry_run: bool) -> None:
+def run(dry_run: bool, thread_pool_size: int = 10) -> None:
 
     query_data = vault_instances.query(query_func=gql.get_api().query)
+    vault_query_data = vault_policies.query(query_func=gql.get_api().query)
+    jenkins_query_data = jenkins_configs.query(query_func=gql.get_api().query)
 
     if query_data.vault_instances:
         for instance in query_data.vault_instances:
@@ -452,4 +496,7 @@ def run(dry_run: bool) -> None:
                         source_vault=source_vault,
                         dest_vault=dest_vault,
                         replications=replication,
+                        vault_query_data=vault_query_data,
+                        jenkins_query_data=jenkins_query_data,
+                        thread_pool_size=thread_pool_size,
                     )